@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+# Measures the cost of updating the position estimator with a state, with and
+# without a mission pad position to fuse.
+#
+#   python3 benchmarks/position_estimator.py [iterations]
+
+import sys
+from timeit import timeit
+
+from tello_asyncio.state import parse_state_message
+from tello_asyncio.estimator import PositionEstimator
+
+SAMPLES = {
+    "no mission pad": "mid:-1;x:-100;y:-100;z:-100;mpry:0,0,0;pitch:1;roll:-2;yaw:45;vgx:3;vgy:-1;vgz:0;templ:70;temph:72;tof:102;h:90;bat:76;baro:182.31;time:34;agx:-11.00;agy:6.00;agz:-998.00;\r\n",
+    "mission pad": "mid:3;x:12;y:-40;z:95;mpry:0,0,-2;pitch:1;roll:-2;yaw:45;vgx:3;vgy:-1;vgz:0;templ:70;temph:72;tof:102;h:90;bat:76;baro:182.31;time:34;agx:-11.00;agy:6.00;agz:-998.00;\r\n",
+}
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+for name, message in SAMPLES.items():
+    state = parse_state_message(message)
+    estimator = PositionEstimator()
+    time = [0.0]
+
+    def update():
+        time[0] += 0.1
+        estimator.update(state, time[0])
+
+    elapsed = timeit(update, number=iterations)
+    stats = estimator.stats()
+
+    print(f"{name}:")
+    print(f"  update  {elapsed / iterations * 1e6:6.2f} µs per state")
+    print(f"  max     {stats.max_update_time * 1e6:6.2f} µs")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# Compares the single pass state message parser with the generic one that
+# looks up each field by name, and with lazy state reading just the height
+# and battery, on samples from SDK 2.0 and SDK 3.0 drones.
+#
+#   python3 benchmarks/state_parser.py [iterations]
+
+import sys
+from timeit import timeit
+
+from tello_asyncio.state import (
+    parse_state_message,
+    parse_state_message_by_name,
+    LazyTelloState,
+)
+
+SAMPLES = {
+    "SDK 2.0": "pitch:1;roll:-2;yaw:45;vgx:0;vgy:0;vgz:0;templ:63;temph:65;tof:10;h:0;bat:87;baro:181.55;time:0;agx:-11.00;agy:6.00;agz:-998.00;\r\n",
+    "SDK 3.0 (mission pad)": "mid:3;x:12;y:-40;z:95;mpry:0,0,-2;pitch:1;roll:-2;yaw:45;vgx:3;vgy:-1;vgz:0;templ:70;temph:72;tof:102;h:90;bat:76;baro:182.31;time:34;agx:-11.00;agy:6.00;agz:-998.00;\r\n",
+}
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+for name, message in SAMPLES.items():
+    data = message.encode("ascii")
+    assert parse_state_message(message) == parse_state_message_by_name(message)
+    assert LazyTelloState(data) == parse_state_message_by_name(message)
+
+    def lazy_height_and_battery():
+        state = LazyTelloState(data)
+        return state.height, state.battery
+
+    by_name = timeit(lambda: parse_state_message_by_name(message), number=iterations)
+    single_pass = timeit(lambda: parse_state_message(message), number=iterations)
+    lazy = timeit(lazy_height_and_battery, number=iterations)
+
+    print(f"{name}:")
+    print(f"  by name      {by_name / iterations * 1e6:6.2f} µs per message")
+    print(f"  single pass  {single_pass / iterations * 1e6:6.2f} µs per message")
+    print(f"  speedup      {by_name / single_pass:6.2f}x")
+    print(f"  lazy (height and battery only) {lazy / iterations * 1e6:6.2f} µs per message")
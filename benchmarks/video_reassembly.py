@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+# Compares reassembling video frames from chunks by joining a list of chunks,
+# as before, with copying them into a reusable frame buffer, fed with bytes
+# chunks (datagram protocol) and memoryview chunks (batched receive), with
+# and without copying each frame out as bytes, and with H.264 access unit
+# reassembly.
+#
+# The chunk sequences are cut from frames with the sizes the drone sends at
+# 720p, a large keyframe every second and smaller frames between, unless a
+# capture file of raw video data is given, in which case the stream is cut
+# into chunks the way the drone sends it.
+#
+#   python3 benchmarks/video_reassembly.py [iterations] [capture.h264]
+
+import random
+import sys
+from timeit import repeat
+
+from tello_asyncio.types import VideoFrameInfo
+from tello_asyncio.trace import TRACE, FRAME
+from tello_asyncio.video import (
+    TelloVideoListener,
+    AccessUnitAssembler,
+    MAX_CHUNK_SIZE,
+)
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+
+def synthetic_frames(seconds=10, fps=30):
+    random.seed(0)
+    for i in range(seconds * fps):
+        # an IDR or non-IDR slice NAL unit, with random data
+        if i % fps == 0:
+            header = b"\x00\x00\x00\x01\x65\x88"
+            size = random.randint(30000, 60000)
+        else:
+            header = b"\x00\x00\x00\x01\x41\x9a"
+            size = random.randint(2000, 15000)
+        yield header + random.getrandbits(8 * size).to_bytes(size, "little")
+
+
+def captured_frames(path):
+    # cut the stream into frames at access unit delimiters
+    data = open(path, "rb").read()
+    start = 0
+    while start < len(data):
+        end = data.find(b"\x00\x00\x00\x01\x09", start + 1)
+        if end < 0:
+            end = len(data)
+        yield data[start:end]
+        start = end
+
+
+def chunk(frames):
+    chunks = []
+    for frame in frames:
+        for i in range(0, len(frame), MAX_CHUNK_SIZE):
+            chunks.append(frame[i : i + MAX_CHUNK_SIZE])
+        if len(frame) % MAX_CHUNK_SIZE == 0:
+            chunks.append(b"")
+    return chunks
+
+
+frames = list(captured_frames(sys.argv[2]) if len(sys.argv) > 2 else synthetic_frames())
+chunks = chunk(frames)
+views = [memoryview(c) for c in chunks]
+total = sum(len(c) for c in chunks)
+
+
+class JoinProtocol(TelloVideoListener.Protocol):
+    # the previous reassembly, joining a list of chunks for each frame
+    def connection_made(self, transport):
+        self._chunks = []
+        self._first_received_at = None
+
+    def handle_datagram(self, data, received_at):
+        self.on_video_frame_chunk_received(data, received_at)
+        if not self._chunks:
+            self._first_received_at = received_at
+        self._chunks.append(data)
+        if len(data) != MAX_CHUNK_SIZE:
+            frame = b"".join(self._chunks)
+            trace = self.trace
+            if trace and trace.trace:
+                trace.event(
+                    TRACE, FRAME, f"{len(frame)} bytes in {len(self._chunks)} chunks"
+                )
+            info = VideoFrameInfo(
+                self._first_received_at, received_at, len(frame), len(self._chunks)
+            )
+            self._chunks = []
+            self.on_frame_received(frame, info)
+
+
+def reassemble(protocol_class, source, copy=False, access_units=False):
+    def run():
+        protocol = protocol_class()
+        protocol.connection_made(None)
+        protocol.copy = copy
+        protocol.on_video_frame_chunk_received = lambda chunk, received_at: None
+        received = []
+        protocol.on_frame_received = lambda frame, info: received.append(len(frame))
+        if access_units:
+            protocol.assembler = AccessUnitAssembler(protocol.on_frame_received)
+        for data in source:
+            protocol.handle_datagram(data, 0.0)
+        return received
+
+    return run
+
+
+paths = {
+    "join list of chunks": reassemble(JoinProtocol, chunks),
+    "frame buffer, bytes chunks": reassemble(TelloVideoListener.Protocol, chunks),
+    "frame buffer, memoryview chunks": reassemble(TelloVideoListener.Protocol, views),
+    "frame buffer, bytes chunks, copy": reassemble(
+        TelloVideoListener.Protocol, chunks, copy=True
+    ),
+    "access units, memoryview chunks": reassemble(
+        TelloVideoListener.Protocol, views, access_units=True
+    ),
+}
+
+expected = [len(f) for f in frames]
+print(f"{len(frames)} frames, {len(chunks)} chunks, {total / 1e6:.1f} MB")
+for name, run in paths.items():
+    assert run() == expected
+    elapsed = min(repeat(run, number=iterations, repeat=5))
+    print(f"  {name:34} {total * iterations / elapsed / 1e6:8.1f} MB/s")
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+# Several Tello EDUs in station mode, all connected to the same WiFi router.
+# Use the drones' IP addresses on your network.
+
+import asyncio
+from tello_asyncio import TelloSwarm
+
+DRONE_HOSTS = ["192.168.1.101", "192.168.1.102", "192.168.1.103"]
+
+
+async def main():
+    swarm = TelloSwarm(DRONE_HOSTS)
+    try:
+        await swarm.connect()
+        print("battery levels:", await swarm.all.query_battery())
+        await swarm.all.takeoff()
+        await swarm.all.turn_clockwise(360)
+        await swarm.all.land()
+    finally:
+        await swarm.disconnect()
+
+
+# Python 3.7+
+# asyncio.run(main())
+loop = asyncio.get_event_loop()
+loop.run_until_complete(main())
@@ -8,6 +8,9 @@
 # The OpenCV UI must run in the main thread, so the drone control runs in a
 # worker thread with its own asyncio event loop.
 #
+# The drone's video is relayed to OpenCV on another local port, so the
+# library can use it too, eg to record it at the same time.
+#
 # Please note:
 #   - If OpenCV fails to capture any video it gives up without showing the
 #     window
@@ -21,7 +24,10 @@ from threading import Thread
 
 import cv2  # requires python-opencv
 
-from tello_asyncio import Tello, VIDEO_URL
+from tello_asyncio import Tello, VideoRelay
+
+RELAY_PORT = 11112
+RELAY_URL = f"udp://127.0.0.1:{RELAY_PORT}"
 
 print("[main thread] START")
 
@@ -33,12 +39,14 @@ def fly():
     print("[fly thread] START")
 
     async def main():
-        drone = Tello()
+        relay = VideoRelay()
+        relay.add_udp(RELAY_PORT)
+        drone = Tello(video_relay=relay)
         try:
             await asyncio.sleep(1)
             await drone.wifi_wait_for_network(prompt=True)
             await drone.connect()
-            await drone.start_video(connect=False)
+            await drone.start_video()
             await drone.takeoff()
             await drone.turn_clockwise(360)
             await drone.land()
@@ -64,7 +72,7 @@ fly_thread.start()
 ##############################################################################
 # Video capture and GUI in main thread
 
-print(f"[main thread] OpenCV capturing video from {VIDEO_URL}")
+print(f"[main thread] OpenCV capturing video from {RELAY_URL}")
 print(
     f"[main thread] Press Ctrl-C or any key with the OpenCV window focussed to exit (the OpenCV window may take some time to close)"
 )
@@ -72,8 +80,8 @@ print(
 
 capture = None
 try:
-    capture = cv2.VideoCapture(VIDEO_URL)
-    capture.open(VIDEO_URL)
+    capture = cv2.VideoCapture(RELAY_URL)
+    capture.open(RELAY_URL)
 
     while True:
         # grab and show video frame in OpenCV window
@@ -3,10 +3,10 @@
 import asyncio
 from threading import Thread
 import tkinter  # requires python-tk
-import av       # requires pyav
 from PIL import Image, ImageTk  # requires Pillow
 
-from tello_asyncio import Tello, VIDEO_WIDTH, VIDEO_HEIGHT
+# VideoDecoder requires pyav and numpy
+from tello_asyncio import Tello, VideoDecoder, PixelFormat, VIDEO_WIDTH, VIDEO_HEIGHT
 
 frame_image = None
 
@@ -15,25 +15,18 @@ frame_image = None
 
 
 def fly():
-    codec = av.CodecContext.create('h264', 'r')
-
-    def on_video_frame(drone, buf):
+    # decoded in a worker thread, so it doesn't hold up the drone control
+    def on_decoded_frame(frame):
         global frame_image
-        try:
-            packets = codec.parse(buf)
-            for packet in packets:
-                frames = codec.decode(packet)
-                for frame in frames:
-                    frame_image = frame.to_image()
-        except Exception as e:
-            print(e)
+        frame_image = Image.fromarray(frame.image)
 
     async def main():
-        drone = Tello()
+        decoder = VideoDecoder(format=PixelFormat.RGB, on_frame=on_decoded_frame)
+        drone = Tello(video_decoder=decoder)
         try:
             await drone.wifi_wait_for_network(prompt=False)
             await drone.connect()
-            await drone.start_video(on_video_frame)
+            await drone.start_video()
             await drone.takeoff()
             await drone.turn_clockwise(360)
             await drone.land()
@@ -1,4 +1,5 @@
 from .tello import Tello
+from .swarm import TelloSwarm
 from .types import (
     Range,
     Vector,
@@ -8,5 +9,42 @@ from .types import (
     VideoFrameRate,
     VideoResolution,
     ControllerHardware,
+    RetransmissionStats,
+    RemoteControlStats,
+    TraceEvent,
+    CommandMetrics,
+    RateMetrics,
+    TelloMetrics,
+    SubscriptionStats,
+    OverflowPolicy,
+    StateChange,
+    MissionPadEvent,
+    MissionPadEventKind,
+    PositionEstimate,
+    EstimatorStats,
+    TelloResponse,
+    VideoFrameInfo,
+    ClockAlignment,
+    ReceiverStats,
+    ReassemblyStats,
+    DecodedFrame,
+    DecoderStats,
+    PixelFormat,
+    SharedFrame,
+    RecorderStats,
+    RelayStats,
+    VideoStats,
 )
+from .metrics import to_openmetrics
+from .state import LazyTelloState
+from .history import StateHistory
+from .estimator import PositionEstimator
+from .decoder import VideoDecoder
+from .shared import SharedFrameWriter, SharedFrameReader
+from .recorder import VideoRecorder
+from .relay import VideoRelay
+from .rc import RemoteControlChannel
+from .subscription import Subscription
+from .sync import StateBuffer
+from .trace import Tracer, TRACE
 from .video import VIDEO_UDP_PORT, VIDEO_URL, VIDEO_WIDTH, VIDEO_HEIGHT
@@ -0,0 +1,95 @@
+from collections import deque
+
+from .types import ClockAlignment
+
+DEFAULT_EDGE_WINDOW = 32
+
+# longer than this between ticks means the motors stopped and the counter paused
+MAX_TICK_INTERVAL = 2.0
+
+
+class ClockAligner:
+    """
+    Aligns the drone's motor time counter with host monotonic time, to
+    measure how long state messages take to arrive.
+
+    The drone's state has no clock of its own, only `motor_time`, the whole
+    seconds the motors have been running.  (`time_of_flight` is the distance
+    measured by the time of flight sensor, not a time.)  Each time the counter
+    ticks, the tick happened between the receive times of the last state with
+    the old count and the first with the new one, less the transmission
+    delay.  The earliest arrival of a tick over a window of recent ticks gives
+    the host time at which the counter would have read zero, including the
+    minimum delay, and each later tick's lateness compared with that is the
+    extra delay it suffered on the way.
+
+    The counter only runs while the motors do, so alignment only progresses
+    in flight, and starts again after each pause.
+
+    :param window: Number of recent ticks to align with
+    """
+
+    def __init__(self, window=DEFAULT_EDGE_WINDOW):
+        self._ticks = deque(maxlen=window)
+        self._motor_time = None
+        self._received_at = None
+        self._tick_count = 0
+
+    def update(self, motor_time, received_at):
+        """
+        Looks for a tick of the motor time counter.
+
+        :param motor_time: Motor time in seconds from a state message
+        :param received_at: Host monotonic time in seconds when the state was received
+        """
+        previous = self._motor_time
+        previous_received_at = self._received_at
+        self._motor_time = motor_time
+        self._received_at = received_at
+        if previous is None or motor_time is None or received_at is None:
+            return
+
+        if motor_time == previous + 1:
+            ticks = self._ticks
+            if ticks and received_at - ticks[-1][2] > MAX_TICK_INTERVAL:
+                ticks.clear()
+            # the tick happened between the two receive times, less the delay
+            ticks.append(
+                (
+                    received_at - motor_time,
+                    previous_received_at - motor_time,
+                    received_at,
+                )
+            )
+            self._tick_count += 1
+        elif motor_time < previous:
+            # counter restarted, eg after a battery change
+            self._ticks.clear()
+
+    def alignment(self, one_way_delay=None):
+        """
+        The current alignment, if the counter has ticked recently.
+
+        :param one_way_delay: Minimum transmission delay in seconds, if known, eg half the command round trip time
+        :rtype: :class:`tello_asyncio.types.ClockAlignment`
+        """
+        ticks = self._ticks
+        if not ticks:
+            return None
+        offset = min(t[0] for t in ticks)
+        lower = max(t[1] for t in ticks)
+        extra_delay = ticks[-1][0] - offset
+        latency = None if one_way_delay is None else one_way_delay + extra_delay
+        return ClockAlignment(
+            offset, max(0.0, offset - lower), self._tick_count, extra_delay, latency
+        )
+
+    def to_host_time(self, motor_time):
+        """
+        The host monotonic time at which a state with the given motor time
+        arrived at the earliest.
+        """
+        ticks = self._ticks
+        if not ticks:
+            return None
+        return min(t[0] for t in ticks) + motor_time
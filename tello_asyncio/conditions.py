@@ -0,0 +1,261 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+
+from .state import STATE_FIELD_SET
+
+OPERATORS = ("==", "!=", "<", "<=", ">", ">=")
+
+
+class ThresholdList:
+    """
+    Waiters on one field and ordering operator, sorted by threshold so those
+    satisfied by a value are found with a binary search.
+    """
+
+    __slots__ = ("thresholds", "futures")
+
+    def __init__(self):
+        self.thresholds = []
+        self.futures = []
+
+    def __len__(self):
+        return len(self.futures)
+
+    def add(self, threshold, future):
+        i = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.futures.insert(i, future)
+
+    def remove(self, threshold, future):
+        i = bisect_left(self.thresholds, threshold)
+        j = bisect_right(self.thresholds, threshold)
+        for k in range(i, j):
+            if self.futures[k] is future:
+                del self.thresholds[k]
+                del self.futures[k]
+                return True
+        return False
+
+    def take(self, start, stop):
+        # remove and return the futures with thresholds in a range of positions
+        futures = self.futures[start:stop]
+        del self.thresholds[start:stop]
+        del self.futures[start:stop]
+        return futures
+
+
+class FieldIndex:
+    """
+    The conditions waiting on one state field, and its last value.
+    """
+
+    __slots__ = ("value", "equal", "not_equal", "less", "greater", "count")
+
+    def __init__(self, value):
+        self.value = value
+        self.equal = {}
+        self.not_equal = []
+        # thresholds for field < threshold and field <= threshold
+        self.less = (ThresholdList(), ThresholdList())
+        # thresholds for field > threshold and field >= threshold
+        self.greater = (ThresholdList(), ThresholdList())
+        self.count = 0
+
+    def add(self, op, threshold, future):
+        if op == "==":
+            self.equal.setdefault(threshold, []).append(future)
+        elif op == "!=":
+            self.not_equal.append((threshold, future))
+        elif op == "<":
+            self.greater[0].add(threshold, future)
+        elif op == "<=":
+            self.greater[1].add(threshold, future)
+        elif op == ">":
+            self.less[0].add(threshold, future)
+        else:
+            self.less[1].add(threshold, future)
+        self.count += 1
+
+    def remove(self, op, threshold, future):
+        if op == "==":
+            futures = self.equal.get(threshold, ())
+            found = future in futures
+            if found:
+                futures.remove(future)
+                if not futures:
+                    del self.equal[threshold]
+        elif op == "!=":
+            found = (threshold, future) in self.not_equal
+            if found:
+                self.not_equal.remove((threshold, future))
+        elif op == "<":
+            found = self.greater[0].remove(threshold, future)
+        elif op == "<=":
+            found = self.greater[1].remove(threshold, future)
+        elif op == ">":
+            found = self.less[0].remove(threshold, future)
+        else:
+            found = self.less[1].remove(threshold, future)
+        if found:
+            self.count -= 1
+
+    def satisfied(self, value):
+        """
+        Removes and returns the futures whose conditions the value satisfies.
+        """
+        futures = self.equal.pop(value, [])
+
+        if self.not_equal:
+            waiting = []
+            for threshold, future in self.not_equal:
+                if value != threshold:
+                    futures.append(future)
+                else:
+                    waiting.append((threshold, future))
+            self.not_equal = waiting
+
+        # value > threshold for the lowest thresholds
+        above, at_or_above = self.less
+        if above:
+            futures += above.take(0, bisect_left(above.thresholds, value))
+        if at_or_above:
+            futures += at_or_above.take(0, bisect_right(at_or_above.thresholds, value))
+
+        # value < threshold for the highest thresholds
+        below, at_or_below = self.greater
+        if below:
+            futures += below.take(bisect_right(below.thresholds, value), len(below))
+        if at_or_below:
+            futures += at_or_below.take(
+                bisect_left(at_or_below.thresholds, value), len(at_or_below)
+            )
+
+        self.count -= len(futures)
+        return futures
+
+
+class ConditionIndex:
+    """
+    Pending conditions on drone state, checked as each state arrives.
+
+    Field conditions like `("height", ">", 100)` are kept in a per-field
+    index, so a new state only checks the conditions on fields whose value
+    has changed, and of those only the ones it satisfies, found by binary
+    search or dictionary lookup.  Arbitrary predicates are called with every
+    state.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._fields = {}
+        self._predicates = []
+        self._state = None
+
+    def add(self, condition):
+        """
+        Start waiting for a condition.
+
+        :param condition: `(field, operator, value)` or a callable taking a state
+        :return: Future with the first state satisfying the condition
+        :rtype: `asyncio.Future`
+        """
+        future = self._loop.create_future()
+        state = self._state
+
+        if callable(condition):
+            if state is not None and condition(state):
+                future.set_result(state)
+            else:
+                self._predicates.append((condition, future))
+            return future
+
+        field, op, threshold = condition
+        if field not in STATE_FIELD_SET or field == "raw":
+            raise ValueError(f"cannot wait for state field {field!r}")
+        if op not in OPERATORS:
+            raise ValueError(f"unknown operator {op!r}, expected one of {OPERATORS}")
+
+        value = None if state is None else getattr(state, field)
+        index = self._fields.get(field)
+        if index is None:
+            index = self._fields[field] = FieldIndex(value)
+        index.add(op, threshold, future)
+        if value is not None:
+            for f in index.satisfied(value):
+                if not f.done():
+                    f.set_result(state)
+        return future
+
+    def remove(self, condition, future):
+        """
+        Stop waiting for a condition, eg after a timeout.
+        """
+        if future.done() and not future.cancelled():
+            return
+        if callable(condition):
+            try:
+                self._predicates.remove((condition, future))
+            except ValueError:
+                pass
+            return
+        field, op, threshold = condition
+        index = self._fields.get(field)
+        if index is not None:
+            index.remove(op, threshold, future)
+            if not index.count:
+                del self._fields[field]
+
+    def update(self, state):
+        """
+        Resolves the conditions satisfied by a new state.
+        """
+        self._state = state
+
+        emptied = None
+        for field, index in self._fields.items():
+            value = getattr(state, field)
+            if value == index.value:
+                continue
+            index.value = value
+            if value is None:
+                continue
+            for future in index.satisfied(value):
+                if not future.done():
+                    future.set_result(state)
+            if not index.count:
+                if emptied is None:
+                    emptied = []
+                emptied.append(field)
+        if emptied:
+            for field in emptied:
+                del self._fields[field]
+
+        if self._predicates:
+            waiting = []
+            for predicate, future in self._predicates:
+                if future.done():
+                    continue
+                try:
+                    satisfied = predicate(state)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                if satisfied:
+                    future.set_result(state)
+                else:
+                    waiting.append((predicate, future))
+            self._predicates = waiting
+
+
+async def wait_for_condition(index, condition, timeout=None):
+    """
+    Waits for a condition in an index to be satisfied.
+
+    :raises asyncio.TimeoutError: if the timeout passes first
+    :return: The state that satisfied the condition
+    """
+    future = index.add(condition)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        index.remove(condition, future)
@@ -0,0 +1,268 @@
+import asyncio
+import logging
+from collections import deque
+from threading import Thread, Condition
+from time import monotonic, perf_counter
+
+try:
+    import av
+    import numpy  # needed by PyAV to convert pictures
+except ImportError:  # optional dependency
+    av = None
+
+from .types import DecodedFrame, DecoderStats, PixelFormat, OverflowPolicy
+from .subscription import Publisher, DEFAULT_SUBSCRIPTION_SIZE
+from .h264 import KEYFRAME_START_TYPES, first_nal_type
+from .trace import TRACE, FRAME, ERROR
+
+DEFAULT_MAX_LATENCY = 0.2  # seconds
+DEFAULT_MAX_PENDING = 30  # about a second of video
+
+
+class VideoDecoder:
+    """
+    Decodes video frames to NumPy arrays with PyAV in a worker thread, so
+    decoding never holds up the event loop, and with it command responses
+    and state.
+
+    Give one to the drone and read the decoded pictures as they come::
+
+        decoder = VideoDecoder(format=PixelFormat.BGR)
+        drone = Tello(video_decoder=decoder)
+        ...
+        await drone.start_video()
+        async for frame in drone.decoded_video_stream:
+            cv2.imshow("tello", frame.image)
+
+    To keep up with live video, pictures are dropped when late rather than
+    queued:
+
+    - Every frame is decoded, since later frames refer to it, and the
+      newest picture from each one is passed on.  Older pictures from the
+      same frame are not, nor is a picture received more than `max_latency`
+      ago by the time it is decoded if newer frames are already waiting, so
+      the backlog is skipped to catch up.
+    - If `max_pending` frames are waiting, decoding is too slow for the
+      stream, so they are all dropped undecoded, and decoding starts again
+      at the next keyframe.
+
+    Requires `PyAV <https://pyav.org/>`_ and `numpy <https://numpy.org/>`_.
+
+    :param format: Pixel format of the arrays
+    :type format: :class:`tello_asyncio.types.PixelFormat`
+    :param on_frame: Called on the event loop with each :class:`tello_asyncio.types.DecodedFrame`
+    :type on_frame: Callable, optional
+    :param max_latency: Longest time in seconds since a frame was received for its picture to be passed on while newer frames are waiting
+    :param max_pending: Most frames waiting to be decoded before they are dropped
+    :param trace: Trace channel for decoder events
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    """
+
+    _thread = None
+    _started_at = None
+    _first_frame_at = None
+
+    def __init__(
+        self,
+        format=PixelFormat.BGR,
+        on_frame=None,
+        max_latency=DEFAULT_MAX_LATENCY,
+        max_pending=DEFAULT_MAX_PENDING,
+        trace=None,
+    ):
+        if av is None:
+            raise ImportError("VideoDecoder requires av and numpy")
+        self._format = PixelFormat(format).value
+        self._on_frame = on_frame
+        self._max_latency = max_latency
+        self._max_pending = max_pending
+        self.trace = trace
+        self._publisher = Publisher()
+        self._pending = deque()
+        self._condition = Condition()
+        self._running = False
+        self._waiting_for_keyframe = True
+
+        self._submitted = 0
+        self._decoded = 0
+        self._delivered = 0
+        self._late_frames = 0
+        self._dropped_frames = 0
+        self._errors = 0
+        self._frames = 0
+        self._decode_time = 0.0
+        self._max_decode_time = 0.0
+
+    def start(self, loop=None, catch_up=None):
+        """
+        Starts the worker thread.
+
+        :param loop: Event loop to pass on decoded frames in
+        :param catch_up: Data and :class:`tello_asyncio.types.VideoFrameInfo` to start decoding with, eg from :attr:`tello_asyncio.tello.Tello.video_catch_up`, rather than waiting for the next keyframe
+        :type catch_up: tuple, optional
+        """
+        if self._thread:
+            return
+        self._loop = loop or asyncio.get_event_loop()
+        self._running = True
+        self._waiting_for_keyframe = True
+        self._started_at = monotonic()
+        self._first_frame_at = None
+        self._thread = Thread(target=self._run, name="VideoDecoder", daemon=True)
+        self._thread.start()
+        if catch_up:
+            self.submit(*catch_up)
+
+    async def stop(self):
+        """
+        Stops the worker thread, dropping any frames still waiting.
+        """
+        thread = self._thread
+        if not thread:
+            return
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify()
+        await self._loop.run_in_executor(None, thread.join)
+        self._thread = None
+
+    def submit(self, data, info):
+        """
+        Queues a frame for decoding.  Called on the event loop.
+
+        :param data: The frame data, copied since it may be a reused buffer
+        :param info: :class:`tello_asyncio.types.VideoFrameInfo` of the frame
+        """
+        if not self._running:
+            return
+        self._submitted += 1
+        if self._waiting_for_keyframe:
+            if info.is_keyframe is not None:
+                keyframe = info.is_keyframe
+            else:
+                keyframe = first_nal_type(data) in KEYFRAME_START_TYPES
+            if not keyframe:
+                self._dropped_frames += 1
+                return
+            self._waiting_for_keyframe = False
+
+        with self._condition:
+            pending = self._pending
+            if len(pending) >= self._max_pending:
+                dropped = len(pending)
+                pending.clear()
+                self._dropped_frames += dropped + 1
+                self._waiting_for_keyframe = True
+                trace = self.trace
+                if trace and trace.warning:
+                    trace.event(
+                        logging.WARNING,
+                        FRAME,
+                        f"decoder behind, dropped {dropped} frames",
+                    )
+                return
+            pending.append((bytes(data), info))
+            self._condition.notify()
+
+    def _run(self):
+        codec = av.CodecContext.create("h264", "r")
+        condition = self._condition
+        pending = self._pending
+        while True:
+            with condition:
+                while self._running and not pending:
+                    condition.wait()
+                if not self._running:
+                    return
+                data, info = pending.popleft()
+
+            start = perf_counter()
+            try:
+                pictures = []
+                for packet in codec.parse(data):
+                    pictures.extend(codec.decode(packet))
+            except Exception as e:
+                self._errors += 1
+                trace = self.trace
+                if trace and trace.debug:
+                    trace.event(logging.DEBUG, ERROR, f"decode failed: {e}")
+                continue
+
+            last = len(pictures) - 1
+            for i, picture in enumerate(pictures):
+                self._decoded += 1
+                received_at = info.received_at
+                if i < last or (
+                    pending
+                    and received_at is not None
+                    and monotonic() - received_at > self._max_latency
+                ):
+                    self._late_frames += 1
+                    continue
+                image = picture.to_ndarray(format=self._format)
+                frame = DecodedFrame(image, info, monotonic())
+                self._loop.call_soon_threadsafe(self._deliver, frame)
+
+            elapsed = perf_counter() - start
+            self._frames += 1
+            self._decode_time += elapsed
+            if elapsed > self._max_decode_time:
+                self._max_decode_time = elapsed
+
+    def _deliver(self, frame):
+        self._delivered += 1
+        if self._first_frame_at is None:
+            self._first_frame_at = frame.decoded_at
+        trace = self.trace
+        if trace and trace.trace and frame.info.received_at is not None:
+            latency = frame.decoded_at - frame.info.received_at
+            trace.event(TRACE, FRAME, f"decoded {latency * 1000:.1f} ms after receipt")
+        self._publisher.publish(frame)
+        if self._on_frame:
+            self._on_frame(frame)
+
+    def subscribe(
+        self, maxsize=DEFAULT_SUBSCRIPTION_SIZE, overflow=OverflowPolicy.CONFLATE
+    ):
+        """
+        Queue decoded frames for one consumer, by default only the latest.
+
+        :param maxsize: Maximum number of frames queued
+        :param overflow: What to do with a new frame when the queue is full, defaults to keeping only the latest
+        :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+        :rtype: :class:`tello_asyncio.subscription.Subscription`
+        """
+        return self._publisher.subscribe(maxsize, overflow)
+
+    @property
+    async def stream(self):
+        """
+        Infinite stream of the latest decoded frames.
+
+        :rtype: :class:`tello_asyncio.types.DecodedFrame`
+        """
+        with self.subscribe() as subscription:
+            async for frame in subscription:
+                yield frame
+
+    def stats(self):
+        """
+        How many frames have been decoded, passed on and dropped, and how long
+        decoding took.
+
+        :rtype: :class:`tello_asyncio.types.DecoderStats`
+        """
+        frames = self._frames
+        first = self._first_frame_at
+        return DecoderStats(
+            self._submitted,
+            self._decoded,
+            self._delivered,
+            self._late_frames,
+            self._dropped_frames,
+            self._errors,
+            self._decode_time / frames if frames else None,
+            self._max_decode_time,
+            first - self._started_at if first is not None else None,
+        )
@@ -0,0 +1,258 @@
+from math import radians, sin, cos
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from .types import Vector, PositionEstimate, EstimatorStats
+
+VELOCITY_SCALE = 10.0  # cm/s per unit of state velocity (dm/s)
+ACCELERATION_SCALE = 0.980665  # cm/s² per unit of state acceleration (mg)
+GRAVITY = 1000.0  # state acceleration reading due to gravity, in mg
+
+INITIAL_POSITION_VARIANCE = 1.0  # cm²
+INITIAL_VELOCITY_VARIANCE = 100.0  # (cm/s)²
+
+
+class PositionEstimator:
+    """
+    Dead reckoning estimate of the drone's position, from the velocity,
+    acceleration and attitude in its state messages, corrected by the height
+    and any mission pad position.
+
+    Give one to the drone and read the estimate as each state arrives::
+
+        drone = Tello(position_estimator=PositionEstimator())
+        ...
+        print(drone.estimated_position.position)
+
+    Each axis is a two state (position, velocity) Kalman filter, with the
+    three axes updated together as NumPy arrays.  The acceleration, rotated
+    from the drone's body to the world by its attitude and less gravity,
+    drives the prediction between states, and the velocity, height and
+    mission pad position are measurements.
+
+    Positions are in cm from where the estimator started, with x and y
+    following the drone's velocity readings and z up.  Without mission pads
+    the x and y estimates drift, and their variance grows to show it.
+
+    Requires `numpy <https://numpy.org/>`_.
+
+    :param acceleration_noise: Standard deviation of unmodelled acceleration, in cm/s²
+    :param velocity_noise: Standard deviation of velocity readings, in cm/s
+    :param height_noise: Standard deviation of height readings, in cm
+    :param mission_pad_noise: Standard deviation of mission pad positions, in cm
+    :param mission_pad_origins: Positions of mission pads by ID, defaults to every pad being at the origin; pads not listed are ignored
+    :type mission_pad_origins: dict of int to :class:`tello_asyncio.types.Vector`, optional
+    :param use_acceleration: Whether to use the acceleration readings in the prediction
+    """
+
+    def __init__(
+        self,
+        acceleration_noise=50.0,
+        velocity_noise=10.0,
+        height_noise=5.0,
+        mission_pad_noise=5.0,
+        mission_pad_origins=None,
+        use_acceleration=True,
+    ):
+        if np is None:
+            raise ImportError("PositionEstimator requires numpy")
+        self._acceleration_variance = acceleration_noise ** 2
+        self._velocity_variance = velocity_noise ** 2
+        self._height_variance = height_noise ** 2
+        self._mission_pad_variance = mission_pad_noise ** 2
+        self._mission_pad_origins = mission_pad_origins
+        self._use_acceleration = use_acceleration
+
+        # per axis state and the three distinct values of its 2x2 covariance
+        self._position = np.zeros(3)
+        self._velocity = np.zeros(3)
+        self._p00 = np.full(3, INITIAL_POSITION_VARIANCE)
+        self._p01 = np.zeros(3)
+        self._p11 = np.full(3, INITIAL_VELOCITY_VARIANCE)
+
+        self._velocity_mask = np.array([1.0, 1.0, 0.0])
+        self._height_mask = np.array([0.0, 0.0, 1.0])
+        self._all_mask = np.ones(3)
+
+        self._time = None
+        self._yaw_origin = None
+
+        self._updates = 0
+        self._update_time = 0.0
+        self._max_update_time = 0.0
+
+    def reset(self, position=Vector(0, 0, 0)):
+        """
+        Start again from a known position, at rest.
+        """
+        self._position[:] = position
+        self._velocity[:] = 0
+        self._p00[:] = INITIAL_POSITION_VARIANCE
+        self._p01[:] = 0
+        self._p11[:] = INITIAL_VELOCITY_VARIANCE
+        self._time = None
+        self._yaw_origin = None
+
+    def update(self, state, time):
+        """
+        Brings the estimate up to date with a new state.
+
+        :param state: The drone state
+        :type state: :class:`tello_asyncio.types.TelloState`
+        :param time: Monotonic time in seconds when the state was received
+        """
+        start = perf_counter()
+
+        if self._yaw_origin is None and state.yaw is not None:
+            self._yaw_origin = state.yaw
+
+        if self._time is not None:
+            dt = time - self._time
+            if dt > 0:
+                self._predict(dt, self._world_acceleration(state))
+        self._time = time
+
+        velocity = state.velocity
+        if velocity.x is not None:
+            self._correct_velocity(
+                np.array(
+                    (velocity.x * VELOCITY_SCALE, velocity.y * VELOCITY_SCALE, 0.0)
+                ),
+                self._velocity_mask,
+                self._velocity_variance,
+            )
+
+        if state.height is not None:
+            self._correct_position(
+                np.array((0.0, 0.0, float(state.height))),
+                self._height_mask,
+                self._height_variance,
+            )
+
+        mission_pad = state.mission_pad
+        if mission_pad is not None and mission_pad > 0:
+            if self._mission_pad_origins is None:
+                origin = (0.0, 0.0, 0.0)
+            else:
+                origin = self._mission_pad_origins.get(mission_pad)
+            position = state.mission_pad_position
+            if origin is not None and position.x is not None:
+                self._correct_position(
+                    np.array(
+                        (
+                            origin[0] + position.x,
+                            origin[1] + position.y,
+                            origin[2] + position.z,
+                        )
+                    ),
+                    self._all_mask,
+                    self._mission_pad_variance,
+                )
+
+        elapsed = perf_counter() - start
+        self._updates += 1
+        self._update_time += elapsed
+        if elapsed > self._max_update_time:
+            self._max_update_time = elapsed
+
+    def _world_acceleration(self, state):
+        a = state.acceleration
+        if not self._use_acceleration or a.x is None or state.roll is None:
+            return 0.0
+
+        # rotate from body to world axes, yaw then pitch then roll
+        roll = radians(state.roll)
+        pitch = radians(state.pitch)
+        yaw = radians(state.yaw - self._yaw_origin)
+        sr, cr = sin(roll), cos(roll)
+        sp, cp = sin(pitch), cos(pitch)
+        sy, cy = sin(yaw), cos(yaw)
+        x = (
+            cy * cp * a.x
+            + (cy * sp * sr - sy * cr) * a.y
+            + (cy * sp * cr + sy * sr) * a.z
+        )
+        y = (
+            sy * cp * a.x
+            + (sy * sp * sr + cy * cr) * a.y
+            + (sy * sp * cr - cy * sr) * a.z
+        )
+        z = -sp * a.x + cp * sr * a.y + cp * cr * a.z
+
+        # at rest the z reading is -1 g, so upwards is the negated remainder
+        return np.array(
+            (
+                x * ACCELERATION_SCALE,
+                y * ACCELERATION_SCALE,
+                -(z + GRAVITY) * ACCELERATION_SCALE,
+            )
+        )
+
+    def _predict(self, dt, acceleration):
+        dt2 = dt * dt
+        self._position += self._velocity * dt + acceleration * (0.5 * dt2)
+        self._velocity += acceleration * dt
+
+        # P = F P F' + Q, with Q for white noise acceleration
+        q = self._acceleration_variance
+        p01 = self._p01
+        p11 = self._p11
+        self._p00 += 2 * dt * p01 + dt2 * p11 + q * dt2 * dt2 / 4
+        self._p01 = p01 + dt * p11 + q * dt2 * dt / 2
+        self._p11 = p11 + q * dt2
+
+    def _correct_position(self, z, mask, variance):
+        p00 = self._p00
+        p01 = self._p01
+        s = p00 + variance
+        k0 = mask * p00 / s
+        k1 = mask * p01 / s
+        y = z - self._position
+        self._position += k0 * y
+        self._velocity += k1 * y
+        self._p00 = p00 - k0 * p00
+        self._p01 = p01 - k0 * p01
+        self._p11 = self._p11 - k1 * p01
+
+    def _correct_velocity(self, z, mask, variance):
+        p01 = self._p01
+        p11 = self._p11
+        s = p11 + variance
+        k0 = mask * p01 / s
+        k1 = mask * p11 / s
+        y = z - self._velocity
+        self._position += k0 * y
+        self._velocity += k1 * y
+        self._p00 = self._p00 - k0 * p01
+        self._p01 = p01 - k0 * p11
+        self._p11 = p11 - k1 * p11
+
+    def estimate(self):
+        """
+        The current estimate.
+
+        :rtype: :class:`tello_asyncio.types.PositionEstimate`
+        """
+        covariance = np.empty((3, 2, 2))
+        covariance[:, 0, 0] = self._p00
+        covariance[:, 0, 1] = covariance[:, 1, 0] = self._p01
+        covariance[:, 1, 1] = self._p11
+        return PositionEstimate(
+            Vector(*self._position.tolist()),
+            Vector(*self._velocity.tolist()),
+            covariance,
+            self._time,
+        )
+
+    def stats(self):
+        """
+        How many states have been used, and how long the updates took.
+
+        :rtype: :class:`tello_asyncio.types.EstimatorStats`
+        """
+        mean = self._update_time / self._updates if self._updates else None
+        return EstimatorStats(self._updates, mean, self._max_update_time)
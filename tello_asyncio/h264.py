@@ -0,0 +1,94 @@
+START_CODE = b"\x00\x00\x01"
+
+# NAL unit types
+NAL_SLICE = 1
+NAL_IDR_SLICE = 5
+NAL_SEI = 6
+NAL_SPS = 7
+NAL_PPS = 8
+NAL_ACCESS_UNIT_DELIMITER = 9
+
+# NAL unit types a keyframe access unit from the drone starts with
+KEYFRAME_START_TYPES = frozenset((NAL_SPS, NAL_IDR_SLICE))
+
+# NAL unit types that may only come before the first slice of an access unit
+ACCESS_UNIT_PREFIX_TYPES = frozenset(
+    (NAL_SEI, NAL_SPS, NAL_PPS, NAL_ACCESS_UNIT_DELIMITER)
+)
+
+
+def nal_type(header):
+    """
+    The type of a NAL unit from its header byte.
+    """
+    return header & 0x1F
+
+
+def is_slice(t):
+    """
+    Whether a NAL unit type is a coded slice of a picture.
+    """
+    return t == NAL_SLICE or t == NAL_IDR_SLICE
+
+
+def is_first_slice(first_byte):
+    """
+    Whether a slice is the first of its picture, from the first byte after its
+    NAL header, which starts with `first_mb_in_slice` as an Exp-Golomb code
+    that is a single 1 bit for 0.
+    """
+    return first_byte & 0x80 != 0
+
+
+def first_nal_type(data):
+    """
+    The type of the NAL unit data starts with, after an Annex B start code of
+    three or four bytes.
+
+    :return: The NAL unit type, or `None` if the data does not start with a start code
+    """
+    head = bytes(data[:5])
+    if head[:3] == START_CODE:
+        return nal_type(head[3]) if len(head) > 3 else None
+    if head[:4] == b"\x00" + START_CODE and len(head) > 4:
+        return nal_type(head[4])
+    return None
+
+
+def nal_units(data):
+    """
+    Splits Annex B data into NAL units, each with its start code, including
+    the leading zero of a four byte one.
+
+    :param data: The data, starting with a start code
+    :type data: `bytes`
+    :return: List of `(type, start, end)` of each NAL unit
+    """
+    units = []
+    position = data.find(START_CODE)
+    while 0 <= position and position + 3 < len(data):
+        start = position - 1 if position > 0 and data[position - 1] == 0 else position
+        t = nal_type(data[position + 3])
+        position = data.find(START_CODE, position + 3)
+        if position < 0:
+            end = len(data)
+        else:
+            end = position - 1 if data[position - 1] == 0 else position
+        units.append((t, start, end))
+    return units
+
+
+def has_idr_slice(data):
+    """
+    Whether Annex B data has an IDR slice, ie is or ends a keyframe,
+    scanning its NAL units unless it starts with a non-IDR slice.
+
+    :param data: The data, starting with a start code
+    :type data: `bytes`
+    """
+    t = first_nal_type(data)
+    if t is None or t == NAL_SLICE:
+        return False
+    if t == NAL_IDR_SLICE:
+        return True
+    return any(u[0] == NAL_IDR_SLICE for u in nal_units(bytes(data)))
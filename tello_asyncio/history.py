@@ -0,0 +1,232 @@
+from time import monotonic
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+DEFAULT_HISTORY_CAPACITY = 600  # about a minute of state at 10 messages per second
+
+# state fields stored as columns, with the number of values in each
+HISTORY_COLUMNS = {
+    "roll": 1,
+    "pitch": 1,
+    "yaw": 1,
+    "height": 1,
+    "barometer": 1,
+    "battery": 1,
+    "time_of_flight": 1,
+    "motor_time": 1,
+    "temperature": 2,
+    "acceleration": 3,
+    "velocity": 3,
+    "mission_pad": 1,
+    "mission_pad_position": 3,
+}
+
+
+class StateHistory:
+    """
+    The most recent drone states, stored column-wise in preallocated NumPy
+    arrays for windowed analysis, eg velocity smoothing, drift detection or
+    battery drain rate::
+
+        history = StateHistory(capacity=600)
+        drone = Tello(state_history=history)
+        ...
+        history.window(seconds=5).mean("velocity")
+
+    Each state field is a column of floats, with vectors and ranges as
+    columns of 3 and 2 values, and missing values as NaN.  There is also a
+    `time` column with the monotonic time each state was received.
+
+    Adding a state writes into the existing arrays, overwriting the oldest
+    once the history is full.
+
+    Requires `numpy <https://numpy.org/>`_.
+
+    :param capacity: Maximum number of states to keep
+    """
+
+    def __init__(self, capacity=DEFAULT_HISTORY_CAPACITY):
+        if np is None:
+            raise ImportError("StateHistory requires numpy")
+        self._capacity = capacity
+        self._count = 0
+        self._next = 0
+        self._time = np.zeros(capacity)
+        self._columns = {
+            name: np.full((capacity,) if n == 1 else (capacity, n), np.nan)
+            for name, n in HISTORY_COLUMNS.items()
+        }
+        self._scalars = [
+            (name, self._columns[name])
+            for name, n in HISTORY_COLUMNS.items()
+            if n == 1
+        ]
+        self._tuples = [
+            (name, self._columns[name])
+            for name, n in HISTORY_COLUMNS.items()
+            if n > 1
+        ]
+
+    @property
+    def capacity(self):
+        """
+        Maximum number of states kept.
+        """
+        return self._capacity
+
+    def __len__(self):
+        return self._count
+
+    def append(self, state, time):
+        """
+        Add a state, overwriting the oldest if full.
+
+        :param state: The drone state
+        :type state: :class:`tello_asyncio.types.TelloState`
+        :param time: Monotonic time in seconds when the state was received
+        """
+        i = self._next
+        self._time[i] = time
+        nan = np.nan
+        for name, column in self._scalars:
+            v = getattr(state, name)
+            column[i] = nan if v is None else v
+        for name, column in self._tuples:
+            values = getattr(state, name)
+            for j in range(len(values)):
+                v = values[j]
+                column[i, j] = nan if v is None else v
+
+        self._next = (i + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def last(self, n):
+        """
+        The most recent states.
+
+        :param n: Maximum number of states
+        :rtype: :class:`tello_asyncio.history.StateHistoryWindow`
+        """
+        n = min(n, self._count)
+        return StateHistoryWindow(self, self._count - n, self._count)
+
+    def window(self, seconds, now=None):
+        """
+        The states received in the last few seconds.
+
+        :param seconds: Length of the window in seconds
+        :param now: Monotonic time in seconds the window ends at, defaults to now
+        :rtype: :class:`tello_asyncio.history.StateHistoryWindow`
+        """
+        if now is None:
+            now = monotonic()
+        return self.between(now - seconds, now)
+
+    def between(self, start, end):
+        """
+        The states received between two times.
+
+        :param start: Monotonic time in seconds, inclusive
+        :param end: Monotonic time in seconds, inclusive
+        :rtype: :class:`tello_asyncio.history.StateHistoryWindow`
+        """
+        return StateHistoryWindow(
+            self, self._search(start, "left"), self._search(end, "right")
+        )
+
+    def _search(self, time, side):
+        # binary search for the logical index of a time, oldest first
+        if self._count < self._capacity:
+            return int(np.searchsorted(self._time[: self._count], time, side))
+        older = self._time[self._next :]
+        i = int(np.searchsorted(older, time, side))
+        if i < len(older):
+            return i
+        return len(older) + int(np.searchsorted(self._time[: self._next], time, side))
+
+    def _take(self, array, start, stop):
+        # values for a range of logical indices, oldest first
+        if self._count < self._capacity:
+            return array[start:stop]
+        length = stop - start
+        start = (self._next + start) % self._capacity
+        stop = start + length
+        if stop <= self._capacity:
+            return array[start:stop]
+        return np.concatenate((array[start:], array[: stop - self._capacity]))
+
+
+class StateHistoryWindow:
+    """
+    A range of states from a :class:`tello_asyncio.history.StateHistory`, oldest first.
+
+    Columns are views into the history's arrays where possible, so copy them
+    if they need to outlive further updates.
+    """
+
+    def __init__(self, history, start, stop):
+        self._history = history
+        self._start = start
+        self._stop = max(start, stop)
+
+    def __len__(self):
+        return self._stop - self._start
+
+    @property
+    def time(self):
+        """
+        Monotonic times in seconds when the states were received.
+        """
+        return self._history._take(self._history._time, self._start, self._stop)
+
+    def column(self, name):
+        """
+        Values of a state field, eg `"height"`, with shape (n,) for single
+        values, or (n, 3) for vectors and (n, 2) for ranges.
+        """
+        history = self._history
+        return history._take(history._columns[name], self._start, self._stop)
+
+    __getitem__ = column
+
+    def mean(self, name):
+        """
+        Mean value of a state field, ignoring missing values.
+        """
+        return np.nanmean(self.column(name), axis=0)
+
+    def std(self, name):
+        """
+        Standard deviation of a state field, ignoring missing values.
+        """
+        return np.nanstd(self.column(name), axis=0)
+
+    def min(self, name):
+        """
+        Minimum value of a state field, ignoring missing values.
+        """
+        return np.nanmin(self.column(name), axis=0)
+
+    def max(self, name):
+        """
+        Maximum value of a state field, ignoring missing values.
+        """
+        return np.nanmax(self.column(name), axis=0)
+
+    def slope(self, name):
+        """
+        Least squares rate of change per second of a state field, eg the
+        battery drain rate.
+        """
+        t = self.time
+        values = self.column(name)
+        t = t - t.mean() if len(t) else t
+        dt2 = np.dot(t, t)
+        if dt2 == 0:
+            return np.full(values.shape[1:], np.nan)
+        centred = values - np.nanmean(values, axis=0)
+        return np.nansum(centred * (t if values.ndim == 1 else t[:, None]), axis=0) / dt2
@@ -0,0 +1,361 @@
+from bisect import bisect_left
+
+from .types import CommandMetrics, RateMetrics, VideoStats
+
+# upper bounds in seconds of the command latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    60.0,
+    float("inf"),
+)
+
+# smoothing gain for rate and jitter estimates, as in RFC 3550
+RATE_GAIN = 1 / 16
+
+# upper bounds in bytes of the video frame size histogram buckets
+FRAME_SIZE_BUCKETS = (
+    1000,
+    2000,
+    5000,
+    10000,
+    20000,
+    50000,
+    100000,
+    200000,
+    float("inf"),
+)
+
+# seconds of video the rolling averages cover
+DEFAULT_VIDEO_WINDOW = 10
+
+
+class LatencyHistogram:
+    """
+    Counts of latencies falling in each of the :data:`LATENCY_BUCKETS`.
+    """
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, latency):
+        self.counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.sum += latency
+
+
+class CommandCounters:
+    """
+    Latency histogram and failure counts for one command verb, eg `forward`.
+    """
+
+    __slots__ = ("latency", "errors", "timeouts")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+
+    def snapshot(self):
+        latency = self.latency
+        return CommandMetrics(
+            latency.count,
+            self.errors,
+            self.timeouts,
+            latency.sum,
+            tuple(latency.counts),
+        )
+
+
+class ControlCounters:
+    """
+    Command and response counts for one drone's control connection.
+    """
+
+    def __init__(self):
+        self.commands = {}
+        self.mismatched_responses = 0
+        self.unexpected_responses = 0
+        self.late_responses = 0
+
+    def command(self, message):
+        verb = message.split(" ", 1)[0]
+        counters = self.commands.get(verb)
+        if counters is None:
+            counters = self.commands[verb] = CommandCounters()
+        return counters
+
+    def snapshot(self):
+        return {verb: c.snapshot() for verb, c in self.commands.items()}
+
+
+class RateMeter:
+    """
+    Smoothed arrival rate and inter-arrival jitter of a stream of messages.
+    """
+
+    __slots__ = ("count", "_last_time", "_interval", "_jitter")
+
+    def __init__(self):
+        self.count = 0
+        self._last_time = None
+        self._interval = None
+        self._jitter = 0.0
+
+    def add(self, time):
+        """
+        Count a message.
+
+        :param time: Monotonic time in seconds when the message arrived
+        """
+        self.count += 1
+        if self._last_time is not None:
+            interval = time - self._last_time
+            if self._interval is None:
+                self._interval = interval
+            else:
+                self._jitter += RATE_GAIN * (
+                    abs(interval - self._interval) - self._jitter
+                )
+                self._interval += RATE_GAIN * (interval - self._interval)
+        self._last_time = time
+
+    def snapshot(self):
+        rate = 1 / self._interval if self._interval else None
+        return RateMetrics(self.count, rate, self._jitter, self._last_time)
+
+
+class RollingCounts:
+    """
+    Counts over the last few seconds, in a ring of one second buckets.
+    """
+
+    __slots__ = ("_buckets",)
+
+    def __init__(self, seconds, width):
+        # each bucket is its second followed by the counts
+        self._buckets = [[None] + [0] * width for _ in range(seconds)]
+
+    def add(self, time, *values):
+        second = int(time)
+        bucket = self._buckets[second % len(self._buckets)]
+        if bucket[0] != second:
+            bucket[0] = second
+            for i in range(1, len(bucket)):
+                bucket[i] = 0
+        for i, value in enumerate(values, 1):
+            bucket[i] += value
+
+    def totals(self, first, last):
+        """
+        Totals of each count over the whole seconds from `first` to `last`.
+        """
+        totals = [0] * (len(self._buckets[0]) - 1)
+        for bucket in self._buckets:
+            second = bucket[0]
+            if second is not None and first <= second <= last:
+                for i in range(len(totals)):
+                    totals[i] += bucket[i + 1]
+        return totals
+
+
+class VideoMeter:
+    """
+    Frame rate, bitrate, chunks per frame, frame sizes and keyframe interval
+    of a video stream, in constant memory.
+
+    Smoothed rates and jitter come from :class:`tello_asyncio.metrics.RateMeter`,
+    bitrates and chunks per frame from one second buckets over a rolling
+    window, and frame sizes are counted in :data:`FRAME_SIZE_BUCKETS`.
+
+    :param window: Seconds the rolling averages cover
+    """
+
+    def __init__(self, window=DEFAULT_VIDEO_WINDOW):
+        self._frames = RateMeter()
+        self._keyframes = RateMeter()
+        self._window = RollingCounts(window, 3)
+        self._window_seconds = window
+        self._size_counts = [0] * len(FRAME_SIZE_BUCKETS)
+        self._chunks = 0
+        self._bytes = 0
+        self._frame_chunks = 0
+        self._frame_bytes = 0
+        self._first_second = None
+        self.incomplete_frames = 0
+
+    def add_chunk(self, size):
+        """
+        Count a datagram of video data.
+        """
+        self._chunks += 1
+        self._bytes += size
+        self._frame_chunks += 1
+        self._frame_bytes += size
+
+    def add_frame(self, size, time, keyframe, complete=True):
+        """
+        Count a reassembled frame, and the chunks since the last one.
+
+        :param size: Frame size in bytes
+        :param time: Monotonic time in seconds when the frame arrived
+        :param keyframe: Whether the frame is a keyframe
+        :param complete: Whether the frame starts as it should, ie with a start code
+        """
+        self._frames.add(time)
+        if keyframe:
+            self._keyframes.add(time)
+        if not complete:
+            self.incomplete_frames += 1
+        self._size_counts[bisect_left(FRAME_SIZE_BUCKETS, size)] += 1
+        self._window.add(time, self._frame_bytes, 1, self._frame_chunks)
+        self._frame_bytes = 0
+        self._frame_chunks = 0
+        if self._first_second is None:
+            self._first_second = int(time)
+
+    def snapshot(self, now, reassembly=None):
+        """
+        :param now: Monotonic time in seconds
+        :param reassembly: Counts of frames dropped in reassembly
+        :type reassembly: :class:`tello_asyncio.types.ReassemblyStats`, optional
+        :rtype: :class:`tello_asyncio.types.VideoStats`
+        """
+        frames = self._frames.snapshot()
+        keyframes = self._keyframes.snapshot()
+        window = self._window
+
+        # whole seconds only, so not the one in progress
+        last = int(now) - 1
+        bitrate = mean_bitrate = chunks_per_frame = None
+        if self._first_second is not None and last >= self._first_second:
+            bitrate = window.totals(last, last)[0] * 8
+            first = max(self._first_second, last - self._window_seconds + 2)
+            size, count, chunks = window.totals(first, last)
+            mean_bitrate = size * 8 / (last - first + 1)
+            if count:
+                chunks_per_frame = chunks / count
+
+        if reassembly is not None:
+            dropped_frames = reassembly.dropped_frames + reassembly.truncated_frames
+            dropped_chunks = reassembly.dropped_chunks
+        else:
+            dropped_frames = dropped_chunks = None
+
+        return VideoStats(
+            frames.count,
+            self._chunks,
+            self._bytes,
+            frames.rate,
+            frames.jitter,
+            bitrate,
+            mean_bitrate,
+            chunks_per_frame,
+            keyframes.count,
+            1 / keyframes.rate if keyframes.rate else None,
+            self.incomplete_frames,
+            dropped_frames,
+            dropped_chunks,
+            tuple(self._size_counts),
+        )
+
+
+def to_openmetrics(*drone_metrics):
+    """
+    Formats drone metrics in the `OpenMetrics <https://openmetrics.io/>`_ text
+    format, eg to serve to Prometheus.
+
+    :param drone_metrics: Metrics from one or more drones
+    :type drone_metrics: :class:`tello_asyncio.types.TelloMetrics`
+    :rtype: str
+    """
+    lines = []
+
+    def family(name, metric_type, help):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    family(
+        "tello_command_latency_seconds",
+        "histogram",
+        "Time from sending a command to its response.",
+    )
+    for m in drone_metrics:
+        for verb, c in sorted(m.commands.items()):
+            labels = f'drone="{m.drone}",command="{verb}"'
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, c.latency_buckets):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'tello_command_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}'
+                )
+            lines.append(f"tello_command_latency_seconds_count{{{labels}}} {c.count}")
+            lines.append(f"tello_command_latency_seconds_sum{{{labels}}} {c.latency_sum}")
+
+    for name, attr, help in (
+        ("tello_command_errors", "errors", "Error responses from the drone."),
+        ("tello_command_timeouts", "timeouts", "Commands with no response in time."),
+    ):
+        family(name, "counter", help)
+        for m in drone_metrics:
+            for verb, c in sorted(m.commands.items()):
+                lines.append(
+                    f'{name}_total{{drone="{m.drone}",command="{verb}"}} {getattr(c, attr)}'
+                )
+
+    for name, attr, help in (
+        (
+            "tello_mismatched_responses",
+            "mismatched_responses",
+            "Responses to a different command than expected.",
+        ),
+        (
+            "tello_unexpected_responses",
+            "unexpected_responses",
+            "Responses received when no command was waiting.",
+        ),
+        (
+            "tello_late_responses",
+            "late_responses",
+            "Responses received after the command timed out.",
+        ),
+    ):
+        family(name, "counter", help)
+        for m in drone_metrics:
+            lines.append(f'{name}_total{{drone="{m.drone}"}} {getattr(m, attr)}')
+
+    family("tello_state_packets", "counter", "State messages received.")
+    for m in drone_metrics:
+        lines.append(f'tello_state_packets_total{{drone="{m.drone}"}} {m.state.count}')
+
+    for name, attr, help in (
+        ("tello_state_rate_hertz", "rate", "Smoothed state message rate."),
+        (
+            "tello_state_jitter_seconds",
+            "jitter",
+            "Smoothed state message inter-arrival jitter.",
+        ),
+    ):
+        family(name, "gauge", help)
+        for m in drone_metrics:
+            value = getattr(m.state, attr)
+            if value is not None:
+                lines.append(f'{name}{{drone="{m.drone}"}} {value}')
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,201 @@
+import asyncio
+
+from .types import RemoteControlStats
+from .trace import TRACE, SEND
+
+DEFAULT_RC_RATE = 20  # Hz
+DEFAULT_KEEPALIVE_INTERVAL = 0.5  # s
+
+# smoothing gain for the jitter estimate, as in RFC 3550
+JITTER_GAIN = 1 / 16
+
+RC_PREFIX = b"rc "
+RC_MAX_LENGTH = len(b"rc -100 -100 -100 -100")
+
+# encoded stick values, so building a message never formats a string
+_STICK_VALUES = {v: str(v).encode("ascii") for v in range(-100, 101)}
+
+
+class RemoteControlChannel:
+    """
+    Sends remote control (`rc`) commands at a fixed rate.
+
+    Callers update the target stick values with :meth:`set` as often as they
+    like, eg from a joystick or PID loop, and only the latest values are sent
+    on each tick.  Nothing is sent if the values are unchanged, except every
+    `keepalive_interval` seconds to keep the drone from giving up on the
+    remote control.
+
+    Messages are built in a reusable buffer and sent straight to the drone,
+    without waiting for a response (the drone does not reply to `rc`).
+
+    :param drone: The drone to control
+    :type drone: :class:`tello_asyncio.tello.Tello`
+    :param rate: Number of ticks per second, eg 20-50 Hz
+    :param keepalive_interval: Maximum time in seconds between messages, even if unchanged
+    """
+
+    _task = None
+
+    def __init__(
+        self, drone, rate=DEFAULT_RC_RATE, keepalive_interval=DEFAULT_KEEPALIVE_INTERVAL
+    ):
+        self._drone = drone
+        self._period = 1 / rate
+        self._keepalive_interval = keepalive_interval
+        self._loop = drone._loop
+        self._trace = drone._trace.rc
+
+        self._target = [0, 0, 0, 0]
+        self._changed = True
+
+        # room for a trailing space after the last value
+        self._buffer = bytearray(RC_MAX_LENGTH + 1)
+        self._buffer[: len(RC_PREFIX)] = RC_PREFIX
+        self._view = memoryview(self._buffer)
+        self._length = 0
+
+        self._start_time = None
+        self._last_tick_time = None
+        self._last_send_time = None
+        self._ticks = 0
+        self._sends = 0
+        self._skipped = 0
+        self._interval = None
+        self._jitter = 0.0
+
+    def set(self, left_right, forward_back, up_down, yaw):
+        """
+        Set the target stick values, sent on the next tick.
+
+        :param left_right: Desired speed to the left, -100-100 cm/s
+        :param forward_back: Desired speed forwards, -100-100 cm/s
+        :param up_down: Desired speed up, -100-100 cm/s
+        :param yaw: Desired yaw -100-100°/s
+        """
+        values = (left_right, forward_back, up_down, yaw)
+        target = self._target
+        for i, v in enumerate(values):
+            v = min(max(round(v), -100), 100)
+            if v != target[i]:
+                target[i] = v
+                self._changed = True
+
+    @property
+    def running(self):
+        """
+        True if the channel is sending.
+        """
+        return self._task is not None
+
+    def start(self):
+        """
+        Start sending at the fixed rate.
+        """
+        if not self._task:
+            self._task = self._loop.create_task(self._run())
+
+    async def stop(self, hover=True):
+        """
+        Stop sending.
+
+        :param hover: Send all zero values first to stop the drone moving, default `True`
+        """
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            if hover:
+                self.set(0, 0, 0, 0)
+                self._send(self._loop.time())
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def stats(self):
+        """
+        The achieved tick and send rates and timing jitter.
+
+        :rtype: :class:`tello_asyncio.types.RemoteControlStats`
+        """
+        tick_rate = None
+        if self._interval:
+            tick_rate = 1 / self._interval
+        send_rate = None
+        if self._start_time is not None:
+            elapsed = self._loop.time() - self._start_time
+            if elapsed > 0:
+                send_rate = self._sends / elapsed
+        return RemoteControlStats(
+            self._ticks,
+            self._sends,
+            self._skipped,
+            tick_rate,
+            send_rate,
+            self._jitter,
+        )
+
+    async def _run(self):
+        period = self._period
+        next_time = self._start_time = self._loop.time()
+        while True:
+            self._tick(self._loop.time())
+            next_time += period
+            delay = next_time - self._loop.time()
+            if delay < 0:
+                # fell behind - skip the missed ticks rather than bursting
+                next_time = self._loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def _tick(self, now):
+        self._ticks += 1
+        if self._last_tick_time is not None:
+            interval = now - self._last_tick_time
+            self._jitter += JITTER_GAIN * (abs(interval - self._period) - self._jitter)
+            if self._interval is None:
+                self._interval = interval
+            else:
+                self._interval += JITTER_GAIN * (interval - self._interval)
+        self._last_tick_time = now
+
+        keepalive_due = (
+            self._last_send_time is None
+            or now - self._last_send_time >= self._keepalive_interval
+        )
+        if self._changed or keepalive_due:
+            self._send(now)
+        else:
+            self._skipped += 1
+
+    def _send(self, now):
+        transport = self._drone._transport
+        if not transport or transport.is_closing():
+            return
+
+        if self._changed:
+            self._encode()
+            self._changed = False
+        transport.sendto(self._view[: self._length])
+        if self._trace.trace:
+            self._trace.event(TRACE, SEND, self._buffer[: self._length].decode())
+        self._sends += 1
+        self._last_send_time = now
+
+    def _encode(self):
+        buffer = self._buffer
+        n = len(RC_PREFIX)
+        for v in self._target:
+            encoded = _STICK_VALUES[v]
+            end = n + len(encoded)
+            buffer[n:end] = encoded
+            buffer[end] = 0x20  # space
+            n = end + 1
+        self._length = n - 1
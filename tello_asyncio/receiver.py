@@ -0,0 +1,140 @@
+import logging
+import socket
+from time import monotonic
+
+from .types import ReceiverStats
+from .trace import ERROR
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_BUFFER_SIZE = 2048  # bigger than any datagram the drone sends
+
+
+class BatchedReceiver:
+    """
+    Receives UDP datagrams by reading a non-blocking socket directly from the
+    event loop, draining everything waiting into a pool of preallocated
+    buffers on each wakeup instead of a `datagram_received` callback for
+    every packet.
+
+    Each datagram is passed on as a `memoryview` of its pool buffer, which is
+    reused on the next wakeup, so anything kept must be copied.
+
+    Needs an event loop with `add_reader`, ie a selector event loop, which
+    is the default everywhere except Windows.
+
+    :param on_datagram: Called with the data `memoryview`, sender address and monotonic receive time of each datagram
+    :type on_datagram: Callable
+    :param batch_size: Maximum number of datagrams read per wakeup, and the number of buffers
+    :param buffer_size: Size of each buffer in bytes
+    :param receive_buffer_size: Socket receive buffer size in bytes, defaults to the system default
+    :param trace: Trace channel for socket errors
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    """
+
+    _socket = None
+
+    def __init__(
+        self,
+        on_datagram,
+        batch_size=DEFAULT_BATCH_SIZE,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        receive_buffer_size=None,
+        trace=None,
+    ):
+        self._on_datagram = on_datagram
+        self._batch_size = batch_size
+        self._receive_buffer_size = receive_buffer_size
+        self._trace = trace
+        self._buffers = [bytearray(buffer_size) for _ in range(batch_size)]
+        self._views = [memoryview(b) for b in self._buffers]
+        self._sizes = [0] * batch_size
+        self._addrs = [None] * batch_size
+        self._times = [0.0] * batch_size
+
+        self._wakeups = 0
+        self._packets = 0
+        self._bytes = 0
+        self._max_batch = 0
+        self._full_batches = 0
+
+    def open(self, loop, local_port):
+        """
+        Binds the socket and starts reading from it.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            if self._receive_buffer_size:
+                sock.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_RCVBUF, self._receive_buffer_size
+                )
+            sock.setblocking(False)
+            sock.bind(("0.0.0.0", local_port))
+            loop.add_reader(sock.fileno(), self._on_readable)
+        except Exception:
+            sock.close()
+            raise
+        self._socket = sock
+        self._loop = loop
+
+    def close(self):
+        """
+        Stops reading and closes the socket.
+        """
+        if self._socket:
+            self._loop.remove_reader(self._socket.fileno())
+            self._socket.close()
+            self._socket = None
+
+    def _on_readable(self):
+        recvfrom_into = self._socket.recvfrom_into
+        buffers = self._buffers
+        sizes = self._sizes
+        addrs = self._addrs
+        times = self._times
+        batch_size = self._batch_size
+
+        n = 0
+        while n < batch_size:
+            try:
+                size, addr = recvfrom_into(buffers[n])
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                trace = self._trace
+                if trace and trace.warning:
+                    trace.event(logging.WARNING, ERROR, f"RECEIVE ERROR {e}")
+                break
+            times[n] = monotonic()
+            sizes[n] = size
+            addrs[n] = addr
+            n += 1
+
+        if n:
+            self._wakeups += 1
+            self._packets += n
+            if n > self._max_batch:
+                self._max_batch = n
+            if n == batch_size:
+                self._full_batches += 1
+
+        on_datagram = self._on_datagram
+        views = self._views
+        for i in range(n):
+            self._bytes += sizes[i]
+            on_datagram(views[i][: sizes[i]], addrs[i], times[i])
+
+    def stats(self):
+        """
+        How many datagrams have been received, and how many per wakeup.
+
+        :rtype: :class:`tello_asyncio.types.ReceiverStats`
+        """
+        mean = self._packets / self._wakeups if self._wakeups else None
+        return ReceiverStats(
+            self._wakeups,
+            self._packets,
+            self._bytes,
+            mean,
+            self._max_batch,
+            self._full_batches,
+        )
@@ -0,0 +1,364 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+from threading import Thread, Condition
+from time import monotonic, strftime
+
+try:
+    import av
+except ImportError:  # optional dependency
+    av = None
+
+from .types import RecorderStats
+from .h264 import KEYFRAME_START_TYPES, first_nal_type, is_slice
+from .trace import INFO, ERROR
+
+DEFAULT_MAX_QUEUED = 300  # about ten seconds of video
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_FRAME_RATE = 30
+
+
+class VideoRecorder:
+    """
+    Records the raw H.264 video stream to files, writing in a background
+    thread so disk writes never hold up the event loop.
+
+    Give one to the drone, which starts it when video is connected, and
+    stops it, writing out anything still queued, when disconnecting::
+
+        drone = Tello(video_recorder=VideoRecorder("flights", max_segment_duration=60))
+
+    - Frames are queued for the writer thread, which writes everything
+      waiting on each wakeup through a large write buffer.
+    - If `max_queued` frames are waiting, the disk is too slow for the
+      stream, so new frames are dropped until the next keyframe, keeping the
+      recording decodable.
+    - A new segment file is started at the first keyframe after the current
+      one reaches the size or duration limit, so each segment can be played
+      on its own.  Recording starts at the first keyframe.
+    - Each finished segment can be remuxed to MP4 in another thread, copying
+      the H.264 data into the container without re-encoding.
+
+    Segments are named `<prefix>-<start time>-<number>.h264`, or `.mp4`.
+
+    :param directory: Directory to write segments in, created if need be
+    :param prefix: Start of the segment file names
+    :param max_segment_size: Size in bytes after which to start a new segment, defaults to no limit
+    :param max_segment_duration: Time in seconds after which to start a new segment, defaults to no limit
+    :param max_queued: Most frames waiting to be written before frames are dropped
+    :param buffer_size: Size in bytes of the file write buffer
+    :param mp4: Remux each finished segment to MP4, requires `PyAV <https://pyav.org/>`_
+    :param keep_raw: Keep the raw H.264 segment after remuxing it to MP4
+    :param trace: Trace channel for recorder events
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    """
+
+    _thread = None
+    _remuxer = None
+
+    def __init__(
+        self,
+        directory=".",
+        prefix="tello",
+        max_segment_size=None,
+        max_segment_duration=None,
+        max_queued=DEFAULT_MAX_QUEUED,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        mp4=False,
+        keep_raw=False,
+        trace=None,
+    ):
+        if mp4 and av is None:
+            raise ImportError("VideoRecorder requires av to remux to MP4")
+        self._directory = Path(directory)
+        self._prefix = prefix
+        self._max_segment_size = max_segment_size
+        self._max_segment_duration = max_segment_duration
+        self._max_queued = max_queued
+        self._buffer_size = buffer_size
+        self._mp4 = mp4
+        self._keep_raw = keep_raw
+        self.trace = trace
+        self._pending = deque()
+        self._condition = Condition()
+        self._running = False
+        self._segments = []
+
+        self._frames = 0
+        self._bytes = 0
+        self._segment_count = 0
+        self._dropped_frames = 0
+        self._skipped_frames = 0
+        self._writes = 0
+        self._write_latency = 0.0
+        self._max_write_latency = 0.0
+
+    def start(self, loop=None):
+        """
+        Starts recording, in a new segment.
+        """
+        if self._thread:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._loop = loop or asyncio.get_event_loop()
+        self._name = f"{self._prefix}-{strftime('%Y%m%d-%H%M%S')}"
+        self._segment_index = 0
+        self._segment_started_at = None
+        self._segment_bytes = 0
+        self._waiting_for_keyframe = True
+        self._running = True
+        if self._mp4:
+            self._remuxer = ThreadPoolExecutor(max_workers=1)
+        self._thread = Thread(target=self._run, name="VideoRecorder", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """
+        Stops recording, once the frames already queued are written and the
+        last segment remuxed.
+        """
+        thread = self._thread
+        if not thread:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        await self._loop.run_in_executor(None, thread.join)
+        self._thread = None
+        if self._remuxer:
+            await self._loop.run_in_executor(None, self._remuxer.shutdown)
+            self._remuxer = None
+
+    def submit(self, data, info):
+        """
+        Queues a frame to be written.  Called on the event loop.
+
+        :param data: The frame data, copied since it may be a reused buffer
+        :param info: :class:`tello_asyncio.types.VideoFrameInfo` of the frame
+        """
+        if not self._running:
+            return
+        received_at = info.received_at
+        if received_at is None:
+            received_at = monotonic()
+        if info.is_keyframe is not None:
+            keyframe = info.is_keyframe
+            picture = True
+        else:
+            t = first_nal_type(data)
+            keyframe = t in KEYFRAME_START_TYPES
+            picture = t is not None and is_slice(t)
+
+        started_at = self._segment_started_at
+        if started_at is None or self._waiting_for_keyframe:
+            if not keyframe:
+                if started_at is None:
+                    self._skipped_frames += 1
+                else:
+                    self._dropped_frames += 1
+                return
+        new_segment = keyframe and (
+            started_at is None
+            or (
+                self._max_segment_size is not None
+                and self._segment_bytes >= self._max_segment_size
+            )
+            or (
+                self._max_segment_duration is not None
+                and received_at - started_at >= self._max_segment_duration
+            )
+        )
+
+        with self._condition:
+            pending = self._pending
+            if len(pending) >= self._max_queued:
+                self._dropped_frames += 1
+                if not self._waiting_for_keyframe:
+                    self._waiting_for_keyframe = True
+                    trace = self.trace
+                    if trace and trace.warning:
+                        trace.event(
+                            logging.WARNING,
+                            ERROR,
+                            "recorder behind, dropping frames until next keyframe",
+                        )
+                return
+            self._waiting_for_keyframe = False
+            segment = None
+            if new_segment:
+                self._segment_index += 1
+                segment = self._segment_index
+                self._segment_started_at = received_at
+                self._segment_bytes = 0
+            self._segment_bytes += len(data)
+            pending.append((bytes(data), received_at, monotonic(), segment, picture))
+            self._condition.notify()
+
+    def _run(self):
+        condition = self._condition
+        pending = self._pending
+        file = None
+        while True:
+            with condition:
+                while self._running and not pending:
+                    condition.wait()
+                if not pending:
+                    break
+                batch = list(pending)
+                pending.clear()
+
+            for data, received_at, submitted_at, segment, picture in batch:
+                if segment is not None:
+                    if file:
+                        self._finish_segment(file)
+                    file = self._open_segment(segment, received_at)
+                    if file is None:
+                        continue
+                elif file is None:
+                    continue
+                try:
+                    file.write(data)
+                except OSError as e:
+                    self._file_error(file, e)
+                    file = None
+                    continue
+                self._frames += 1
+                self._bytes += len(data)
+                if picture:
+                    self._segment_pictures += 1
+                    self._segment_last_at = received_at
+                latency = monotonic() - submitted_at
+                self._writes += 1
+                self._write_latency += latency
+                if latency > self._max_write_latency:
+                    self._max_write_latency = latency
+
+        if file:
+            self._finish_segment(file)
+
+    def _open_segment(self, segment, started_at):
+        path = self._directory / f"{self._name}-{segment:03d}.h264"
+        try:
+            file = open(path, "wb", buffering=self._buffer_size)
+        except OSError as e:
+            self._file_error(None, e)
+            return None
+        self._segment_path = path
+        self._segment_first_at = started_at
+        self._segment_last_at = started_at
+        self._segment_pictures = 0
+        self._segment_count += 1
+        trace = self.trace
+        if trace and trace.info:
+            trace.event(logging.INFO, INFO, f"recording {path}")
+        return file
+
+    def _finish_segment(self, file):
+        try:
+            file.close()
+        except OSError as e:
+            self._file_error(None, e)
+            return
+        path = self._segment_path
+        if self._remuxer:
+            pictures = self._segment_pictures
+            duration = self._segment_last_at - self._segment_first_at
+            if pictures > 1 and duration > 0:
+                frame_rate = (pictures - 1) / duration
+            else:
+                frame_rate = DEFAULT_FRAME_RATE
+            self._remuxer.submit(self._remux, path, frame_rate)
+        else:
+            self._segments.append(path)
+
+    def _remux(self, path, frame_rate):
+        destination = path.with_suffix(".mp4")
+        try:
+            remux_to_mp4(path, destination, frame_rate)
+        except Exception as e:
+            trace = self.trace
+            if trace and trace.warning:
+                trace.event(logging.WARNING, ERROR, f"remuxing {path} failed: {e}")
+            self._segments.append(path)
+            return
+        if not self._keep_raw:
+            os.remove(path)
+        self._segments.append(destination)
+
+    def _file_error(self, file, error):
+        if file:
+            try:
+                file.close()
+            except OSError:
+                pass
+        trace = self.trace
+        if trace and trace.warning:
+            trace.event(logging.WARNING, ERROR, f"recording failed: {error}")
+
+    @property
+    def segments(self):
+        """
+        Paths of the segments finished so far.
+
+        :rtype: list of :class:`pathlib.Path`
+        """
+        return list(self._segments)
+
+    def stats(self):
+        """
+        How many frames have been written and dropped, and how long they
+        waited to be written.
+
+        :rtype: :class:`tello_asyncio.types.RecorderStats`
+        """
+        writes = self._writes
+        return RecorderStats(
+            self._frames,
+            self._bytes,
+            self._segment_count,
+            self._dropped_frames,
+            self._skipped_frames,
+            len(self._pending),
+            self._write_latency / writes if writes else None,
+            self._max_write_latency,
+        )
+
+
+def remux_to_mp4(source, destination, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Copies a raw H.264 stream into an MP4 file without re-encoding it.
+
+    Raw H.264 has no timestamps, so frames are given evenly spaced ones at
+    the frame rate.  Requires `PyAV <https://pyav.org/>`_.
+
+    :param source: Path of the raw H.264 file
+    :param destination: Path of the MP4 file to write
+    :param frame_rate: Frames per second
+    """
+    if av is None:
+        raise ImportError("remux_to_mp4 requires av")
+    time_base = Fraction(1, 1000)
+    with av.open(str(source), format="h264") as input_container:
+        with av.open(str(destination), "w", format="mp4") as output:
+            input_stream = input_container.streams.video[0]
+            from_template = getattr(output, "add_stream_from_template", None)
+            if from_template:
+                output_stream = from_template(input_stream)
+            else:  # before PyAV 14
+                output_stream = output.add_stream(template=input_stream)
+            output_stream.time_base = time_base
+
+            i = 0
+            for packet in input_container.demux(input_stream):
+                if packet.size == 0:
+                    # flushing the demuxer
+                    continue
+                packet.stream = output_stream
+                packet.time_base = time_base
+                packet.pts = packet.dts = round(i * 1000 / frame_rate)
+                output.mux(packet)
+                i += 1
@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import socket
+from collections import deque
+
+from .types import RelayStats
+from .video import MAX_CHUNK_SIZE
+from .trace import CONNECT, DISCONNECT
+
+DEFAULT_RELAY_QUEUE_SIZE = 256  # datagrams, a few keyframes
+
+
+class RelayEndpoint:
+    """
+    One local consumer of relayed video, with its own socket and send queue.
+
+    Datagrams are sent straight away if the socket will take them, and
+    otherwise queued until it is writable.  When the queue is full new
+    datagrams are dropped, so a stalled consumer only loses its own video.
+    Datagrams that fail to send, eg to a Unix socket path nobody has bound
+    yet, are also counted as dropped.
+
+    :param family: `socket.AF_INET` or `socket.AF_UNIX`
+    :param address: `(host, port)` or Unix socket path to send to
+    :param frames: Relay reassembled frames rather than the drone's datagrams
+    :param max_queued: Most datagrams waiting to be sent
+    """
+
+    def __init__(
+        self, family, address, frames=False, max_queued=DEFAULT_RELAY_QUEUE_SIZE
+    ):
+        self.address = address
+        self.frames = frames
+        self._max_queued = max_queued
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._queue = deque()
+        self._loop = asyncio.get_event_loop()
+        self._writing = False
+
+        self._sent = 0
+        self._bytes = 0
+        self._dropped = 0
+
+    def send(self, data):
+        """
+        Sends a datagram, or queues it if the socket is busy.
+        """
+        if self._queue:
+            self._enqueue(data)
+            return
+        try:
+            self._socket.sendto(data, self.address)
+        except (BlockingIOError, InterruptedError):
+            self._enqueue(data)
+            self._start_writing()
+            return
+        except OSError:
+            # nobody listening
+            self._dropped += 1
+            return
+        self._sent += 1
+        self._bytes += len(data)
+
+    def send_frame(self, data):
+        """
+        Sends a frame in chunks the way the drone does, ending with a short
+        one, or drops it whole if there is not room to queue it.
+        """
+        view = memoryview(data)
+        size = len(view)
+        chunks = [
+            view[i : i + MAX_CHUNK_SIZE] for i in range(0, size, MAX_CHUNK_SIZE)
+        ]
+        if size % MAX_CHUNK_SIZE == 0:
+            chunks.append(b"")
+        if len(self._queue) + len(chunks) > self._max_queued:
+            self._dropped += len(chunks)
+            return
+        for chunk in chunks:
+            self.send(chunk)
+
+    def _enqueue(self, data):
+        if len(self._queue) >= self._max_queued:
+            self._dropped += 1
+        else:
+            # copied, since the data may be a view of a reused buffer
+            self._queue.append(bytes(data))
+
+    def _start_writing(self):
+        if not self._writing:
+            self._loop.add_writer(self._socket.fileno(), self._on_writable)
+            self._writing = True
+
+    def _on_writable(self):
+        queue = self._queue
+        sendto = self._socket.sendto
+        while queue:
+            data = queue[0]
+            try:
+                sendto(data, self.address)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._dropped += 1
+            else:
+                self._sent += 1
+                self._bytes += len(data)
+            queue.popleft()
+        self._loop.remove_writer(self._socket.fileno())
+        self._writing = False
+
+    def stop(self):
+        """
+        Drops anything queued.
+        """
+        if self._writing:
+            self._loop.remove_writer(self._socket.fileno())
+            self._writing = False
+        self._queue.clear()
+
+    def close(self):
+        self.stop()
+        self._socket.close()
+
+    def stats(self):
+        """
+        How many datagrams have been sent and dropped.
+
+        :rtype: :class:`tello_asyncio.types.RelayStats`
+        """
+        return RelayStats(self._sent, self._bytes, self._dropped, len(self._queue))
+
+
+class VideoRelay:
+    """
+    Relays the drone's video to other local programs, so that they can all
+    use it while this library owns the one socket that can receive it.
+
+    Give one to the drone, and point each consumer at its own endpoint, eg
+    OpenCV at `udp://127.0.0.1:11112`::
+
+        relay = VideoRelay()
+        relay.add_udp(11112)
+        relay.add_unix("/tmp/tello-frames", frames=True)
+        drone = Tello(video_relay=relay)
+
+    Endpoints either relay the drone's datagrams as they arrive, or whole
+    reassembled frames, chunked the same way, so that consumers only get
+    frames that survived reassembly.  Either way anything that reads the
+    drone's video stream directly can read it from an endpoint.
+
+    Data is sent without copying unless it has to be queued, and each
+    endpoint has its own socket and bounded send queue, see
+    :class:`tello_asyncio.relay.RelayEndpoint`.
+
+    Needs an event loop with `add_writer`, ie a selector event loop, which
+    is the default everywhere except Windows.
+
+    :param trace: Trace channel for relay events
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    """
+
+    def __init__(self, trace=None):
+        self.trace = trace
+        self._endpoints = []
+        self._loop = asyncio.get_event_loop()
+
+    def add_udp(
+        self, port, host="127.0.0.1", frames=False, max_queued=DEFAULT_RELAY_QUEUE_SIZE
+    ):
+        """
+        Adds a UDP endpoint.
+
+        :param port: Local port the consumer listens on
+        :param host: Address the consumer listens on
+        :param frames: Relay reassembled frames rather than the drone's datagrams
+        :param max_queued: Most datagrams waiting to be sent
+        :rtype: :class:`tello_asyncio.relay.RelayEndpoint`
+        """
+        return self._add(
+            RelayEndpoint(socket.AF_INET, (host, port), frames, max_queued)
+        )
+
+    def add_unix(self, path, frames=False, max_queued=DEFAULT_RELAY_QUEUE_SIZE):
+        """
+        Adds a Unix domain datagram socket endpoint.
+
+        :param path: Path of the socket the consumer has bound
+        :param frames: Relay reassembled frames rather than the drone's datagrams
+        :param max_queued: Most datagrams waiting to be sent
+        :rtype: :class:`tello_asyncio.relay.RelayEndpoint`
+        """
+        return self._add(RelayEndpoint(socket.AF_UNIX, path, frames, max_queued))
+
+    def _add(self, endpoint):
+        endpoint._loop = self._loop
+        self._endpoints.append(endpoint)
+        trace = self.trace
+        if trace and trace.info:
+            trace.event(logging.INFO, CONNECT, f"relaying to {endpoint.address}")
+        return endpoint
+
+    def remove(self, endpoint):
+        """
+        Stops relaying to an endpoint and closes its socket.
+        """
+        try:
+            self._endpoints.remove(endpoint)
+        except ValueError:
+            return
+        endpoint.close()
+        trace = self.trace
+        if trace and trace.info:
+            trace.event(logging.INFO, DISCONNECT, f"relaying to {endpoint.address}")
+
+    def start(self, loop):
+        """
+        Sends queued datagrams from the given event loop as sockets become
+        writable.
+        """
+        self._loop = loop
+        for endpoint in self._endpoints:
+            endpoint._loop = loop
+
+    def stop(self):
+        """
+        Drops anything queued for every endpoint, keeping them for when
+        video starts again.
+        """
+        for endpoint in self._endpoints:
+            endpoint.stop()
+
+    def close(self):
+        """
+        Closes every endpoint.
+        """
+        for endpoint in list(self._endpoints):
+            self.remove(endpoint)
+
+    def on_chunk(self, data):
+        """
+        Relays a datagram from the drone to the endpoints that want them.
+        """
+        for endpoint in self._endpoints:
+            if not endpoint.frames:
+                endpoint.send(data)
+
+    def on_frame(self, data):
+        """
+        Relays a reassembled frame to the endpoints that want them.
+        """
+        for endpoint in self._endpoints:
+            if endpoint.frames:
+                endpoint.send_frame(data)
+
+    def stats(self):
+        """
+        How many datagrams have been sent to and dropped for each endpoint.
+
+        :rtype: dict of address to :class:`tello_asyncio.types.RelayStats`
+        """
+        return {e.address: e.stats() for e in self._endpoints}
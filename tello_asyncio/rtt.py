@@ -0,0 +1,111 @@
+from .types import RetransmissionStats
+
+INITIAL_RTO = 1.0
+MIN_RTO = 0.2
+MAX_RTO = 4.0
+
+# smoothing gains from RFC 6298
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+
+
+class RetransmissionTimer:
+    """
+    TCP-style round trip time estimator used to decide when to retransmit a
+    command that has had no response.
+
+    Keeps a smoothed round trip time (SRTT) and round trip time variation
+    (RTTVAR) as described in `RFC 6298 <https://www.rfc-editor.org/rfc/rfc6298>`_
+    and derives the retransmission timeout (RTO) from them.  Samples from
+    retransmitted commands must not be fed in, since it is ambiguous which
+    transmission the response belongs to (Karn's algorithm).
+
+    :param initial_rto: RTO in seconds before any round trip time has been measured
+    :param min_rto: Lower bound for the RTO in seconds
+    :param max_rto: Upper bound for the RTO in seconds
+    """
+
+    def __init__(self, initial_rto=INITIAL_RTO, min_rto=MIN_RTO, max_rto=MAX_RTO):
+        self._min_rto = min_rto
+        self._max_rto = max_rto
+        self._srtt = None
+        self._rttvar = None
+        self._rto = initial_rto
+
+        self.commands = 0
+        self.retransmits = 0
+        self.retransmitted_commands = 0
+        self.duplicates = 0
+        self.timeouts = 0
+
+    @property
+    def srtt(self):
+        """
+        The smoothed round trip time in seconds, or `None` if not yet measured.
+        """
+        return self._srtt
+
+    @property
+    def rttvar(self):
+        """
+        The round trip time variation in seconds, or `None` if not yet measured.
+        """
+        return self._rttvar
+
+    @property
+    def rto(self):
+        """
+        The current retransmission timeout in seconds.
+        """
+        return self._rto
+
+    @property
+    def max_rto(self):
+        """
+        The upper bound for the retransmission timeout in seconds.
+        """
+        return self._max_rto
+
+    def sample(self, rtt):
+        """
+        Update the estimate with a newly measured round trip time.
+
+        :param rtt: Round trip time in seconds of a command that was sent only once
+        """
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar = (1 - RTT_BETA) * self._rttvar + RTT_BETA * abs(
+                self._srtt - rtt
+            )
+            self._srtt = (1 - RTT_ALPHA) * self._srtt + RTT_ALPHA * rtt
+        self._rto = self._clamp(self._srtt + 4 * self._rttvar)
+
+    def backoff(self, rto):
+        """
+        The timeout to use after a retransmission, doubling the previous one.
+
+        :param rto: The timeout that has just expired
+        """
+        return self._clamp(rto * 2)
+
+    def stats(self):
+        """
+        Snapshot of the retransmission counters and round trip time estimate.
+
+        :rtype: :class:`tello_asyncio.types.RetransmissionStats`
+        """
+        return RetransmissionStats(
+            self.commands,
+            self.retransmitted_commands,
+            self.retransmits,
+            self.duplicates,
+            self.timeouts,
+            self._srtt,
+            self._rttvar,
+            self._rto,
+        )
+
+    def _clamp(self, rto):
+        return min(max(rto, self._min_rto), self._max_rto)
@@ -0,0 +1,327 @@
+import os
+import struct
+from time import monotonic, sleep
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # before Python 3.8
+    shared_memory = None
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from .types import SharedFrame
+from .video import VIDEO_WIDTH, VIDEO_HEIGHT, _readonly
+
+MAGIC = b"TLFR"
+VERSION = 1
+
+DEFAULT_SLOTS = 4
+DEFAULT_SLOT_SIZE = VIDEO_WIDTH * VIDEO_HEIGHT * 3  # a decoded RGB frame
+
+# magic, version, slots, slot size, latest sequence number
+HEADER = struct.Struct("<4sIIIQ")
+HEADER_SIZE = 64
+
+# seqlock count, sequence number, receive time, size, number of dimensions,
+# shape
+SLOT_HEADER = struct.Struct("<QQdII3I")
+SLOT_HEADER_SIZE = 64
+
+LATEST_OFFSET = 16
+
+
+class SharedFrameWriter:
+    """
+    Writes video frames to a ring of slots in shared memory, which any
+    number of :class:`tello_asyncio.shared.SharedFrameReader` objects in
+    other processes can attach to by name and read without copying or
+    pickling.
+
+    Each frame is numbered in sequence, and its slot guarded by a seqlock,
+    a count that is odd while the slot is being written, so readers can
+    tell if a frame was overwritten while they were using it.  Frames are
+    either raw data, eg from :attr:`tello_asyncio.tello.Tello.video_stream`,
+    or `uint8` NumPy arrays, eg decoded by a
+    :class:`tello_asyncio.decoder.VideoDecoder`.
+
+    Create before starting the reader processes, and pass them the name::
+
+        writer = SharedFrameWriter()
+        Process(target=vision, args=(writer.name,)).start()
+        await writer.publish(drone, decoded=True)
+
+    Requires Python 3.8+.
+
+    :param name: Name of the shared memory block, defaults to a unique name
+    :param slots: Number of frames kept
+    :param slot_size: Largest frame in bytes; larger frames are not written
+    """
+
+    def __init__(self, name=None, slots=DEFAULT_SLOTS, slot_size=DEFAULT_SLOT_SIZE):
+        if shared_memory is None:
+            raise ImportError("SharedFrameWriter requires Python 3.8+")
+        self._slots = slots
+        self._slot_size = slot_size
+        size = HEADER_SIZE + slots * (SLOT_HEADER_SIZE + slot_size)
+        self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self._buf = self._shm.buf
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, slots, slot_size, 0)
+        self._locks = [0] * slots
+        self._sequence = 0
+        self.dropped = 0
+
+    @property
+    def name(self):
+        """
+        Name to attach readers with.
+        """
+        return self._shm.name
+
+    @property
+    def sequence(self):
+        """
+        Sequence number of the latest frame written, or 0 if none.
+        """
+        return self._sequence
+
+    def write(self, data, received_at=None):
+        """
+        Writes a frame to the next slot, overwriting the oldest.
+
+        :param data: Raw frame data, or a `uint8` NumPy array
+        :param received_at: Host monotonic time in seconds when the frame was received
+        :return: The frame's sequence number, or `None` if it is too big for a slot
+        """
+        shape = getattr(data, "shape", None)
+        if shape is not None:
+            if not data.flags.c_contiguous:
+                data = np.ascontiguousarray(data)
+            view = memoryview(data).cast("B")
+            dims = (tuple(shape) + (0, 0, 0))[:3]
+            ndim = len(shape)
+        else:
+            view = memoryview(data)
+            dims = (0, 0, 0)
+            ndim = 0
+        size = view.nbytes
+        if size > self._slot_size:
+            self.dropped += 1
+            return None
+
+        sequence = self._sequence + 1
+        index = (sequence - 1) % self._slots
+        offset = HEADER_SIZE + index * (SLOT_HEADER_SIZE + self._slot_size)
+        buf = self._buf
+
+        lock = self._locks[index] + 1
+        struct.pack_into("<Q", buf, offset, lock)
+        start = offset + SLOT_HEADER_SIZE
+        buf[start : start + size] = view
+        SLOT_HEADER.pack_into(
+            buf,
+            offset,
+            lock,
+            sequence,
+            received_at if received_at is not None else monotonic(),
+            size,
+            ndim,
+            *dims
+        )
+        lock += 1
+        struct.pack_into("<Q", buf, offset, lock)
+        self._locks[index] = lock
+
+        struct.pack_into("<Q", buf, LATEST_OFFSET, sequence)
+        self._sequence = sequence
+        return sequence
+
+    async def publish(self, drone, decoded=False):
+        """
+        Writes the drone's video frames as they arrive, until cancelled.
+
+        Raw frames come from :attr:`tello_asyncio.tello.Tello.video_stream`,
+        which skips frames if more than one arrives at once, so readers that
+        decode raw frames should be ready to wait for the next keyframe.
+
+        :param drone: The drone, with video connected
+        :type drone: :class:`tello_asyncio.tello.Tello`
+        :param decoded: Write arrays from :attr:`tello_asyncio.tello.Tello.decoded_video_stream` rather than raw frames
+        """
+        if decoded:
+            async for frame in drone.decoded_video_stream:
+                self.write(frame.image, frame.info.received_at)
+        else:
+            async for frame in drone.video_stream:
+                info = drone.video_frame_info
+                self.write(frame, info.received_at if info else None)
+
+    def close(self, unlink=True):
+        """
+        Closes the shared memory, and by default frees it, after which no
+        more readers can attach.
+        """
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+
+class SharedFrameReader:
+    """
+    Reads video frames from a :class:`tello_asyncio.shared.SharedFrameWriter`
+    in another process, eg::
+
+        reader = SharedFrameReader(name)
+        sequence = 0
+        while True:
+            frame = reader.wait(sequence)
+            ...
+            if reader.is_valid(frame):
+                use_results()
+            sequence = frame.sequence
+
+    Frame data is a read-only view of the shared memory, a NumPy array if
+    the frame was an array and NumPy is available, which the writer may
+    overwrite once it has gone round the ring.  Check the frame is still
+    valid after using it, or read with `copy` set.
+
+    Requires Python 3.8+.
+
+    :param name: Name of the writer's shared memory block
+    """
+
+    def __init__(self, name):
+        if shared_memory is None:
+            raise ImportError("SharedFrameReader requires Python 3.8+")
+        self._shm = _attach(name)
+        self._buf = self._shm.buf
+        magic, version, slots, slot_size, _ = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self._buf = None
+            self._shm.close()
+            raise ValueError(f"{name} is not a shared frame ring")
+        self._slots = slots
+        self._slot_size = slot_size
+
+    @property
+    def sequence(self):
+        """
+        Sequence number of the latest frame written, or 0 if none.
+        """
+        return struct.unpack_from("<Q", self._buf, LATEST_OFFSET)[0]
+
+    def latest(self, copy=False):
+        """
+        The latest frame.
+
+        :param copy: Copy the data out of shared memory, so it stays valid
+        :rtype: :class:`tello_asyncio.types.SharedFrame`, or `None` if there are no frames yet
+        """
+        while True:
+            sequence = self.sequence
+            if not sequence:
+                return None
+            frame = self.get(sequence, copy)
+            if frame is not None:
+                return frame
+
+    def get(self, sequence, copy=False):
+        """
+        A particular frame, if it is still in the ring, eg to read every
+        frame in turn.
+
+        :param sequence: The frame's sequence number
+        :param copy: Copy the data out of shared memory, so it stays valid
+        :rtype: :class:`tello_asyncio.types.SharedFrame`, or `None` if it has not been written yet or has been overwritten
+        """
+        if sequence < 1 or sequence > self.sequence:
+            return None
+        offset = self._offset(sequence)
+        buf = self._buf
+        while True:
+            lock, stored, received_at, size, ndim, *dims = SLOT_HEADER.unpack_from(
+                buf, offset
+            )
+            if lock & 1 or self._lock(offset) != lock:
+                # being written
+                continue
+            if stored != sequence:
+                return None
+
+            start = offset + SLOT_HEADER_SIZE
+            view = buf[start : start + size]
+            shape = tuple(dims[:ndim])
+            if copy:
+                data = bytes(view)
+                view.release()
+                if self._lock(offset) != lock:
+                    return None
+                if ndim and np is not None:
+                    data = np.frombuffer(data, np.uint8).reshape(shape)
+            elif ndim and np is not None:
+                data = np.frombuffer(view, np.uint8).reshape(shape)
+                data.flags.writeable = False
+            else:
+                data = _readonly(view)
+            return SharedFrame(sequence, received_at, shape, data, lock)
+
+    def wait(self, after=0, timeout=None, poll_interval=0.002):
+        """
+        Waits for a frame newer than the given sequence number, by polling.
+
+        :param after: Sequence number of the last frame read
+        :param timeout: Longest time in seconds to wait, defaults to forever
+        :param poll_interval: Time in seconds between polls
+        :rtype: :class:`tello_asyncio.types.SharedFrame`, or `None` if timed out
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while self.sequence <= after:
+            if deadline is not None and monotonic() >= deadline:
+                return None
+            sleep(poll_interval)
+        return self.latest()
+
+    def is_valid(self, frame):
+        """
+        Whether a frame's slot has not been written to since it was read, so
+        its data is intact.
+        """
+        return self._lock(self._offset(frame.sequence)) == frame.lock
+
+    def _offset(self, sequence):
+        index = (sequence - 1) % self._slots
+        return HEADER_SIZE + index * (SLOT_HEADER_SIZE + self._slot_size)
+
+    def _lock(self, offset):
+        return struct.unpack_from("<Q", self._buf, offset)[0]
+
+    def close(self):
+        """
+        Detaches from the shared memory.  Frames read without `copy` must
+        be released first.
+        """
+        self._buf = None
+        self._shm.close()
+
+
+def _attach(name):
+    # attach without registering with the resource tracker, which would
+    # unlink the block when this process exits, taking it from the writer
+    # and any other readers
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:  # before Python 3.13
+        pass
+    if os.name != "posix":
+        return shared_memory.SharedMemory(name)
+    from multiprocessing import resource_tracker
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
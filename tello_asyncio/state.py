@@ -1,4 +1,11 @@
+import logging
+import re
+from time import monotonic
+
 from .types import Range, Vector, TelloState
+from .trace import TRACE, STATE, ERROR
+from .metrics import RateMeter
+from .receiver import BatchedReceiver
 
 STATE_FIELDS = [
     "raw",
@@ -15,47 +22,284 @@ STATE_FIELDS = [
     "velocity",
     "mission_pad",
     "mission_pad_position",
+    "received_at",
 ]
 
+# for fast lookup of state field names
+STATE_FIELD_SET = frozenset(STATE_FIELDS)
+
 
 class TelloStateListener:
+    """
+    Listens for the state messages a drone sends about ten times a second,
+    parses them and passes them on.
+
+    Normally the listener owns the UDP socket, but it can also be attached to a
+    socket shared with other drones, eg in a :class:`tello_asyncio.swarm.TelloSwarm`,
+    which then hands on the data sent by this listener's drone.
+
+    :param local_port: The UDP port to listen on
+    :param trace: Trace channel for state events
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    :param lazy: Pass on :class:`tello_asyncio.state.LazyTelloState` objects that only parse fields when they are used, defaults to `False`
+    :param history: Where to keep recent states
+    :type history: :class:`tello_asyncio.history.StateHistory`, optional
+    :param estimator: Estimates the drone's position from each state
+    :type estimator: :class:`tello_asyncio.estimator.PositionEstimator`, optional
+    :param batched: Receive with a :class:`tello_asyncio.receiver.BatchedReceiver` instead of a datagram protocol, defaults to `False`
+    """
 
     _transport = None
+    _receiver = None
 
     class Protocol:
         def connection_made(self, transport):
             pass
 
         def datagram_received(self, data, addr):
-            message = data.decode("ascii")
-            # print('[state] RECEIVED', message)
-            state = parse_state_message(message)
-            self.on_state_received(state)
+            self.listener.handle_datagram(data, monotonic())
 
         def error_received(self, error):
-            print("[state] PROTOCOL ERROR", error)
+            trace = self.listener._trace
+            if trace and trace.warning:
+                trace.event(logging.WARNING, ERROR, f"PROTOCOL ERROR {error}")
 
         def connection_lost(self, error):
             # print('[state] CONNECTION LOST', error)
             pass
 
-    def __init__(self, local_port):
+    def __init__(
+        self,
+        local_port,
+        trace=None,
+        lazy=False,
+        history=None,
+        estimator=None,
+        batched=False,
+    ):
         self._local_port = local_port
+        self._batched = batched
+        self._trace = trace
+        self._lazy = lazy
+        self.history = history
+        self.estimator = estimator
+        self._rate = RateMeter()
 
     async def connect(self, loop, on_state_received):
+        if self._batched:
+            self._receiver = BatchedReceiver(
+                lambda data, addr, received_at: self.handle_datagram(
+                    bytes(data), received_at
+                ),
+                trace=self._trace,
+            )
+            self._receiver.open(loop, self._local_port)
+            self.attach(on_state_received)
+            return
+
         transport, protocol = await loop.create_datagram_endpoint(
             TelloStateListener.Protocol, local_addr=("0.0.0.0", self._local_port)
         )
         self._transport = transport
-        protocol.on_state_received = on_state_received
+        protocol.listener = self
+        self.attach(on_state_received)
+
+    def attach(self, on_state_received):
+        """
+        Start passing on state without opening a socket, for when the data is
+        received elsewhere and handed to :meth:`handle_datagram`.
+        """
+        self.on_state_received = on_state_received
+
+    @property
+    def rate(self):
+        """
+        Arrival rate and jitter of state messages.
+
+        :rtype: :class:`tello_asyncio.types.RateMetrics`
+        """
+        return self._rate.snapshot()
+
+    @property
+    def receive_stats(self):
+        """
+        Datagrams received per wakeup, if batched.
+
+        :rtype: :class:`tello_asyncio.types.ReceiverStats`
+        """
+        return self._receiver.stats() if self._receiver else None
+
+    def handle_datagram(self, data, received_at=None):
+        """
+        Parses and passes on a state message.
+
+        :param data: The raw state message bytes
+        :param received_at: Host monotonic time in seconds when the message arrived, defaults to now
+        """
+        time = monotonic() if received_at is None else received_at
+        self._rate.add(time)
+        trace = self._trace
+        if trace and trace.trace:
+            trace.event(TRACE, STATE, data.decode("ascii"))
+        if self._lazy:
+            state = LazyTelloState(data, time)
+        else:
+            state = parse_state_message(data.decode("ascii"), time)
+        if self.history is not None:
+            self.history.append(state, time)
+        if self.estimator is not None:
+            self.estimator.update(state, time)
+        self.on_state_received(state)
 
     async def disconnect(self):
+        if self._receiver:
+            self._receiver.close()
+            self._receiver = None
         if self._transport:
             self._transport.close()
             self._transport = None
 
 
-def parse_state_message(raw):
+# the order of the fields in the state messages sent by known firmware
+STATE_MESSAGE_LAYOUTS = [
+    # SDK 2.0 (Tello EDU) and 3.0 (RoboMaster TT), with mission pad fields
+    "mid x y z mpry pitch roll yaw vgx vgy vgz templ temph tof h bat baro time agx agy agz".split(),
+    # SDK 2.0 without mission pad fields
+    "pitch roll yaw vgx vgy vgz templ temph tof h bat baro time agx agy agz".split(),
+]
+
+
+class StateMessageLayout:
+    """
+    Parses state messages with fields in a known order in a single pass, using
+    a precompiled regular expression.
+    """
+
+    def __init__(self, keys):
+        pattern = ";".join(re.escape(k) + ":([^;]*)" for k in keys) + ";?[\r\n]*"
+        self._pattern = re.compile(pattern)
+        index = {k: i for i, k in enumerate(keys)}
+        self._mission_pads = "mid" in index
+        self._indices = tuple(
+            index.get(k)
+            for k in (
+                "roll",
+                "pitch",
+                "yaw",
+                "h",
+                "baro",
+                "bat",
+                "tof",
+                "time",
+                "templ",
+                "temph",
+                "agx",
+                "agy",
+                "agz",
+                "vgx",
+                "vgy",
+                "vgz",
+                "mid",
+                "x",
+                "y",
+                "z",
+            )
+        )
+
+    def parse(self, raw, received_at=None):
+        """
+        Parses the message if it has this layout.
+
+        :return: The state, or `None` if the message has a different layout
+        :rtype: :class:`tello_asyncio.types.TelloState`
+        """
+        match = self._pattern.fullmatch(raw)
+        if match is None:
+            return None
+        v = match.groups()
+        (
+            roll,
+            pitch,
+            yaw,
+            h,
+            baro,
+            bat,
+            tof,
+            time,
+            templ,
+            temph,
+            agx,
+            agy,
+            agz,
+            vgx,
+            vgy,
+            vgz,
+            mid,
+            x,
+            y,
+            z,
+        ) = self._indices
+
+        if self._mission_pads:
+            mission_pad = int(v[mid])
+            mission_pad_position = Vector(float(v[x]), float(v[y]), float(v[z]))
+        else:
+            mission_pad = None
+            mission_pad_position = NO_MISSION_PAD_POSITION
+
+        return TelloState(
+            raw,
+            int(v[roll]),
+            int(v[pitch]),
+            int(v[yaw]),
+            int(v[h]),
+            float(v[baro]),
+            int(v[bat]),
+            int(v[tof]),
+            int(v[time]),
+            Range(int(v[templ]), int(v[temph])),
+            Vector(float(v[agx]), float(v[agy]), float(v[agz])),
+            Vector(float(v[vgx]), float(v[vgy]), float(v[vgz])),
+            mission_pad,
+            mission_pad_position,
+            received_at,
+        )
+
+
+NO_MISSION_PAD_POSITION = Vector(None, None, None)
+
+_layouts = [StateMessageLayout(keys) for keys in STATE_MESSAGE_LAYOUTS]
+
+
+def parse_state_message(raw, received_at=None):
+    """
+    Parses a state message from the drone.
+
+    Messages with a known field order are parsed in a single pass, anything
+    else falls back to looking up each field by name.
+
+    :param raw: The message string
+    :param received_at: Host monotonic time in seconds when the message arrived
+    :rtype: :class:`tello_asyncio.types.TelloState`
+    """
+    for layout in _layouts:
+        try:
+            state = layout.parse(raw, received_at)
+        except ValueError:
+            break
+        if state is not None:
+            return state
+    return parse_state_message_by_name(raw, received_at)
+
+
+def parse_state_message_by_name(raw, received_at=None):
+    """
+    Parses a state message from the drone with fields in any order.
+
+    :param raw: The message string
+    :param received_at: Host monotonic time in seconds when the message arrived
+    :rtype: :class:`tello_asyncio.types.TelloState`
+    """
     pairs = [p.split(":") for p in raw.rstrip(";\r\n").split(";")]
     value_map = {p[0]: p[1] for p in pairs}
 
@@ -108,4 +352,159 @@ def parse_state_message(raw):
         velocity,
         mission_pad,
         mission_pad_position,
+        received_at,
     )
+
+
+_UNPARSED = object()
+
+
+class LazyField:
+    """
+    A field of a :class:`tello_asyncio.state.LazyTelloState`, parsed on first
+    access and then cached.
+    """
+
+    def __init__(self, index, name, keys, convert, missing):
+        self.index = index
+        self.name = name
+        self._keys = tuple(k.encode("ascii") + b":" for k in keys)
+        self._convert = convert
+        self._missing = missing
+
+    def __get__(self, state, owner=None):
+        if state is None:
+            return self
+        values = state._values
+        value = values[self.index]
+        if value is _UNPARSED:
+            value = values[self.index] = self.parse(state._data)
+        return value
+
+    def parse(self, data):
+        """
+        Finds and converts the field value in a raw state message.
+        """
+        values = []
+        for key in self._keys:
+            value = _find_value(data, key)
+            if value is None:
+                return self._missing
+            values.append(value)
+        return self._convert(*values)
+
+
+def _find_value(data, key):
+    # the key is either at the start or just after a separator
+    if data.startswith(key):
+        start = len(key)
+    else:
+        start = data.find(b";" + key)
+        if start < 0:
+            return None
+        start += len(key) + 1
+    end = data.find(b";", start)
+    return data[start:end] if end >= 0 else data[start:].rstrip()
+
+
+def _vector(x, y, z):
+    return Vector(float(x), float(y), float(z))
+
+
+def _range(low, high):
+    return Range(int(low), int(high))
+
+
+LAZY_FIELDS = (
+    LazyField(0, "roll", ("roll",), int, None),
+    LazyField(1, "pitch", ("pitch",), int, None),
+    LazyField(2, "yaw", ("yaw",), int, None),
+    LazyField(3, "height", ("h",), int, None),
+    LazyField(4, "barometer", ("baro",), float, None),
+    LazyField(5, "battery", ("bat",), int, None),
+    LazyField(6, "time_of_flight", ("tof",), int, None),
+    LazyField(7, "motor_time", ("time",), int, None),
+    LazyField(8, "temperature", ("templ", "temph"), _range, Range(None, None)),
+    LazyField(
+        9, "acceleration", ("agx", "agy", "agz"), _vector, NO_MISSION_PAD_POSITION
+    ),
+    LazyField(10, "velocity", ("vgx", "vgy", "vgz"), _vector, NO_MISSION_PAD_POSITION),
+    LazyField(11, "mission_pad", ("mid",), int, None),
+    LazyField(
+        12, "mission_pad_position", ("x", "y", "z"), _vector, NO_MISSION_PAD_POSITION
+    ),
+)
+
+
+class LazyTelloState:
+    """
+    Drone state that keeps the raw message bytes and only parses each field
+    the first time it is used.
+
+    Has the same fields as :class:`tello_asyncio.types.TelloState` and can be
+    indexed, iterated and compared like it.
+
+    :param data: The raw state message bytes
+    :param received_at: Host monotonic time in seconds when the message arrived
+    """
+
+    __slots__ = ("_data", "_raw", "_values", "received_at")
+
+    _fields = TelloState._fields
+
+    def __init__(self, data, received_at=None):
+        self._data = data
+        self._raw = None
+        self._values = [_UNPARSED] * len(LAZY_FIELDS)
+        self.received_at = received_at
+
+    @property
+    def raw(self):
+        """
+        Raw state message string
+        """
+        if self._raw is None:
+            self._raw = self._data.decode("ascii")
+        return self._raw
+
+    def to_state(self):
+        """
+        All fields parsed into a plain state tuple.
+
+        :rtype: :class:`tello_asyncio.types.TelloState`
+        """
+        return TelloState(*self)
+
+    def _asdict(self):
+        return {name: getattr(self, name) for name in self._fields}
+
+    def _replace(self, **fields):
+        return self.to_state()._replace(**fields)
+
+    def __iter__(self):
+        for name in self._fields:
+            yield getattr(self, name)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(getattr(self, name) for name in self._fields[index])
+        return getattr(self, self._fields[index])
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyTelloState, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"LazyTelloState({values})"
+
+
+for _field in LAZY_FIELDS:
+    setattr(LazyTelloState, _field.name, _field)
@@ -0,0 +1,185 @@
+import asyncio
+from collections import deque
+
+from .types import OverflowPolicy, SubscriptionStats
+
+DEFAULT_SUBSCRIPTION_SIZE = 16
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue of items from a
+    :class:`tello_asyncio.subscription.Publisher`, eg drone state.
+
+    Each subscriber has its own queue, so a slow consumer only ever loses its
+    own items, and counts how many it has lost.  When the queue is full the
+    overflow policy decides what happens to a new item:
+
+    - `DROP_OLDEST` - make room by dropping the oldest item
+    - `DROP_NEWEST` - drop the new item
+    - `CONFLATE` - keep only the latest item, whatever the queue size
+
+    Use as an async iterator, and close when finished, eg::
+
+        with drone.subscribe_state(decimation=10) as subscription:
+            async for state in subscription:
+                ...
+
+    :param maxsize: Maximum number of items queued
+    :param overflow: What to do with a new item when the queue is full
+    :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+    :param decimation: Only queue every nth item, eg 10 for one state a second
+    """
+
+    class Closed(Exception):
+        """
+        Raised when getting from a closed subscription.
+        """
+
+        pass
+
+    def __init__(
+        self,
+        publisher,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+        decimation=1,
+    ):
+        self._publisher = publisher
+        self._maxsize = 1 if overflow == OverflowPolicy.CONFLATE else maxsize
+        self._drop_newest = overflow == OverflowPolicy.DROP_NEWEST
+        self._decimation = decimation
+        self._queue = deque()
+        self._waiter = None
+        self._closed = False
+        self._loop = asyncio.get_event_loop()
+
+        self._received = 0
+        self._skipped = 0
+        self._dropped = 0
+
+    def put(self, item):
+        """
+        Queue an item, applying the decimation and overflow policy.
+        """
+        self._received += 1
+        if self._decimation > 1 and (self._received - 1) % self._decimation:
+            self._skipped += 1
+            return
+
+        queue = self._queue
+        if len(queue) >= self._maxsize:
+            self._dropped += 1
+            if self._drop_newest:
+                return
+            queue.popleft()
+        queue.append(item)
+
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def get(self):
+        """
+        Wait for and remove the next item.
+
+        :raises Subscription.Closed: if the subscription has been closed
+        """
+        while not self._queue:
+            if self._closed:
+                raise Subscription.Closed()
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._queue.popleft()
+
+    def get_nowait(self):
+        """
+        Remove the next item if there is one.
+
+        :return: The item, or `None` if the queue is empty
+        """
+        return self._queue.popleft() if self._queue else None
+
+    def close(self):
+        """
+        Stop receiving items.  Any waiting consumer gets the items already
+        queued and then stops.
+        """
+        if not self._closed:
+            self._closed = True
+            self._publisher.unsubscribe(self)
+            waiter = self._waiter
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+    @property
+    def closed(self):
+        """
+        True once the subscription has been closed.
+        """
+        return self._closed
+
+    def stats(self):
+        """
+        Counts of items received, skipped by decimation and dropped on overflow.
+
+        :rtype: :class:`tello_asyncio.types.SubscriptionStats`
+        """
+        return SubscriptionStats(
+            self._received, self._skipped, self._dropped, len(self._queue)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.get()
+        except Subscription.Closed:
+            raise StopAsyncIteration
+
+
+class Publisher:
+    """
+    Hands each published item to every subscriber's own queue.
+    """
+
+    def __init__(self):
+        self._subscriptions = []
+
+    def subscribe(
+        self,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+        decimation=1,
+    ):
+        """
+        Start queueing published items for a new subscriber.
+
+        :rtype: :class:`tello_asyncio.subscription.Subscription`
+        """
+        subscription = Subscription(self, maxsize, overflow, decimation)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        try:
+            self._subscriptions.remove(subscription)
+        except ValueError:
+            pass
+
+    def publish(self, item):
+        for subscription in self._subscriptions:
+            subscription.put(item)
+
+    def __len__(self):
+        return len(self._subscriptions)
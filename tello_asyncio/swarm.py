@@ -0,0 +1,215 @@
+import asyncio
+import logging
+from inspect import isawaitable
+from time import monotonic
+
+from .tello import Tello, CONTROL_UDP_PORT, STATE_UDP_PORT
+from .trace import Tracer, CONNECT, ERROR
+
+
+class TelloSwarm:
+    """
+    Controls several drones from one process, eg Tello EDUs in station mode
+    all connected to the same WiFi router.
+
+    Only one socket can be bound to each of the control and state ports, so
+    the swarm owns them and hands on each response and state message to the
+    :class:`tello_asyncio.tello.Tello` for the drone it came from.
+
+    Video is not supported, since all drones stream to the same port.
+
+    :param drone_hosts: IP addresses of the drones
+    :type drone_hosts: Iterable of str
+    :param trace: Records what the swarm as a whole is doing, defaults to a :class:`tello_asyncio.trace.Tracer` named "swarm"
+    :type trace: :class:`tello_asyncio.trace.Tracer`, optional
+    :param drone_args: Keyword arguments for each :class:`tello_asyncio.tello.Tello`, eg `on_state`
+    """
+
+    _control_transport = None
+    _state_transport = None
+
+    class SharedTransport:
+        """
+        One drone's view of the shared control socket.
+        """
+
+        def __init__(self, transport, protocol, drone_host):
+            self._transport = transport
+            self._protocol = protocol
+            self._addr = (drone_host, CONTROL_UDP_PORT)
+            self._closed = False
+
+        def sendto(self, data, addr=None):
+            self._transport.sendto(data, self._addr)
+
+        def is_closing(self):
+            return self._closed or self._transport.is_closing()
+
+        def close(self):
+            if not self._closed:
+                self._closed = True
+                self._protocol.connection_lost(None)
+
+    class ControlProtocol:
+        def __init__(self, protocols, trace):
+            self._protocols = protocols
+            self._trace = trace
+
+        def connection_made(self, transport):
+            pass
+
+        def datagram_received(self, data, addr):
+            received_at = monotonic()
+            protocol = self._protocols.get(addr[0])
+            if protocol:
+                protocol.handle_datagram(data, received_at)
+
+        def error_received(self, error):
+            if self._trace.warning:
+                self._trace.event(logging.WARNING, ERROR, f"PROTOCOL ERROR {error}")
+
+        def connection_lost(self, error):
+            for protocol in self._protocols.values():
+                protocol.connection_lost(error)
+
+    class StateProtocol:
+        def __init__(self, state_listeners, trace):
+            self._state_listeners = state_listeners
+            self._trace = trace
+
+        def connection_made(self, transport):
+            pass
+
+        def datagram_received(self, data, addr):
+            received_at = monotonic()
+            listener = self._state_listeners.get(addr[0])
+            if listener:
+                listener.handle_datagram(data, received_at)
+
+        def error_received(self, error):
+            if self._trace.warning:
+                self._trace.event(logging.WARNING, ERROR, f"PROTOCOL ERROR {error}")
+
+        def connection_lost(self, error):
+            pass
+
+    class FanOut:
+        """
+        Calls a method or reads a property on every drone in the swarm at once.
+
+        Coroutines are run concurrently with `asyncio.gather`, so eg
+        `await swarm.all.takeoff()` returns when every drone has taken off, and
+        `await swarm.all.query_battery()` returns a list of battery levels.
+        """
+
+        def __init__(self, drones):
+            self._drones = drones
+
+        def __getattr__(self, name):
+            attributes = [getattr(drone, name) for drone in self._drones]
+
+            if all(callable(a) for a in attributes):
+
+                def call(*args, **kwargs):
+                    return _gather_if_awaitable([a(*args, **kwargs) for a in attributes])
+
+                return call
+
+            return _gather_if_awaitable(attributes)
+
+    def __init__(self, drone_hosts, trace=None, **drone_args):
+        self._trace = trace or Tracer(name="swarm")
+        self._drones = [Tello(drone_host=h, **drone_args) for h in drone_hosts]
+        self._protocols = {}
+        self._state_listeners = {}
+        self._loop = asyncio.get_event_loop()
+
+    @property
+    def drones(self):
+        """
+        The drones in the swarm.
+
+        :rtype: list of :class:`tello_asyncio.tello.Tello`
+        """
+        return list(self._drones)
+
+    @property
+    def trace(self):
+        """
+        Records what the swarm as a whole is doing.
+
+        :rtype: :class:`tello_asyncio.trace.Tracer`
+        """
+        return self._trace
+
+    @property
+    def all(self):
+        """
+        Every drone in the swarm at once, eg `await swarm.all.takeoff()`.
+
+        :rtype: :class:`tello_asyncio.swarm.TelloSwarm.FanOut`
+        """
+        return TelloSwarm.FanOut(self._drones)
+
+    def __len__(self):
+        return len(self._drones)
+
+    def __iter__(self):
+        return iter(self._drones)
+
+    def __getitem__(self, index):
+        return self._drones[index]
+
+    async def connect(self):
+        """
+        Opens the shared UDP sockets and puts every drone in SDK mode.
+
+        :return: The responses from the drones
+        """
+        trace = self._trace.control
+        if trace.info:
+            trace.event(logging.INFO, CONNECT, f"swarm of {len(self._drones)}")
+
+        transport, protocol = await self._loop.create_datagram_endpoint(
+            lambda: TelloSwarm.ControlProtocol(self._protocols, self._trace.control),
+            local_addr=("0.0.0.0", CONTROL_UDP_PORT),
+        )
+        self._control_transport = transport
+
+        transport, protocol = await self._loop.create_datagram_endpoint(
+            lambda: TelloSwarm.StateProtocol(self._state_listeners, self._trace.state),
+            local_addr=("0.0.0.0", STATE_UDP_PORT),
+        )
+        self._state_transport = transport
+
+        for drone in self._drones:
+            protocol = Tello.Protocol()
+            drone_transport = TelloSwarm.SharedTransport(
+                self._control_transport, protocol, drone._drone_host
+            )
+            protocol.connection_made(drone_transport)
+            drone._attach(drone_transport, protocol)
+            self._protocols[drone._drone_host] = protocol
+
+            drone._state_listener.attach(drone._on_state_received)
+            self._state_listeners[drone._drone_host] = drone._state_listener
+
+        return await asyncio.gather(*(d._enter_sdk_mode() for d in self._drones))
+
+    async def disconnect(self):
+        """
+        Closes the connections to every drone and the shared UDP sockets.
+        """
+        await asyncio.gather(*(d.disconnect() for d in self._drones))
+        if self._control_transport:
+            self._control_transport.close()
+            self._control_transport = None
+        if self._state_transport:
+            self._state_transport.close()
+            self._state_transport = None
+
+
+def _gather_if_awaitable(values):
+    if values and all(isawaitable(v) for v in values):
+        return asyncio.gather(*values)
+    return values
@@ -0,0 +1,145 @@
+from bisect import bisect_left
+
+from .types import Vector
+
+DEFAULT_STATE_BUFFER_CAPACITY = 64  # about six seconds of state
+DEFAULT_MAX_STATE_WAIT = 0.15  # seconds, a little over the state interval
+
+# state fields that change smoothly enough to interpolate
+INTERPOLATED_FIELDS = (
+    "roll",
+    "pitch",
+    "height",
+    "barometer",
+    "time_of_flight",
+    "motor_time",
+)
+INTERPOLATED_VECTOR_FIELDS = ("acceleration", "velocity")
+
+# state fields the drone gives as whole numbers
+INTEGER_FIELDS = frozenset(
+    ("roll", "pitch", "yaw", "height", "time_of_flight", "motor_time")
+)
+
+
+class StateBuffer:
+    """
+    The most recent drone states indexed by the time they were received, to
+    find the state at any moment in the last few seconds, eg when a video
+    frame arrived::
+
+        buffer.at(frame_info.first_received_at)
+
+    States are kept in time order in a short list, searched with
+    :func:`bisect.bisect_left`.
+
+    :param capacity: Maximum number of states to keep
+    """
+
+    def __init__(self, capacity=DEFAULT_STATE_BUFFER_CAPACITY):
+        self._capacity = capacity
+        self._times = []
+        self._states = []
+
+    def __len__(self):
+        return len(self._states)
+
+    @property
+    def latest_time(self):
+        """
+        Host monotonic time in seconds when the latest state arrived, or
+        `None` if there are none.
+        """
+        return self._times[-1] if self._times else None
+
+    def add(self, state):
+        """
+        Adds a state, dropping the oldest if full.  States without a receive
+        time, or older than the latest, are ignored.
+
+        :type state: :class:`tello_asyncio.types.TelloState`
+        """
+        time = state.received_at
+        times = self._times
+        if time is None or (times and time < times[-1]):
+            return
+        times.append(time)
+        self._states.append(state)
+        if len(times) > self._capacity:
+            del times[0]
+            del self._states[0]
+
+    def at(self, time, interpolate=True):
+        """
+        The state at a given time.
+
+        Between two states, either interpolates between them or takes the
+        nearer.  Before the first state or after the latest, takes that one.
+
+        :param time: Host monotonic time in seconds
+        :param interpolate: Interpolate between states rather than take the nearer
+        :rtype: :class:`tello_asyncio.types.TelloState`, or `None` if there are no states
+        """
+        times = self._times
+        states = self._states
+        if not times:
+            return None
+        i = bisect_left(times, time)
+        if i == len(times):
+            return states[-1]
+        if i == 0 or times[i] == time:
+            return states[i]
+        before_time = times[i - 1]
+        after_time = times[i]
+        if interpolate:
+            fraction = (time - before_time) / (after_time - before_time)
+            return interpolate_state(states[i - 1], states[i], fraction, time)
+        if time - before_time <= after_time - time:
+            return states[i - 1]
+        return states[i]
+
+    def clear(self):
+        del self._times[:]
+        del self._states[:]
+
+
+def interpolate_state(before, after, fraction, received_at=None):
+    """
+    A state part way between two others.
+
+    Angles, height, pressure, times, acceleration and velocity are
+    interpolated linearly, with yaw taking the shorter way round, and
+    fields the drone gives as whole numbers are rounded to them.  Other
+    fields, and any missing from either state, are taken from the nearer
+    state.
+
+    :param before: The earlier state
+    :param after: The later state
+    :param fraction: How far between them, from 0 to 1
+    :param received_at: Receive time to give the new state
+    :rtype: :class:`tello_asyncio.types.TelloState`
+    """
+    nearer = before if fraction <= 0.5 else after
+    fields = {"received_at": received_at}
+
+    for name in INTERPOLATED_FIELDS:
+        a = getattr(before, name)
+        b = getattr(after, name)
+        if a is not None and b is not None:
+            value = a + (b - a) * fraction
+            fields[name] = round(value) if name in INTEGER_FIELDS else value
+
+    a = before.yaw
+    b = after.yaw
+    if a is not None and b is not None:
+        difference = (b - a + 180) % 360 - 180
+        fields["yaw"] = round((a + difference * fraction + 180) % 360 - 180)
+
+    for name in INTERPOLATED_VECTOR_FIELDS:
+        a = getattr(before, name)
+        b = getattr(after, name)
+        if a is None or b is None or None in a or None in b:
+            continue
+        fields[name] = Vector(*(u + (v - u) * fraction for u, v in zip(a, b)))
+
+    return nearer._replace(**fields)
@@ -1,10 +1,45 @@
 import asyncio
+import logging
 from collections import deque
+from time import monotonic
 from inspect import iscoroutinefunction
 
-from .types import Direction, MissionPadDetection, ControllerHardware
-from .state import TelloStateListener, STATE_FIELDS
-from .video import TelloVideoListener, VIDEO_URL
+from .types import (
+    Direction,
+    MissionPadDetection,
+    ControllerHardware,
+    TelloMetrics,
+    OverflowPolicy,
+    TelloResponse,
+)
+from .state import TelloStateListener, STATE_FIELD_SET
+from .rtt import RetransmissionTimer
+from .timeouts import CommandTimeoutModel
+from .rc import RemoteControlChannel, DEFAULT_RC_RATE, DEFAULT_KEEPALIVE_INTERVAL
+from .metrics import ControlCounters
+from .subscription import Publisher, DEFAULT_SUBSCRIPTION_SIZE
+from .watch import StateWatcher
+from .conditions import ConditionIndex, wait_for_condition
+from .clock import ClockAligner
+from .sync import StateBuffer, DEFAULT_MAX_STATE_WAIT
+from .trace import (
+    Tracer,
+    CONNECT,
+    DISCONNECT,
+    SEND,
+    RESEND,
+    RECEIVE,
+    TIMEOUT,
+    ERROR,
+    INFO,
+)
+from .video import (
+    TelloVideoListener,
+    KeyframeCache,
+    VIDEO_URL,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_MAX_FRAME_CHUNKS,
+)
 from .wifi import wait_for_wifi
 
 DEFAULT_DRONE_HOST = "192.168.10.1"
@@ -15,6 +50,16 @@ STATE_UDP_PORT = 8890
 DEFAULT_RESPONSE_TIMEOUT = 10
 LONG_RESPONSE_TIMEOUT = 60
 
+# commands that can safely be sent again if the response seems to be lost
+IDEMPOTENT_COMMANDS = ("command", "stop", "mon", "moff", "streamon", "streamoff")
+IDEMPOTENT_COMMAND_PREFIXES = (
+    "speed ",
+    "mdirection ",
+    "setfps ",
+    "setbitrate ",
+    "setresolution ",
+)
+
 
 class Tello:
     """
@@ -23,10 +68,42 @@ class Tello:
     :param drone_host: Drone IP address, defaults to '192.168.10.1'
     :param on_state: Callback called when state data is received from the drone, taking :class:`tello_asyncio.tello.Tello` drone and :class:`tello_asyncio.types.TelloState` state arguments.
     :type on_state: Callable, optional
-    :param on_video_frame: Called when video frame data is received from the drone, taking :class:`tello_asyncio.tello.Tello` drone and `bytes` frame argument containing the raw data from the drone.
+    :param on_video_frame: Called when video frame data is received from the drone, taking :class:`tello_asyncio.tello.Tello` drone and frame argument containing the raw data from the drone, a read-only `memoryview` only valid until the next frame unless `copy_video_frames` is set.
     :type on_video_frame: Callable, optional
     :param on_error: Called when a command fails for any reason, taking :class:`tello_asyncio.tello.Tello` drone and :class:`tello_asyncio.tello.Tello.Error` frame arguments.
     :type on_video_frame: Callable or awaitable function, optional
+    :param retransmit: Resend queries and other idempotent commands if no response arrives within the adaptive retransmission timeout, defaults to `False`
+    :type retransmit: bool, optional
+    :param timeout_model: Works out how long to wait for each command's response, defaults to a :class:`tello_asyncio.timeouts.CommandTimeoutModel`
+    :type timeout_model: :class:`tello_asyncio.timeouts.CommandTimeoutModel`, optional
+    :param trace: Records what the drone is doing, defaults to a :class:`tello_asyncio.trace.Tracer` logging at `INFO` level
+    :type trace: :class:`tello_asyncio.trace.Tracer`, optional
+    :param lazy_state: Only parse state fields when they are used, see :class:`tello_asyncio.state.LazyTelloState`, defaults to `False`
+    :type lazy_state: bool, optional
+    :param state_history: Keeps recent states for windowed analysis
+    :type state_history: :class:`tello_asyncio.history.StateHistory`, optional
+    :param position_estimator: Estimates the drone's position from each state
+    :type position_estimator: :class:`tello_asyncio.estimator.PositionEstimator`, optional
+    :param batched_receive: Read the state and video sockets with a :class:`tello_asyncio.receiver.BatchedReceiver`, draining every waiting datagram on each wakeup, defaults to `False`
+    :type batched_receive: bool, optional
+    :param copy_video_frames: Pass on video frames and chunks as `bytes` copies that can be kept, rather than views of reused buffers, defaults to `False`
+    :type copy_video_frames: bool, optional
+    :param video_access_units: Find video frame boundaries by scanning for H.264 NAL units, passing on whole access units with their type in :attr:`video_frame_info` and dropping incomplete ones, see :class:`tello_asyncio.video.AccessUnitAssembler`, defaults to `False`
+    :type video_access_units: bool, optional
+    :param video_max_frame_size: Largest video frame in bytes, beyond which it is dropped and reassembly resynchronises, bounding the reassembly buffer when chunks are lost
+    :type video_max_frame_size: int, optional
+    :param video_max_frame_chunks: Most chunks in a video frame
+    :type video_max_frame_chunks: int, optional
+    :param video_resync_at_keyframe: After dropping video data, only start passing on frames again from a keyframe, defaults to `False`
+    :type video_resync_at_keyframe: bool, optional
+    :param video_decoder: Decodes video frames to NumPy arrays in a worker thread, read from :attr:`decoded_video_stream`
+    :type video_decoder: :class:`tello_asyncio.decoder.VideoDecoder`, optional
+    :param video_recorder: Records the raw video stream to files while video is connected
+    :type video_recorder: :class:`tello_asyncio.recorder.VideoRecorder`, optional
+    :param video_relay: Relays video to other local programs while video is connected
+    :type video_relay: :class:`tello_asyncio.relay.VideoRelay`, optional
+    :param video_catch_up: Keep the video parameter sets and frames since the last keyframe, to give consumers that start mid-stream a decodable start, see :class:`tello_asyncio.video.KeyframeCache`, at the cost of copying every frame, defaults to `False`
+    :type video_catch_up: bool, optional
     """
 
     _protocol = None
@@ -38,6 +115,7 @@ class Tello:
     _wifi_ssid_prefix = None
     _sdk_version = None
     _controller_hardware = None
+    _speed = None
 
     class Error(Exception):
         """
@@ -56,19 +134,36 @@ class Tello:
         Messages are plain ASCII text, eg command `forward 10` → response `ok`
         """
 
+        retransmission_timer = None
+        trace = None
+        counters = None
+
         def connection_made(self, transport):
             self.pending = deque()
+            self.expected_duplicates = 0
 
         def datagram_received(self, data, addr):
+            self.handle_datagram(data, monotonic())
+
+        def handle_datagram(self, data, received_at):
             try:
                 message = data.decode("ascii")
             except UnicodeDecodeError as e:
                 raise Tello.Error(f"DECODE ERROR {e} (data: {data})")
 
-            print("RECEIVED", message)
+            trace = self.trace
+            if trace.debug:
+                trace.event(logging.DEBUG, RECEIVE, message)
 
             if message == "forced stop":
-                print("FORCED STOP")
+                if trace.warning:
+                    trace.event(logging.WARNING, INFO, "forced stop")
+                return
+
+            if not self.pending and self.expected_duplicates:
+                # late response to a command that was retransmitted
+                self.expected_duplicates -= 1
+                self.retransmission_timer.duplicates += 1
                 return
 
             try:
@@ -81,12 +176,14 @@ class Tello:
                     else:
                         response.set_exception(Tello.Error(message))
                         return
-                response.set_result((sent_message, result))
+                response.set_result((sent_message, message, result, received_at))
 
             except IndexError:
+                self.counters.unexpected_responses += 1
                 raise Tello.Error("NOT WAITING FOR RESPONSE")
             except asyncio.InvalidStateError:
-                pass
+                # the command has already timed out
+                self.counters.late_responses += 1
 
         def error_received(self, error):
             raise Tello.Error(f"PROTOCOL ERROR {error}")
@@ -103,6 +200,22 @@ class Tello:
         on_state=None,
         on_video_frame=None,
         on_error=None,
+        retransmit=False,
+        timeout_model=None,
+        trace=None,
+        lazy_state=False,
+        state_history=None,
+        position_estimator=None,
+        batched_receive=False,
+        copy_video_frames=False,
+        video_access_units=False,
+        video_max_frame_size=DEFAULT_MAX_FRAME_SIZE,
+        video_max_frame_chunks=DEFAULT_MAX_FRAME_CHUNKS,
+        video_resync_at_keyframe=False,
+        video_decoder=None,
+        video_recorder=None,
+        video_relay=None,
+        video_catch_up=False,
     ):
         """
         Constructor
@@ -111,7 +224,45 @@ class Tello:
         self._on_state_callback = on_state
         self._on_video_frame_callback = on_video_frame
         self._on_error = on_error
+        self._retransmit = retransmit
+        self._retransmission_timer = RetransmissionTimer()
+        self._counters = ControlCounters()
+        self._timeout_model = timeout_model or CommandTimeoutModel(
+            DEFAULT_RESPONSE_TIMEOUT
+        )
+        self._trace = trace or Tracer(name=drone_host)
+        self._state_listener = TelloStateListener(
+            local_port=STATE_UDP_PORT,
+            trace=self._trace.state,
+            lazy=lazy_state,
+            history=state_history,
+            estimator=position_estimator,
+            batched=batched_receive,
+        )
+        self._batched_receive = batched_receive
+        self._copy_video_frames = copy_video_frames
+        self._video_access_units = video_access_units
+        self._video_max_frame_size = video_max_frame_size
+        self._video_max_frame_chunks = video_max_frame_chunks
+        self._video_resync_at_keyframe = video_resync_at_keyframe
+        self._video_decoder = video_decoder
+        if video_decoder is not None and video_decoder.trace is None:
+            video_decoder.trace = self._trace.video
+        self._video_recorder = video_recorder
+        if video_recorder is not None and video_recorder.trace is None:
+            video_recorder.trace = self._trace.video
+        self._video_relay = video_relay
+        if video_relay is not None and video_relay.trace is None:
+            video_relay.trace = self._trace.video
+        self._video_cache = KeyframeCache() if video_catch_up else None
+        self._video_publisher = Publisher()
+        self._video_info_publisher = Publisher()
+        self._state_publisher = Publisher()
+        self._state_buffer = StateBuffer()
+        self._state_watcher = StateWatcher()
         self._loop = asyncio.get_event_loop()
+        self._conditions = ConditionIndex(self._loop)
+        self._clock_aligner = ClockAligner()
 
     async def connect(self):
         """
@@ -119,30 +270,41 @@ class Tello:
 
         :return: The response from the drone
         """
-        print(f"CONNECT {self._drone_host}")
+        trace = self._trace.control
+        if trace.info:
+            trace.event(logging.INFO, CONNECT, self._drone_host)
 
         transport, protocol = await self._loop.create_datagram_endpoint(
             Tello.Protocol,
             local_addr=("0.0.0.0", CONTROL_UDP_PORT),
             remote_addr=(self._drone_host, CONTROL_UDP_PORT),
         )
+        self._attach(transport, protocol)
+
+        await self._state_listener.connect(self._loop, self._on_state_received)
 
+        return await self._enter_sdk_mode()
+
+    def _attach(self, transport, protocol):
+        # use the given control connection, which may be shared with other drones
         self._transport = transport
         self._protocol = protocol
+        protocol.retransmission_timer = self._retransmission_timer
+        protocol.trace = self._trace.control
+        protocol.counters = self._counters
 
-        self._state_listener = TelloStateListener(local_port=STATE_UDP_PORT)
-        await self._state_listener.connect(self._loop, self._on_state_received)
-        self._state_event = asyncio.Event()
-
+    async def _enter_sdk_mode(self):
         # tell drone to be in SDK mode
         response = await self.send("command")
 
         # check battery
         b = await self.query_battery()
+        trace = self._trace.control
         if b < 10:
-            print(f"WARNING low battery: {b}%")
-        else:
-            print(f"battery: {b}%")
+            if trace.warning:
+                trace.event(logging.WARNING, INFO, f"low battery: {b}%")
+        elif trace.info:
+            trace.event(logging.INFO, INFO, f"battery: {b}%")
 
         return response
 
@@ -151,12 +313,20 @@ class Tello:
         Closes all UDP connections to this drone.
         """
         if self._transport and not self._transport.is_closing():
-            print(f"DISCONNECT {self._drone_host}")
+            trace = self._trace.control
+            if trace.info:
+                trace.event(logging.INFO, DISCONNECT, self._drone_host)
 
             self._transport.close()
             await self._state_listener.disconnect()
             if self._video:
                 await self._video.disconnect()
+            if self._video_decoder:
+                await self._video_decoder.stop()
+            if self._video_recorder:
+                await self._video_recorder.stop()
+            if self._video_relay:
+                self._video_relay.stop()
 
     @property
     async def serial_number(self):
@@ -222,7 +392,8 @@ class Tello:
         """
         The drone speed in cm/s, requested directly from the drone.
         """
-        return await self.send("speed?", response_parser=lambda m: float(m))
+        self._speed = await self.send("speed?", response_parser=lambda m: float(m))
+        return self._speed
 
     async def set_speed(self, speed):
         """
@@ -231,7 +402,9 @@ class Tello:
         :param speed: Desired speed, 10-100 cm/s
         :return: The response from the drone
         """
-        return await self.send(f"speed {speed}")
+        response = await self.send(f"speed {speed}")
+        self._speed = speed
+        return response
 
     async def stop(self):
         """
@@ -401,7 +574,7 @@ class Tello:
         command = f"go {p.x} {p.y} {p.z} {speed}"
         if mission_pad:
             command += f" m{mission_pad}"
-        return await self.send(command, timeout=LONG_RESPONSE_TIMEOUT)
+        return await self.send(command)
 
     async def curve_to(
         self, via_relative_position, relative_position, speed, mission_pad=None
@@ -424,7 +597,7 @@ class Tello:
         command = f"curve {v.x} {v.y} {v.z} {p.x} {p.y} {p.z} {speed}"
         if mission_pad:
             command += f" m{mission_pad}"
-        return await self.send(command, timeout=LONG_RESPONSE_TIMEOUT)
+        return await self.send(command)
 
     async def enable_mission_pads(self):
         """
@@ -480,6 +653,20 @@ class Tello:
         """
         return await self.send(f"rc {left_right} {forward_back} {up_down} {yaw}")
 
+    def remote_control_channel(
+        self, rate=DEFAULT_RC_RATE, keepalive_interval=DEFAULT_KEEPALIVE_INTERVAL
+    ):
+        """
+        A channel for sending remote control commands at a fixed rate, only
+        ever sending the latest values.  Call `start` or use it as an async
+        context manager to start sending.
+
+        :param rate: Number of messages per second, eg 20-50 Hz
+        :param keepalive_interval: Maximum time in seconds between messages, even if unchanged
+        :rtype: :class:`tello_asyncio.rc.RemoteControlChannel`
+        """
+        return RemoteControlChannel(self, rate, keepalive_interval)
+
     async def set_wifi_credentials(self, ssid, password):
         """
         Set credentials for the drone's own WiFi network
@@ -538,43 +725,77 @@ class Tello:
             print(f"...wait for WiFi failed, error: {e}")
             print("assuming WiFi network is connected and continuing")
 
-    async def send(
-        self, message, timeout=DEFAULT_RESPONSE_TIMEOUT, response_parser=None
-    ):
+    async def send(self, message, timeout=None, response_parser=None):
         """
         Send a command message and wait for response.
 
         :param message: The command string
-        :param timeout: Time to wait in seconds for a response
+        :param timeout: Time to wait in seconds for a response, defaults to the time the timeout model expects the command to take plus a margin
         :param response_parser: A function that converts the response into a return value.
         :return: The response from the drone
         :rtype: str, unless `response_parser` is used.
         """
         if not self._transport.is_closing():
-            print(f"SEND {message}")
+            trace = self._trace.control
+            if trace.debug:
+                trace.event(logging.DEBUG, SEND, message)
 
             self._transport.sendto(message.encode())
             if not self._expect_response(message):
                 return
+            self._protocol.expected_duplicates = 0
+
+            speed = self._speed
+            modelled = timeout is None
+            if modelled:
+                timeout = self._timeout_model.timeout(message, speed)
 
             response = self._loop.create_future()
             self._protocol.pending.append((message, response, response_parser))
+            sent_time = monotonic()
+            counters = self._counters.command(message)
             error = None
             try:
-                response_message, result = await asyncio.wait_for(
-                    response, timeout=timeout
+                if self._retransmit and self._is_idempotent(message):
+                    (
+                        response_command,
+                        response_message,
+                        result,
+                        received_at,
+                    ) = await self._wait_for_response(message, response, timeout)
+                else:
+                    (
+                        response_command,
+                        response_message,
+                        result,
+                        received_at,
+                    ) = await asyncio.wait_for(response, timeout=timeout)
+                self._last_response = TelloResponse(
+                    response_command, response_message, sent_time, received_at
                 )
-                if response_message == message:
+                if response_command == message:
+                    elapsed = received_at - sent_time
+                    counters.latency.add(elapsed)
+                    if modelled:
+                        self._timeout_model.observe(message, elapsed, speed)
                     return result
                 else:
+                    self._counters.mismatched_responses += 1
                     error = Tello.Error(
-                        'RESPONSE WRONG MESSAGE "{response_message}", expected "{message}" (UDP packet loss detected)'
+                        f'RESPONSE WRONG MESSAGE "{response_command}", expected "{message}" (UDP packet loss detected)'
                     )
             except asyncio.TimeoutError:
+                counters.timeouts += 1
                 error = Tello.Error(f"[{message}] TIMEOUT")
+                if trace.warning:
+                    trace.event(logging.WARNING, TIMEOUT, message)
             except Tello.Error as e:
+                counters.errors += 1
                 error = Tello.Error(f"[{message}] ERROR {e}")
 
+            if trace.warning:
+                trace.event(logging.WARNING, ERROR, str(error))
+
             if self._on_error:
                 # user callback
                 if iscoroutinefunction(self._on_error):
@@ -590,11 +811,151 @@ class Tello:
         # drone responds to everything except remote control commands
         return not message.startswith("rc ")
 
+    def _is_idempotent(self, message):
+        return (
+            message.endswith("?")
+            or message in IDEMPOTENT_COMMANDS
+            or message.startswith(IDEMPOTENT_COMMAND_PREFIXES)
+        )
+
+    @property
+    def trace(self):
+        """
+        Records what the drone is doing, eg to set levels or dump recent events.
+
+        :rtype: :class:`tello_asyncio.trace.Tracer`
+        """
+        return self._trace
+
+    @property
+    def timeout_model(self):
+        """
+        Works out how long to wait for the response to each command.
+
+        :rtype: :class:`tello_asyncio.timeouts.CommandTimeoutModel`
+        """
+        return self._timeout_model
+
+    def metrics(self):
+        """
+        Snapshot of command latencies, failure counts and state message rate,
+        eg to spot a degrading link.  See :func:`tello_asyncio.metrics.to_openmetrics`
+        for exporting them.
+
+        :rtype: :class:`tello_asyncio.types.TelloMetrics`
+        """
+        c = self._counters
+        return TelloMetrics(
+            self._drone_host,
+            c.snapshot(),
+            c.mismatched_responses,
+            c.unexpected_responses,
+            c.late_responses,
+            self._state_listener.rate,
+            self._retransmission_timer.stats(),
+        )
+
+    _last_response = None
+
+    @property
+    def last_response(self):
+        """
+        The most recent response from the drone, with when its command was
+        sent and when it arrived.
+
+        :rtype: :class:`tello_asyncio.types.TelloResponse`
+        """
+        return self._last_response
+
+    @property
+    def clock_alignment(self):
+        """
+        Alignment of the drone's motor time with host time, to measure how
+        long state messages take to arrive.  Only available once the motors
+        have been running for a few seconds.  The latency adds the extra delay
+        to half the smoothed command round trip time, if retransmission is
+        enabled to measure it.
+
+        :rtype: :class:`tello_asyncio.types.ClockAlignment`
+        """
+        srtt = self._retransmission_timer.srtt
+        return self._clock_aligner.alignment(None if srtt is None else srtt / 2)
+
+    @property
+    def receive_stats(self):
+        """
+        Datagrams received per wakeup by the state and video listeners, if
+        `batched_receive` is set.
+
+        :return: :class:`tello_asyncio.types.ReceiverStats` by subsystem, ie `"state"` and `"video"`
+        :rtype: dict
+        """
+        stats = {}
+        state_stats = self._state_listener.receive_stats
+        if state_stats:
+            stats["state"] = state_stats
+        if self._video and self._video.receive_stats:
+            stats["video"] = self._video.receive_stats
+        return stats
+
+    @property
+    def retransmission_stats(self):
+        """
+        Retransmission counters and the round trip time estimate for this drone.
+
+        :rtype: :class:`tello_asyncio.types.RetransmissionStats`
+        """
+        return self._retransmission_timer.stats()
+
+    async def _wait_for_response(self, message, response, timeout):
+        # wait for the response, resending the message each time the adaptive
+        # retransmission timeout expires until the overall timeout is reached
+        timer = self._retransmission_timer
+        timer.commands += 1
+        sent_time = monotonic()
+        deadline = self._loop.time() + timeout
+        rto = timer.rto
+        retransmits = 0
+        while True:
+            remaining = deadline - self._loop.time()
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(response), timeout=min(rto, remaining)
+                )
+                break
+            except asyncio.TimeoutError:
+                if remaining <= rto:
+                    timer.timeouts += 1
+                    response.cancel()
+                    raise
+
+            if retransmits == 0:
+                timer.retransmitted_commands += 1
+            retransmits += 1
+            timer.retransmits += 1
+            rto = timer.backoff(rto)
+            trace = self._trace.control
+            if trace.debug:
+                trace.event(logging.DEBUG, RESEND, message)
+            self._transport.sendto(message.encode())
+
+        if retransmits:
+            # the drone may still respond to the extra transmissions, so
+            # discard up to that many responses until the next command is
+            # sent, after which a response can't be told from its own
+            self._protocol.expected_duplicates = retransmits
+        else:
+            # Karn's algorithm - only sample unambiguous round trips
+            timer.sample(result[3] - sent_time)
+        return result
+
     _aborted = False
 
     async def _abort(self):
         if not self._aborted:
             self._aborted = True
+            if self._trace.ring_buffer:
+                self._trace.dump()
             if self._flying:
                 await self.land()
             await self.disconnect()
@@ -604,34 +965,149 @@ class Tello:
         """
         The current state of the drone, if any.
 
-        :rtype: :class:`tello_asyncio.types.TelloState`
+        :rtype: :class:`tello_asyncio.types.TelloState`, or :class:`tello_asyncio.state.LazyTelloState` if `lazy_state` is set
         """
         return self._state
 
+    @property
+    def state_history(self):
+        """
+        Recent states, if a history was given to the constructor.
+
+        :rtype: :class:`tello_asyncio.history.StateHistory`
+        """
+        return self._state_listener.history
+
+    @property
+    def estimated_position(self):
+        """
+        The estimated position of the drone, with its covariance, if a
+        position estimator was given to the constructor.
+
+        :rtype: :class:`tello_asyncio.types.PositionEstimate`
+        """
+        estimator = self._state_listener.estimator
+        return estimator.estimate() if estimator is not None else None
+
+    def subscribe_state(
+        self,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+        decimation=1,
+    ):
+        """
+        Queue drone states for one consumer, independently of any others.
+
+        A consumer that falls behind loses states from its own queue according
+        to the overflow policy, and can see how many with
+        :meth:`tello_asyncio.subscription.Subscription.stats`.  Close the
+        subscription when finished, eg::
+
+            with drone.subscribe_state(decimation=10) as states:
+                async for state in states:
+                    print(state.battery)
+
+        :param maxsize: Maximum number of states queued
+        :param overflow: What to do with a new state when the queue is full, defaults to dropping the oldest
+        :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+        :param decimation: Only queue every nth state, eg 10 for one a second
+        :rtype: :class:`tello_asyncio.subscription.Subscription`
+        """
+        return self._state_publisher.subscribe(maxsize, overflow, decimation)
+
+    def watch(
+        self,
+        fields,
+        deadband=0,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+    ):
+        """
+        Watch drone state fields, only waking when they change by more than
+        the deadband, eg::
+
+            with drone.watch(("height", "battery"), deadband={"height": 5}) as changes:
+                async for change in changes:
+                    print(change.fields, change.state.height)
+
+        Each change is compared once when the state arrives, however many
+        subscriptions are watching the field.
+
+        :param fields: Names of :class:`tello_asyncio.types.TelloState` fields
+        :type fields: str or Iterable of str
+        :param deadband: Change needed to count, in the field's units, or a dict of them by field name, defaults to any change
+        :type deadband: number or dict
+        :param maxsize: Maximum number of changes queued
+        :param overflow: What to do with a new change when the queue is full
+        :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+        :rtype: :class:`tello_asyncio.subscription.Subscription` of :class:`tello_asyncio.types.StateChange`
+        """
+        return self._state_watcher.watch(fields, deadband, maxsize, overflow)
+
+    def watch_mission_pad(
+        self, maxsize=DEFAULT_SUBSCRIPTION_SIZE, overflow=OverflowPolicy.DROP_OLDEST
+    ):
+        """
+        Watch for mission pads being acquired, lost or changed.  Mission pad
+        detection must be enabled.
+
+        :param maxsize: Maximum number of events queued
+        :param overflow: What to do with a new event when the queue is full
+        :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+        :rtype: :class:`tello_asyncio.subscription.Subscription` of :class:`tello_asyncio.types.MissionPadEvent`
+        """
+        return self._state_watcher.watch_mission_pad(maxsize, overflow)
+
+    async def wait_for(self, condition, timeout=None):
+        """
+        Wait for the drone state to satisfy a condition, eg::
+
+            await drone.wait_for(("height", ">", 100), timeout=10)
+            await drone.wait_for(("mission_pad", "==", 3))
+            await drone.wait_for(lambda state: state.velocity.x == 0)
+
+        Field conditions are indexed by field, so each new state only checks
+        those on fields that changed, which keeps many pending conditions
+        cheap.  Callables are called with every new state.
+
+        :param condition: `(field, operator, value)`, with one of the operators `==`, `!=`, `<`, `<=`, `>` or `>=`, or a callable taking a :class:`tello_asyncio.types.TelloState` and returning `True` when satisfied
+        :param timeout: Maximum time to wait in seconds, defaults to forever
+        :raises asyncio.TimeoutError: if the timeout passes first
+        :return: The state that satisfied the condition, which may be the current state
+        :rtype: :class:`tello_asyncio.types.TelloState`
+        """
+        return await wait_for_condition(self._conditions, condition, timeout)
+
     @property
     async def state_stream(self):
         """
         In infinite stream of drone state objects.
 
+        Always yields the latest state, skipping any received while the
+        consumer was busy.
+
         :rtype: :class:`tello_asyncio.types.TelloState`
         """
-        while True:
-            await self._state_event.wait()
-            yield self._state
+        with self.subscribe_state(overflow=OverflowPolicy.CONFLATE) as subscription:
+            async for state in subscription:
+                yield state
 
     def _on_state_received(self, state):
         if self._on_state_callback:
             self._on_state_callback(self, state)
 
         self._state = state
-        self._state_event.set()
-        self._state_event.clear()
+        self._clock_aligner.update(state.motor_time, state.received_at)
+        self._state_buffer.add(state)
+        self._state_watcher.update(state)
+        self._conditions.update(state)
+        self._state_publisher.publish(state)
 
     def __getattr__(self, name):
         """
         Shortcut to the drone state :class:`tello_asyncio.types.TelloState` properties.
         """
-        if name in STATE_FIELDS:
+        if name in STATE_FIELD_SET:
             if self._state:
                 return getattr(self._state, name)
             else:
@@ -649,7 +1125,7 @@ class Tello:
         """
         Start streaming video data.  Only works in AP mode using the drone's own WiFi.
 
-        :param on_frame: Callback called when a new frame arrives, taking :class:`tello_asyncio.tello.Tello` drone and `bytes` frame raw data arguments
+        :param on_frame: Callback called when a new frame arrives, taking :class:`tello_asyncio.tello.Tello` drone and frame raw data arguments
         :type on_frame: Callable, optional
         :param connect: Whether to start receiving frame data, default `True`
         :type connect: Boolean, optional
@@ -672,47 +1148,121 @@ class Tello:
         Opens a connection to the `video_url` and listens for the video frame
         data streamed after `start_video` is called.
 
-        :param on_frame: Callback called when a new frame arrives, taking :class:`tello_asyncio.tello.Tello` drone and `bytes` frame raw data arguments
+        :param on_frame: Callback called when a new frame arrives, taking :class:`tello_asyncio.tello.Tello` drone and frame raw data arguments
         :type on_frame: Callable, optional
         """
         if on_frame:
             self._on_video_frame_callback = on_frame
-        self._video = TelloVideoListener()
+        self._video = TelloVideoListener(
+            trace=self._trace.video,
+            batched=self._batched_receive,
+            copy=self._copy_video_frames,
+            access_units=self._video_access_units,
+            max_frame_size=self._video_max_frame_size,
+            max_frame_chunks=self._video_max_frame_chunks,
+            resync_at_keyframe=self._video_resync_at_keyframe,
+        )
         self._video_frame_chunk_event = asyncio.Event()
         self._video_frame_event = asyncio.Event()
+        if self._video_cache is not None:
+            self._video_cache.reset()
         await self._video.connect(
             self._loop, self._on_video_frame_chunk, self._on_video_frame
         )
-
-    def _on_video_frame_chunk(self, frame_chunk):
+        if self._video_decoder:
+            self._video_decoder.start(self._loop, self.video_catch_up)
+        if self._video_recorder:
+            self._video_recorder.start(self._loop)
+        if self._video_relay:
+            self._video_relay.start(self._loop)
+
+    def _on_video_frame_chunk(self, frame_chunk, received_at):
         self._video_frame_chunk = frame_chunk
+        self._video_chunk_received_at = received_at
+        if self._video_relay:
+            self._video_relay.on_chunk(frame_chunk)
         self._video_frame_chunk_event.set()
         self._video_frame_chunk_event.clear()
 
-    def _on_video_frame(self, frame):
+    def _on_video_frame(self, frame, info):
         if self._on_video_frame_callback:
             self._on_video_frame_callback(self, frame)
+        if self._video_decoder:
+            self._video_decoder.submit(frame, info)
+        if self._video_recorder:
+            self._video_recorder.submit(frame, info)
+        if self._video_relay:
+            self._video_relay.on_frame(frame)
+        cache = self._video_cache
+        publisher = self._video_publisher
+        info_publisher = self._video_info_publisher
+        if cache is not None or len(publisher) or len(info_publisher):
+            data = frame if type(frame) is bytes else bytes(frame)
+            if cache is not None:
+                cache.update(data, info)
+            publisher.publish(data)
+            info_publisher.publish((data, info))
         self._video_frame = frame
+        self._video_frame_info = info
         self._video_frame_event.set()
         self._video_frame_event.clear()
 
     _video_frame = None
+    _video_frame_info = None
+    _video_chunk_received_at = None
 
     @property
     def video_frame(self):
         """
         The most recent raw frame data, if any,
 
-        :rtype: `bytes`
+        :rtype: read-only `memoryview`, or `bytes` if `copy_video_frames` is set
         """
         return self._video_frame
 
+    @property
+    def video_frame_info(self):
+        """
+        When the most recent frame arrived, and its size, if any.
+
+        :rtype: :class:`tello_asyncio.types.VideoFrameInfo`
+        """
+        return self._video_frame_info
+
+    @property
+    def video_reassembly_stats(self):
+        """
+        Counts of video frames passed on, and split and dropped, if connected
+        to video.  Frames are only split, or dropped as incomplete, if
+        `video_access_units` is set.
+
+        :rtype: :class:`tello_asyncio.types.ReassemblyStats`
+        """
+        return self._video.reassembly_stats if self._video else None
+
+    def video_stats(self):
+        """
+        Frame rate, bitrate, chunks per frame, losses, keyframe interval and
+        frame sizes of the video received so far, if connected to video.
+
+        :rtype: :class:`tello_asyncio.types.VideoStats`
+        """
+        return self._video.stats() if self._video else None
+
+    @property
+    def video_chunk_received_at(self):
+        """
+        Host monotonic time in seconds when the most recent video data chunk
+        arrived, if any.
+        """
+        return self._video_chunk_received_at
+
     @property
     async def video_chunk_stream(self):
         """
         Infinite stream of video frame data chunks.
 
-        :rtype: `bytes`
+        :rtype: `bytes`, or a `memoryview` only valid until the next chunk with `batched_receive` unless `copy_video_frames` is set
         """
         while True:
             await self._video_frame_chunk_event.wait()
@@ -721,14 +1271,179 @@ class Tello:
     @property
     async def video_stream(self):
         """
-        Infinite stream of video frame data.
+        Infinite stream of video frame data, each only valid until the next
+        frame unless `copy_video_frames` is set.
+
+        Starts with the catch up data, if any, so the frames can be decoded
+        straight away, see :attr:`video_catch_up`.
 
-        :rtype: `bytes`
+        :rtype: read-only `memoryview`, or `bytes` if `copy_video_frames` is set
         """
+        catch_up = self.video_catch_up
+        if catch_up:
+            yield catch_up[0]
         while True:
             await self._video_frame_event.wait()
             yield self._video_frame
 
+    def subscribe_video(
+        self,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+        catch_up=True,
+    ):
+        """
+        Queue video frames for one consumer, as `bytes` that can be kept,
+        eg::
+
+            with drone.subscribe_video() as frames:
+                async for frame in frames:
+                    for packet in codec.parse(frame):
+                        ...
+
+        A consumer that falls behind loses frames from its own queue, and its
+        decoder shows errors until the next keyframe.
+
+        :param maxsize: Maximum number of frames queued
+        :param overflow: What to do with a new frame when the queue is full, defaults to dropping the oldest
+        :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+        :param catch_up: Start with the catch up data, if any, see :attr:`video_catch_up`
+        :rtype: :class:`tello_asyncio.subscription.Subscription`
+        """
+        subscription = self._video_publisher.subscribe(maxsize, overflow)
+        if catch_up:
+            data = self.video_catch_up
+            if data:
+                subscription.put(data[0])
+        return subscription
+
+    @property
+    async def synchronized_stream(self):
+        """
+        Infinite stream of video frames, as `bytes`, each paired with the
+        drone state interpolated to when the frame arrived, see
+        :meth:`synchronized_frames`, eg::
+
+            async for frame, state in drone.synchronized_stream:
+                ...
+
+        :rtype: tuple of `bytes` and :class:`tello_asyncio.types.TelloState`
+        """
+        async for pair in self.synchronized_frames():
+            yield pair
+
+    async def synchronized_frames(
+        self,
+        interpolate=True,
+        max_state_wait=DEFAULT_MAX_STATE_WAIT,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+        catch_up=True,
+    ):
+        """
+        Stream of video frames, as `bytes`, each paired with the drone state
+        at the time the frame's first chunk arrived, the nearest to when it
+        was captured.
+
+        Recent states are kept by receive time, so the state for a frame is
+        found however late the consumer reads it.  States arrive about ten
+        times a second, so to interpolate, each frame waits up to
+        `max_state_wait` for the state after it; if none arrives the latest
+        is used.  Without interpolation the nearest state already received
+        is used, without waiting.
+
+        Interpolated states have the frame's time as their `received_at`.
+        Frames that arrive before any state are paired with `None`.
+
+        :param interpolate: Interpolate between the states either side of each frame rather than take the nearer
+        :param max_state_wait: Longest time in seconds after a frame arrived to wait for the next state
+        :param maxsize: Maximum number of frames queued
+        :param overflow: What to do with a new frame when the queue is full, defaults to dropping the oldest
+        :type overflow: :class:`tello_asyncio.types.OverflowPolicy`
+        :param catch_up: Start with the catch up data, if any, see :attr:`video_catch_up`
+        :rtype: tuple of `bytes` and :class:`tello_asyncio.types.TelloState`
+        """
+        buffer = self._state_buffer
+        frames = self._video_info_publisher.subscribe(maxsize, overflow)
+        states = self.subscribe_state(overflow=OverflowPolicy.CONFLATE)
+        with frames, states:
+            if catch_up:
+                data = self.video_catch_up
+                if data:
+                    frames.put(data)
+            async for data, info in frames:
+                time = info.first_received_at
+                if time is None:
+                    time = info.received_at
+                if time is None:
+                    time = monotonic()
+                if interpolate:
+                    deadline = time + max_state_wait
+                    while buffer.latest_time is not None and buffer.latest_time < time:
+                        remaining = deadline - monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            await asyncio.wait_for(states.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                yield data, buffer.at(time, interpolate)
+
+    @property
+    def video_catch_up(self):
+        """
+        The latest video parameter sets, keyframe and frames since, for a
+        decoder starting mid-stream, if `video_catch_up` is set and a
+        keyframe has arrived.
+
+        :return: The data and its :class:`tello_asyncio.types.VideoFrameInfo`, or `None`
+        :rtype: tuple
+        """
+        cache = self._video_cache
+        return cache.catch_up() if cache is not None else None
+
+    async def set_video_decoder(self, decoder):
+        """
+        Replaces the video decoder, stopping the old one, and starting the
+        new one from the catch up data if video is connected.
+
+        :param decoder: The new decoder, or `None`
+        :type decoder: :class:`tello_asyncio.decoder.VideoDecoder`
+        """
+        if self._video_decoder:
+            await self._video_decoder.stop()
+        self._video_decoder = decoder
+        if decoder is None:
+            return
+        if decoder.trace is None:
+            decoder.trace = self._trace.video
+        if self._video:
+            decoder.start(self._loop, self.video_catch_up)
+
+    @property
+    async def decoded_video_stream(self):
+        """
+        Infinite stream of the latest decoded video frames, if a video
+        decoder was given to the constructor.  Frames that arrive while the
+        consumer is busy are skipped.
+
+        :rtype: :class:`tello_asyncio.types.DecodedFrame`
+        """
+        if self._video_decoder is None:
+            raise Tello.Error("No video decoder")
+        async for frame in self._video_decoder.stream:
+            yield frame
+
+    @property
+    def video_decoder_stats(self):
+        """
+        How many video frames have been decoded and dropped, if a video
+        decoder was given to the constructor.
+
+        :rtype: :class:`tello_asyncio.types.DecoderStats`
+        """
+        return self._video_decoder.stats() if self._video_decoder else None
+
     ##########################################################################
     # Tello SDK 3.x
 
@@ -0,0 +1,149 @@
+from math import pi, sqrt
+
+# slowest settable speed, assumed if the actual speed is not known
+MIN_SPEED = 10  # cm/s
+
+DEFAULT_YAW_RATE = 45  # °/s
+
+# time the drone takes to start and stop moving on top of the travel time
+MOVE_OVERHEAD = 1.0  # s
+
+# commands that take a roughly fixed amount of time, in seconds
+FIXED_DURATIONS = {
+    "takeoff": 6.0,
+    "land": 6.0,
+    "flip": 3.0,
+    "throwfly": 8.0,
+    "stop": 0.0,
+    "emergency": 0.0,
+}
+
+# margin allowed before anything has been learned, on top of the expected duration
+INITIAL_MARGIN = 3.0  # s
+INITIAL_MARGIN_FRACTION = 0.5
+
+MIN_MARGIN = 0.5  # s
+
+# smoothing gains for the learned error, as for round trip time estimation
+ERROR_ALPHA = 1 / 8
+ERROR_BETA = 1 / 4
+
+MOVE_VERBS = ("up", "down", "left", "right", "forward", "back")
+
+
+class CommandTimeoutModel:
+    """
+    Works out how long to wait for the response to a command from how long the
+    drone should take to carry it out.
+
+    Motion commands take the travel distance over the speed, turns the angle
+    over the yaw rate and takeoff, landing and flips a fixed time.  A margin is
+    added on top, learned per command from how far the actual durations
+    differ from the expected ones.  Commands that do not move the drone get
+    the default timeout.
+
+    :param default_timeout: Timeout in seconds for commands that do not move the drone
+    :param yaw_rate: Assumed turning speed in °/s
+    """
+
+    class VerbError:
+        def __init__(self):
+            self.mean = None
+            self.deviation = None
+
+        def sample(self, error):
+            if self.mean is None:
+                self.mean = error
+                self.deviation = abs(error) / 2
+            else:
+                self.deviation = (1 - ERROR_BETA) * self.deviation + ERROR_BETA * abs(
+                    self.mean - error
+                )
+                self.mean = (1 - ERROR_ALPHA) * self.mean + ERROR_ALPHA * error
+
+    def __init__(self, default_timeout, yaw_rate=DEFAULT_YAW_RATE):
+        self._default_timeout = default_timeout
+        self._yaw_rate = yaw_rate
+        self._errors = {}
+
+    def expected_duration(self, message, speed=None):
+        """
+        How long the drone should take to carry out a command.
+
+        :param message: The command string
+        :param speed: The current speed set with `speed x`, in cm/s, if known
+        :return: The duration in seconds, or `None` if the command does not move the drone
+        """
+        parts = message.split()
+        if not parts:
+            return None
+        verb = parts[0]
+
+        try:
+            if verb in FIXED_DURATIONS:
+                return FIXED_DURATIONS[verb]
+            if verb in MOVE_VERBS:
+                return MOVE_OVERHEAD + float(parts[1]) / (speed or MIN_SPEED)
+            if verb == "cw" or verb == "ccw":
+                return MOVE_OVERHEAD + float(parts[1]) / self._yaw_rate
+            if verb == "go":
+                x, y, z, s = (float(p) for p in parts[1:5])
+                return MOVE_OVERHEAD + _length(x, y, z) / s
+            if verb == "curve":
+                x1, y1, z1, x2, y2, z2, s = (float(p) for p in parts[1:8])
+                # the arc is no longer than the two chords scaled by π/2
+                chords = _length(x1, y1, z1) + _length(x2 - x1, y2 - y1, z2 - z1)
+                return MOVE_OVERHEAD + chords * pi / 2 / s
+            if verb == "jump":
+                x, y, z, s, yaw = (float(p) for p in parts[1:6])
+                return (
+                    2 * MOVE_OVERHEAD
+                    + _length(x, y, z) / s
+                    + abs(yaw) / self._yaw_rate
+                )
+        except (IndexError, ValueError, ZeroDivisionError):
+            pass
+        return None
+
+    def timeout(self, message, speed=None):
+        """
+        The time to wait for a response to a command before giving up.
+
+        :param message: The command string
+        :param speed: The current speed set with `speed x`, in cm/s, if known
+        :return: The timeout in seconds
+        """
+        expected = self.expected_duration(message, speed)
+        if expected is None:
+            return self._default_timeout
+
+        error = self._errors.get(_verb(message))
+        if error is None or error.mean is None:
+            margin = INITIAL_MARGIN + INITIAL_MARGIN_FRACTION * expected
+        else:
+            margin = max(MIN_MARGIN, error.mean + 4 * error.deviation)
+        return expected + margin
+
+    def observe(self, message, elapsed, speed=None):
+        """
+        Learn from the actual time a command took.
+
+        :param message: The command string
+        :param elapsed: Time in seconds from sending the command to the response
+        :param speed: The speed used to calculate the timeout, in cm/s, if known
+        """
+        expected = self.expected_duration(message, speed)
+        if expected is not None:
+            verb = _verb(message)
+            error = self._errors.get(verb)
+            if error is None:
+                error = self._errors[verb] = CommandTimeoutModel.VerbError()
+            error.sample(elapsed - expected)
+
+
+def _verb(message):
+    return message.split(" ", 1)[0]
+
+
+def _length(x, y, z):
+    return sqrt(x * x + y * y + z * z)
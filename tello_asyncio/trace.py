@@ -0,0 +1,163 @@
+import logging
+import sys
+from collections import deque
+from time import monotonic
+
+from .types import TraceEvent
+
+# level for events sent many times a second, eg state messages and video frames
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+SUBSYSTEMS = ("control", "state", "video", "rc")
+
+# event kinds
+CONNECT = "connect"
+DISCONNECT = "disconnect"
+SEND = "send"
+RESEND = "resend"
+RECEIVE = "recv"
+TIMEOUT = "timeout"
+ERROR = "error"
+STATE = "state"
+FRAME = "frame"
+CHUNK = "chunk"
+INFO = "info"
+
+DEFAULT_LEVEL = logging.INFO
+
+
+class TraceChannel:
+    """
+    Trace events for one subsystem of a drone, eg `control` or `video`.
+
+    Check the precomputed flag for the level before building an event, so a
+    disabled level costs no more than an attribute lookup::
+
+        if channel.debug:
+            channel.event(logging.DEBUG, SEND, message)
+    """
+
+    __slots__ = ("_tracer", "_subsystem", "_logger", "trace", "debug", "info", "warning")
+
+    def __init__(self, tracer, subsystem):
+        self._tracer = tracer
+        self._subsystem = subsystem
+        self._logger = logging.getLogger(f"tello_asyncio.{subsystem}")
+        self.set_threshold(DEFAULT_LEVEL)
+
+    def set_threshold(self, threshold):
+        self.trace = TRACE >= threshold
+        self.debug = logging.DEBUG >= threshold
+        self.info = logging.INFO >= threshold
+        self.warning = logging.WARNING >= threshold
+
+    def event(self, level, kind, message):
+        """
+        Record an event, sending it to the `tello_asyncio.<subsystem>` logger
+        and the ring buffer, if enabled for the level.
+
+        :param level: A `logging` level, or :data:`TRACE`
+        :param kind: The kind of event, eg :data:`SEND`
+        :param message: Description of the event
+        """
+        self._tracer._record(self, level, kind, message)
+
+
+class Tracer:
+    """
+    Structured trace of what a drone is doing, in place of printing.
+
+    Events are sent to the standard `logging` module, with a logger per
+    subsystem named `tello_asyncio.control`, `tello_asyncio.state`,
+    `tello_asyncio.video` and `tello_asyncio.rc`.  Each subsystem has its own
+    level, below which events are not even created.
+
+    Optionally the last events are also kept in a ring buffer, eg to dump
+    after something goes wrong.
+
+    :param name: Identifies the drone in events, eg its IP address
+    :param level: Initial level for every subsystem
+    :param ring_buffer_size: Number of events to keep, or 0 for none
+    :param ring_buffer_level: Lowest level of events kept in the ring buffer
+    """
+
+    def __init__(
+        self,
+        name=None,
+        level=DEFAULT_LEVEL,
+        ring_buffer_size=0,
+        ring_buffer_level=logging.DEBUG,
+    ):
+        self.name = name
+        self._levels = {}
+        self._ring_buffer = deque(maxlen=ring_buffer_size) if ring_buffer_size else None
+        self._ring_buffer_level = ring_buffer_level
+
+        self.control = TraceChannel(self, "control")
+        self.state = TraceChannel(self, "state")
+        self.video = TraceChannel(self, "video")
+        self.rc = TraceChannel(self, "rc")
+
+        self.set_level(level)
+
+    def set_level(self, level, subsystem=None):
+        """
+        Set the level below which events are ignored.
+
+        :param level: A `logging` level, or :data:`TRACE`
+        :param subsystem: One of :data:`SUBSYSTEMS`, or `None` for all of them
+        """
+        subsystems = SUBSYSTEMS if subsystem is None else (subsystem,)
+        for s in subsystems:
+            self._levels[s] = level
+            threshold = level
+            if self._ring_buffer is not None:
+                threshold = min(level, self._ring_buffer_level)
+            getattr(self, s).set_threshold(threshold)
+
+    def level(self, subsystem):
+        """
+        The level for a subsystem.
+        """
+        return self._levels[subsystem]
+
+    @property
+    def ring_buffer(self):
+        """
+        True if recent events are being kept.
+        """
+        return self._ring_buffer is not None
+
+    def events(self):
+        """
+        The events in the ring buffer, oldest first.
+
+        :rtype: list of :class:`tello_asyncio.types.TraceEvent`
+        """
+        return list(self._ring_buffer) if self._ring_buffer is not None else []
+
+    def dump(self, file=None):
+        """
+        Write the events in the ring buffer, eg after an abort.
+
+        :param file: Where to write, defaults to `sys.stderr`
+        """
+        file = file or sys.stderr
+        events = self.events()
+        if events:
+            print(f"--- last {len(events)} events for {self.name} ---", file=file)
+            t0 = events[-1].time
+            for e in events:
+                print(
+                    f"{e.time - t0:+10.3f} {logging.getLevelName(e.level):8} {e.subsystem:7} {e.kind:10} {e.message}",
+                    file=file,
+                )
+
+    def _record(self, channel, level, kind, message):
+        if self._ring_buffer is not None and level >= self._ring_buffer_level:
+            self._ring_buffer.append(
+                TraceEvent(monotonic(), self.name, channel._subsystem, kind, level, message)
+            )
+        if level >= self._levels[channel._subsystem]:
+            channel._logger.log(level, "%s %s %s", self.name, kind.upper(), message)
@@ -13,8 +13,9 @@ Vector.z.__doc__ = "z value"
 
 TelloState = namedtuple(
     "TelloState",
-    "raw roll pitch yaw height barometer battery time_of_flight motor_time temperature acceleration velocity mission_pad mission_pad_position",
+    "raw roll pitch yaw height barometer battery time_of_flight motor_time temperature acceleration velocity mission_pad mission_pad_position received_at",
 )
+TelloState.__new__.__defaults__ = (None,)
 TelloState.raw.__doc__ = "Raw state message string"
 TelloState.roll.__doc__ = "Rotation in degrees around the drone's local y axis"
 TelloState.pitch.__doc__ = "Rotation in degrees around the drone's local x axis"
@@ -35,6 +36,314 @@ TelloState.mission_pad.__doc__ = "Mission pad ID"
 TelloState.mission_pad_position.__doc__ = (
     ":class:`tello_asyncio.types.Vector` mission pad relative position"
 )
+TelloState.received_at.__doc__ = (
+    "Host monotonic time in seconds when the state message arrived, if known"
+)
+
+RetransmissionStats = namedtuple(
+    "RetransmissionStats",
+    "commands retransmitted_commands retransmits duplicates timeouts srtt rttvar rto",
+)
+RetransmissionStats.commands.__doc__ = "Number of commands sent with retransmission enabled"
+RetransmissionStats.retransmitted_commands.__doc__ = (
+    "Number of commands that needed at least one retransmission"
+)
+RetransmissionStats.retransmits.__doc__ = "Total number of retransmissions"
+RetransmissionStats.duplicates.__doc__ = (
+    "Number of late duplicate responses received and discarded"
+)
+RetransmissionStats.timeouts.__doc__ = (
+    "Number of commands that still had no response after all retransmissions"
+)
+RetransmissionStats.srtt.__doc__ = "Smoothed round trip time in seconds"
+RetransmissionStats.rttvar.__doc__ = "Round trip time variation in seconds"
+RetransmissionStats.rto.__doc__ = "Current retransmission timeout in seconds"
+
+RemoteControlStats = namedtuple(
+    "RemoteControlStats", "ticks sends skipped tick_rate send_rate jitter"
+)
+RemoteControlStats.ticks.__doc__ = "Number of ticks of the fixed rate loop"
+RemoteControlStats.sends.__doc__ = "Number of `rc` messages sent"
+RemoteControlStats.skipped.__doc__ = (
+    "Number of ticks with nothing sent because the values were unchanged"
+)
+RemoteControlStats.tick_rate.__doc__ = "Smoothed achieved tick rate in Hz"
+RemoteControlStats.send_rate.__doc__ = "Average messages sent per second"
+RemoteControlStats.jitter.__doc__ = (
+    "Smoothed difference in seconds between the actual and intended tick interval"
+)
+
+TraceEvent = namedtuple("TraceEvent", "time drone subsystem kind level message")
+TraceEvent.time.__doc__ = "Monotonic time in seconds when the event happened"
+TraceEvent.drone.__doc__ = "Name of the drone, usually its IP address"
+TraceEvent.subsystem.__doc__ = 'Part of the library, eg "control" or "video"'
+TraceEvent.kind.__doc__ = 'Kind of event, eg "send" or "timeout"'
+TraceEvent.level.__doc__ = "`logging` level of the event"
+TraceEvent.message.__doc__ = "Description of the event"
+
+CommandMetrics = namedtuple(
+    "CommandMetrics", "count errors timeouts latency_sum latency_buckets"
+)
+CommandMetrics.count.__doc__ = "Number of successful responses"
+CommandMetrics.errors.__doc__ = "Number of error responses"
+CommandMetrics.timeouts.__doc__ = "Number of commands with no response in time"
+CommandMetrics.latency_sum.__doc__ = (
+    "Total time in seconds from sending to successful response"
+)
+CommandMetrics.latency_buckets.__doc__ = (
+    "Number of responses in each of :data:`tello_asyncio.metrics.LATENCY_BUCKETS`"
+)
+
+RateMetrics = namedtuple("RateMetrics", "count rate jitter last_time")
+RateMetrics.count.__doc__ = "Number of messages received"
+RateMetrics.rate.__doc__ = "Smoothed number of messages per second"
+RateMetrics.jitter.__doc__ = "Smoothed variation in seconds of the time between messages"
+RateMetrics.last_time.__doc__ = "Monotonic time in seconds of the last message"
+
+TelloMetrics = namedtuple(
+    "TelloMetrics",
+    "drone commands mismatched_responses unexpected_responses late_responses state retransmission",
+)
+TelloMetrics.drone.__doc__ = "Drone IP address"
+TelloMetrics.commands.__doc__ = (
+    "dict of command verb to :class:`tello_asyncio.types.CommandMetrics`"
+)
+TelloMetrics.mismatched_responses.__doc__ = (
+    "Number of responses to a different command than expected (UDP packet loss)"
+)
+TelloMetrics.unexpected_responses.__doc__ = (
+    "Number of responses received when no command was waiting"
+)
+TelloMetrics.late_responses.__doc__ = (
+    "Number of responses received after the command timed out"
+)
+TelloMetrics.state.__doc__ = (
+    ":class:`tello_asyncio.types.RateMetrics` for state messages"
+)
+TelloMetrics.retransmission.__doc__ = (
+    ":class:`tello_asyncio.types.RetransmissionStats`"
+)
+
+
+SubscriptionStats = namedtuple("SubscriptionStats", "received skipped dropped queued")
+SubscriptionStats.received.__doc__ = "Number of items published to the subscriber"
+SubscriptionStats.skipped.__doc__ = "Number of items skipped by decimation"
+SubscriptionStats.dropped.__doc__ = "Number of items dropped because the queue was full"
+SubscriptionStats.queued.__doc__ = "Number of items waiting in the queue"
+
+
+StateChange = namedtuple("StateChange", "state fields")
+StateChange.state.__doc__ = "The new :class:`tello_asyncio.types.TelloState`"
+StateChange.fields.__doc__ = "Names of the watched fields that changed"
+
+MissionPadEvent = namedtuple(
+    "MissionPadEvent", "kind mission_pad previous_mission_pad state"
+)
+MissionPadEvent.kind.__doc__ = ":class:`tello_asyncio.types.MissionPadEventKind`"
+MissionPadEvent.mission_pad.__doc__ = "ID of the mission pad now detected, or -1 if none"
+MissionPadEvent.previous_mission_pad.__doc__ = (
+    "ID of the mission pad detected before, or -1 if none"
+)
+MissionPadEvent.state.__doc__ = "The :class:`tello_asyncio.types.TelloState` with the change"
+
+
+PositionEstimate = namedtuple("PositionEstimate", "position velocity covariance time")
+PositionEstimate.position.__doc__ = "Estimated position :class:`tello_asyncio.types.Vector` in cm"
+PositionEstimate.velocity.__doc__ = "Estimated velocity :class:`tello_asyncio.types.Vector` in cm/s"
+PositionEstimate.covariance.__doc__ = (
+    "NumPy array of shape (3, 2, 2) with the position and velocity covariance of each axis"
+)
+PositionEstimate.time.__doc__ = "Monotonic time in seconds of the last state used"
+
+EstimatorStats = namedtuple("EstimatorStats", "updates mean_update_time max_update_time")
+EstimatorStats.updates.__doc__ = "Number of states used"
+EstimatorStats.mean_update_time.__doc__ = "Mean time in seconds taken to use a state"
+EstimatorStats.max_update_time.__doc__ = "Longest time in seconds taken to use a state"
+
+
+TelloResponse = namedtuple("TelloResponse", "command message sent_at received_at")
+TelloResponse.command.__doc__ = "The command sent"
+TelloResponse.message.__doc__ = "The response message from the drone"
+TelloResponse.sent_at.__doc__ = "Host monotonic time in seconds when the command was sent"
+TelloResponse.received_at.__doc__ = (
+    "Host monotonic time in seconds when the response arrived"
+)
+
+VideoFrameInfo = namedtuple(
+    "VideoFrameInfo", "first_received_at received_at size chunks is_keyframe nal_types"
+)
+VideoFrameInfo.__new__.__defaults__ = (None, None)
+VideoFrameInfo.first_received_at.__doc__ = (
+    "Host monotonic time in seconds when the first chunk of the frame arrived"
+)
+VideoFrameInfo.received_at.__doc__ = (
+    "Host monotonic time in seconds when the last chunk of the frame arrived"
+)
+VideoFrameInfo.size.__doc__ = "Frame size in bytes"
+VideoFrameInfo.chunks.__doc__ = "Number of UDP packets the frame arrived in"
+VideoFrameInfo.is_keyframe.__doc__ = (
+    "Whether the frame has an IDR slice, if reassembling access units"
+)
+VideoFrameInfo.nal_types.__doc__ = (
+    "Types of the NAL units in the frame, in order, if reassembling access units"
+)
+
+ReassemblyStats = namedtuple(
+    "ReassemblyStats",
+    "frames split_frames dropped_frames dropped_chunks truncated_frames",
+)
+ReassemblyStats.frames.__doc__ = "Number of access units passed on"
+ReassemblyStats.split_frames.__doc__ = (
+    "Number of access units found inside a run of chunks without a short last chunk"
+)
+ReassemblyStats.dropped_frames.__doc__ = "Number of incomplete access units dropped"
+ReassemblyStats.dropped_chunks.__doc__ = (
+    "Number of chunks dropped while resynchronising after lost or truncated data"
+)
+ReassemblyStats.truncated_frames.__doc__ = (
+    "Number of frames dropped for exceeding the size or chunk limits"
+)
+
+ClockAlignment = namedtuple(
+    "ClockAlignment", "offset uncertainty ticks extra_delay latency"
+)
+ClockAlignment.offset.__doc__ = (
+    "Host monotonic time in seconds at which the motor time would have been zero, including the minimum delay"
+)
+ClockAlignment.uncertainty.__doc__ = "Uncertainty in seconds of the offset"
+ClockAlignment.ticks.__doc__ = "Number of motor time ticks seen"
+ClockAlignment.extra_delay.__doc__ = (
+    "Delay in seconds of the latest state message beyond the minimum"
+)
+ClockAlignment.latency.__doc__ = (
+    "Estimated telemetry latency in seconds, if the minimum delay is known"
+)
+
+
+ReceiverStats = namedtuple(
+    "ReceiverStats", "wakeups packets bytes mean_batch max_batch full_batches"
+)
+ReceiverStats.wakeups.__doc__ = "Number of times the socket was read"
+ReceiverStats.packets.__doc__ = "Number of datagrams received"
+ReceiverStats.bytes.__doc__ = "Number of bytes received"
+ReceiverStats.mean_batch.__doc__ = "Mean number of datagrams read per wakeup"
+ReceiverStats.max_batch.__doc__ = "Most datagrams read in one wakeup"
+ReceiverStats.full_batches.__doc__ = (
+    "Number of wakeups that filled every buffer, leaving datagrams for the next one"
+)
+
+
+DecodedFrame = namedtuple("DecodedFrame", "image info decoded_at")
+DecodedFrame.image.__doc__ = (
+    "NumPy array of the picture, shape (height, width, 3) for RGB and BGR, or (height * 3 / 2, width) for YUV"
+)
+DecodedFrame.info.__doc__ = (
+    "The :class:`tello_asyncio.types.VideoFrameInfo` of the frame it was decoded from"
+)
+DecodedFrame.decoded_at.__doc__ = (
+    "Host monotonic time in seconds when decoding finished"
+)
+
+DecoderStats = namedtuple(
+    "DecoderStats",
+    "submitted decoded delivered late_frames dropped_frames errors mean_decode_time max_decode_time time_to_first_frame",
+)
+DecoderStats.submitted.__doc__ = "Number of frames submitted for decoding"
+DecoderStats.decoded.__doc__ = "Number of pictures decoded"
+DecoderStats.delivered.__doc__ = "Number of pictures converted and passed on"
+DecoderStats.late_frames.__doc__ = (
+    "Number of pictures decoded but not passed on because they were late"
+)
+DecoderStats.dropped_frames.__doc__ = (
+    "Number of frames dropped undecoded because the decoder fell behind"
+)
+DecoderStats.errors.__doc__ = "Number of frames the decoder failed on"
+DecoderStats.mean_decode_time.__doc__ = (
+    "Mean time in seconds taken to decode and convert a frame"
+)
+DecoderStats.max_decode_time.__doc__ = (
+    "Longest time in seconds taken to decode and convert a frame"
+)
+DecoderStats.time_to_first_frame.__doc__ = (
+    "Time in seconds from starting the decoder to passing on its first picture"
+)
+
+SharedFrame = namedtuple("SharedFrame", "sequence received_at shape data lock")
+SharedFrame.sequence.__doc__ = "Sequence number of the frame, counting from 1"
+SharedFrame.received_at.__doc__ = (
+    "Host monotonic time in seconds when the frame was received"
+)
+SharedFrame.shape.__doc__ = "Shape of the array the frame was written from, or () if raw data"
+SharedFrame.data.__doc__ = (
+    "The frame data, a read-only view of shared memory unless copied, and a NumPy array if written from one"
+)
+SharedFrame.lock.__doc__ = (
+    "Seqlock count of the frame's slot when it was read, to check it is still valid"
+)
+
+RecorderStats = namedtuple(
+    "RecorderStats",
+    "frames bytes segments dropped_frames skipped_frames queued mean_write_latency max_write_latency",
+)
+RecorderStats.frames.__doc__ = "Number of frames written"
+RecorderStats.bytes.__doc__ = "Number of bytes written"
+RecorderStats.segments.__doc__ = "Number of segment files started"
+RecorderStats.dropped_frames.__doc__ = (
+    "Number of frames dropped because the writer fell behind, up to the next keyframe"
+)
+RecorderStats.skipped_frames.__doc__ = (
+    "Number of frames skipped before the first keyframe"
+)
+RecorderStats.queued.__doc__ = "Number of frames waiting to be written"
+RecorderStats.mean_write_latency.__doc__ = (
+    "Mean time in seconds from a frame being queued to being written"
+)
+RecorderStats.max_write_latency.__doc__ = (
+    "Longest time in seconds from a frame being queued to being written"
+)
+
+RelayStats = namedtuple("RelayStats", "sent bytes dropped queued")
+RelayStats.sent.__doc__ = "Number of datagrams sent"
+RelayStats.bytes.__doc__ = "Number of bytes sent"
+RelayStats.dropped.__doc__ = (
+    "Number of datagrams dropped because the send queue was full or sending failed"
+)
+RelayStats.queued.__doc__ = "Number of datagrams waiting to be sent"
+
+VideoStats = namedtuple(
+    "VideoStats",
+    "frames chunks bytes fps jitter bitrate mean_bitrate chunks_per_frame keyframes keyframe_interval incomplete_frames dropped_frames dropped_chunks frame_size_buckets",
+)
+VideoStats.frames.__doc__ = "Number of frames received"
+VideoStats.chunks.__doc__ = "Number of video datagrams received"
+VideoStats.bytes.__doc__ = "Number of bytes of video received"
+VideoStats.fps.__doc__ = "Smoothed number of frames per second"
+VideoStats.jitter.__doc__ = (
+    "Smoothed variation in seconds of the time between frames"
+)
+VideoStats.bitrate.__doc__ = "Bits per second received in the last whole second"
+VideoStats.mean_bitrate.__doc__ = (
+    "Mean bits per second received over the rolling window"
+)
+VideoStats.chunks_per_frame.__doc__ = (
+    "Mean number of datagrams per frame over the rolling window"
+)
+VideoStats.keyframes.__doc__ = "Number of keyframes received"
+VideoStats.keyframe_interval.__doc__ = (
+    "Smoothed time in seconds between keyframes"
+)
+VideoStats.incomplete_frames.__doc__ = (
+    "Number of frames passed on without a start code, ie missing their first chunk"
+)
+VideoStats.dropped_frames.__doc__ = (
+    "Number of frames dropped in reassembly as incomplete or too big"
+)
+VideoStats.dropped_chunks.__doc__ = (
+    "Number of datagrams dropped in reassembly while resynchronising"
+)
+VideoStats.frame_size_buckets.__doc__ = (
+    "Counts of frames in each of :data:`tello_asyncio.metrics.FRAME_SIZE_BUCKETS`"
+)
 
 
 class Direction(Enum):
@@ -66,3 +375,21 @@ class VideoResolution(Enum):
 class ControllerHardware(Enum):
     TELLO = "TELLO"
     OPEN_SOURCE = "RMTT"
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    CONFLATE = "conflate"
+
+
+class MissionPadEventKind(Enum):
+    ACQUIRED = "acquired"
+    LOST = "lost"
+    CHANGED = "changed"
+
+
+class PixelFormat(Enum):
+    RGB = "rgb24"
+    BGR = "bgr24"
+    YUV = "yuv420p"
@@ -1,3 +1,26 @@
+import logging
+from time import monotonic
+
+from .types import VideoFrameInfo, ReassemblyStats
+from .trace import TRACE, FRAME, ERROR
+from .receiver import BatchedReceiver
+from .metrics import VideoMeter
+from .h264 import (
+    START_CODE,
+    NAL_SLICE,
+    NAL_IDR_SLICE,
+    NAL_SPS,
+    NAL_PPS,
+    ACCESS_UNIT_PREFIX_TYPES,
+    KEYFRAME_START_TYPES,
+    nal_type,
+    is_slice,
+    is_first_slice,
+    first_nal_type,
+    nal_units,
+    has_idr_slice,
+)
+
 VIDEO_UDP_PORT = 11111
 VIDEO_URL = f"udp://0.0.0.0:{VIDEO_UDP_PORT}"
 
@@ -6,44 +29,670 @@ VIDEO_HEIGHT = 720
 
 MAX_CHUNK_SIZE = 1460
 
+INITIAL_FRAME_BUFFER_SIZE = 64 * 1024
+
+# limits on a frame being reassembled, well above the largest 720p keyframes
+DEFAULT_MAX_FRAME_SIZE = 512 * 1024
+DEFAULT_MAX_FRAME_CHUNKS = 400
+
+# limits on the frames kept since the last keyframe, a few seconds of video
+DEFAULT_MAX_CACHED_FRAMES = 150
+DEFAULT_MAX_CACHED_SIZE = 2 * 1024 * 1024
+
+
+class FrameBuffer:
+    """
+    Reusable buffer video frames are reassembled in, copying each chunk in
+    once, and growing as needed for large frames, up to a maximum size.
+
+    There are two buffers, swapped on each reset, so a frame passed on as a
+    view stays valid while the next frame is reassembled.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_view",
+        "_spare",
+        "capacity",
+        "max_size",
+        "start",
+        "length",
+        "chunks",
+    )
+
+    def __init__(self, size=INITIAL_FRAME_BUFFER_SIZE, max_size=None):
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._spare = bytearray(size)
+        self.capacity = size
+        self.max_size = max_size
+        self.start = 0
+        self.length = 0
+        self.chunks = 0
+
+    def append(self, data):
+        end = self.length + len(data)
+        if end > self.capacity:
+            self._grow(end)
+            end = self.length + len(data)
+        self._view[self.length : end] = data
+        self.length = end
+        self.chunks += 1
+
+    def _grow(self, size):
+        # a new buffer rather than resizing, since views of the old one may
+        # still be in use, keeping only the frame in progress at its start
+        start = self.start
+        needed = size - start
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        if self.max_size:
+            capacity = max(needed, min(capacity, self.max_size))
+        buffer = bytearray(capacity)
+        length = self.length - start
+        buffer[:length] = self._view[start : self.length]
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self.capacity = capacity
+        self.start = 0
+        self.length = length
+
+    def frame(self):
+        """
+        Read-only view of the frame so far.
+        """
+        return _readonly(self._view[self.start : self.length])
+
+    def split(self, position):
+        """
+        Ends the frame before a position in the buffer, and starts the next
+        one there.
+
+        :return: Read-only view of the frame
+        """
+        frame = _readonly(self._view[self.start : position])
+        self.start = position
+        self.chunks = 1
+        return frame
+
+    def reset(self):
+        """
+        Starts the next frame in the other buffer, leaving the last frame
+        intact until the one after.
+        """
+        spare = self._spare
+        self._spare = self._buffer
+        self._buffer = spare
+        self._view = memoryview(spare)
+        self.capacity = len(spare)
+        self.start = 0
+        self.length = 0
+        self.chunks = 0
+
+    def discard(self):
+        """
+        Drops the frame in progress, leaving the frames before it intact.
+        """
+        self.length = self.start
+        self.chunks = 0
+
+
+class AccessUnitAssembler:
+    """
+    Reassembles video frames as H.264 access units, scanning for Annex B
+    start codes and NAL unit types as chunks arrive, rather than relying on
+    the last chunk of each frame being short.
+
+    - An access unit ends at a short chunk once it has a slice, so parameter
+      sets sent on their own are kept for the following keyframe.
+    - A new access unit is also started at an access unit delimiter, SEI,
+      SPS or PPS, or the first slice of a picture, after a slice, which
+      splits frames merged because one was an exact multiple of
+      :data:`MAX_CHUNK_SIZE` or its short last chunk was lost.
+    - A chunk after a short one must start with a start code.  If not, the
+      start of a NAL unit was lost, so the access unit being assembled is
+      dropped, along with chunks up to the next one starting with a start
+      code, instead of passing corrupt data to the decoder.
+    - An access unit that grows beyond the size or chunk limits is truncated,
+      ie dropped, and reassembly resynchronises in the same way.
+
+    :param on_access_unit: Called with each access unit's data and :class:`tello_asyncio.types.VideoFrameInfo`
+    :type on_access_unit: Callable
+    :param copy: Pass on access units as `bytes` copies, defaults to read-only `memoryview` objects valid until the next one
+    :param trace: Trace channel for video events
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    :param max_frame_size: Largest access unit in bytes
+    :param max_frame_chunks: Most chunks in an access unit
+    :param resync_at_keyframe: Only resynchronise at the start of a keyframe, rather than any NAL unit, defaults to `False`
+    """
+
+    def __init__(
+        self,
+        on_access_unit,
+        copy=False,
+        trace=None,
+        max_frame_size=DEFAULT_MAX_FRAME_SIZE,
+        max_frame_chunks=DEFAULT_MAX_FRAME_CHUNKS,
+        resync_at_keyframe=False,
+    ):
+        self._on_access_unit = on_access_unit
+        self._copy = copy
+        self._trace = trace
+        self._max_frame_size = max_frame_size
+        self._max_frame_chunks = max_frame_chunks
+        self._resync_at_keyframe = resync_at_keyframe
+        self._frame = FrameBuffer(
+            min(INITIAL_FRAME_BUFFER_SIZE, max_frame_size), max_frame_size
+        )
+        self._scan = 0
+        self._nal_types = []
+        self._has_slice = False
+        self._keyframe = False
+        self._first_received_at = None
+        self._at_boundary = True
+        self._skipping = False
+
+        self.frames = 0
+        self.split_frames = 0
+        self.dropped_frames = 0
+        self.dropped_chunks = 0
+        self.truncated_frames = 0
+
+    def add(self, data, received_at):
+        """
+        Adds a chunk of video data.
+        """
+        size = len(data)
+        short = size != MAX_CHUNK_SIZE
+        frame = self._frame
+        if self._skipping:
+            if _is_resync_point(data, self._resync_at_keyframe):
+                self._skipping = False
+        elif self._at_boundary and first_nal_type(data) is None:
+            # the start of this NAL unit was lost
+            if self._has_slice:
+                self.dropped_frames += 1
+            self._skipping = True
+            self._drop("NAL unit start lost")
+        elif (
+            frame.length + size - frame.start > self._max_frame_size
+            or frame.chunks >= self._max_frame_chunks
+        ):
+            self.truncated_frames += 1
+            self._drop("too big")
+            self._skipping = not _is_resync_point(data, self._resync_at_keyframe)
+        self._at_boundary = short
+        if self._skipping:
+            self.dropped_chunks += 1
+            return
+
+        if frame.length == frame.start:
+            self._first_received_at = received_at
+        start = frame.start
+        frame.append(data)
+        if frame.start != start:
+            # moved to a new buffer
+            self._scan = max(0, self._scan - start)
+        self._scan_nal_units(received_at)
+
+        if short and self._has_slice:
+            self._emit(frame.frame(), frame.chunks, received_at)
+            frame.reset()
+            self._scan = 0
+
+    def _scan_nal_units(self, received_at):
+        frame = self._frame
+        buffer = frame._buffer
+        end = frame.length
+        position = max(self._scan, frame.start)
+        while True:
+            i = buffer.find(START_CODE, position, end)
+            if i < 0 or i + 4 >= end:
+                # a start code or header may continue in the next chunk
+                self._scan = max(position, end - 2) if i < 0 else i
+                return
+
+            t = nal_type(buffer[i + 3])
+            coded_slice = is_slice(t)
+            if self._has_slice and (
+                t in ACCESS_UNIT_PREFIX_TYPES
+                or (coded_slice and is_first_slice(buffer[i + 4]))
+            ):
+                # include the leading zero of a four byte start code
+                start = i - 1 if i > frame.start and buffer[i - 1] == 0 else i
+                self.split_frames += 1
+                chunks = frame.chunks
+                self._emit(frame.split(start), chunks, received_at)
+                self._first_received_at = received_at
+
+            self._nal_types.append(t)
+            if coded_slice:
+                self._has_slice = True
+                if t == NAL_IDR_SLICE:
+                    self._keyframe = True
+            position = i + 3
+
+    def _emit(self, data, chunks, received_at):
+        info = VideoFrameInfo(
+            self._first_received_at,
+            received_at,
+            len(data),
+            chunks,
+            self._keyframe,
+            tuple(self._nal_types),
+        )
+        self._nal_types = []
+        self._has_slice = False
+        self._keyframe = False
+        self.frames += 1
+
+        trace = self._trace
+        if trace and trace.trace:
+            trace.event(
+                TRACE,
+                FRAME,
+                f"{info.size} bytes in {chunks} chunks, NAL units {info.nal_types}",
+            )
+        self._on_access_unit(bytes(data) if self._copy else data, info)
+
+    def _drop(self, reason):
+        frame = self._frame
+        if frame.length > frame.start:
+            trace = self._trace
+            if trace and trace.debug:
+                trace.event(
+                    logging.DEBUG,
+                    FRAME,
+                    f"dropped {frame.length - frame.start} bytes: {reason}",
+                )
+        frame.discard()
+        self._scan = 0
+        self._nal_types = []
+        self._has_slice = False
+        self._keyframe = False
+
+    def stats(self):
+        """
+        Counts of access units passed on, split and dropped.
+
+        :rtype: :class:`tello_asyncio.types.ReassemblyStats`
+        """
+        return ReassemblyStats(
+            self.frames,
+            self.split_frames,
+            self.dropped_frames,
+            self.dropped_chunks,
+            self.truncated_frames,
+        )
+
+
+class KeyframeCache:
+    """
+    Keeps the latest SPS and PPS parameter sets, and the frames since the
+    last keyframe, so that a consumer starting mid-stream can be given a
+    decodable start straight away instead of waiting for the next keyframe.
+
+    The catch up data is the parameter sets followed by the keyframe and
+    every frame since, so the consumer's decoder has all the reference
+    frames the next live frame needs.  If more frames than the limits have
+    arrived since the keyframe there is no catch up until the next one.
+
+    :param max_frames: Most frames kept since the keyframe
+    :param max_size: Most bytes kept since the keyframe
+    """
+
+    def __init__(
+        self, max_frames=DEFAULT_MAX_CACHED_FRAMES, max_size=DEFAULT_MAX_CACHED_SIZE
+    ):
+        self._max_frames = max_frames
+        self._max_size = max_size
+        self._parameter_sets = {}
+        self._frames = []
+        self._size = 0
+        self._chunks = 0
+        self._keyframe_received_at = None
+        self._received_at = None
+
+    def update(self, data, info):
+        """
+        Adds a frame.
+
+        :param data: The frame data
+        :type data: `bytes`
+        :param info: :class:`tello_asyncio.types.VideoFrameInfo` of the frame
+        """
+        keyframe = False
+        if info.nal_types is not None:
+            types = info.nal_types
+            keyframe = info.is_keyframe
+            if NAL_SPS in types or NAL_PPS in types:
+                self._update_parameter_sets(data)
+        elif first_nal_type(data) != NAL_SLICE:
+            keyframe = self._update_parameter_sets(data)
+
+        if keyframe:
+            self._frames = [data]
+            self._size = len(data)
+            self._chunks = info.chunks
+            self._keyframe_received_at = info.first_received_at
+            self._received_at = info.received_at
+        elif self._frames:
+            if (
+                len(self._frames) >= self._max_frames
+                or self._size + len(data) > self._max_size
+            ):
+                self.reset()
+                return
+            self._frames.append(data)
+            self._size += len(data)
+            self._chunks += info.chunks
+            self._received_at = info.received_at
+
+    def _update_parameter_sets(self, data):
+        # caches any parameter sets, and returns whether there is an IDR slice
+        keyframe = False
+        for t, start, end in nal_units(data):
+            if t == NAL_SPS or t == NAL_PPS:
+                self._parameter_sets[t] = data[start:end]
+            elif t == NAL_IDR_SLICE:
+                keyframe = True
+        return keyframe
+
+    def catch_up(self):
+        """
+        The data to start a consumer with, if there is a keyframe and its
+        parameter sets.
+
+        :return: The data and its :class:`tello_asyncio.types.VideoFrameInfo`, or `None`
+        :rtype: tuple
+        """
+        parameter_sets = self._parameter_sets
+        if (
+            not self._frames
+            or NAL_SPS not in parameter_sets
+            or NAL_PPS not in parameter_sets
+        ):
+            return None
+        data = b"".join(
+            [parameter_sets[NAL_SPS], parameter_sets[NAL_PPS]] + self._frames
+        )
+        info = VideoFrameInfo(
+            self._keyframe_received_at,
+            self._received_at,
+            len(data),
+            self._chunks,
+            True,
+        )
+        return data, info
+
+    def reset(self):
+        """
+        Forgets the frames kept, keeping the parameter sets.
+        """
+        self._frames = []
+        self._size = 0
+        self._chunks = 0
+
+
+def _is_resync_point(data, keyframe):
+    # whether reassembly can start again at a chunk after data has been lost
+    t = first_nal_type(data)
+    if t is None:
+        return False
+    return not keyframe or t in KEYFRAME_START_TYPES
+
+
+def _readonly(view):
+    try:
+        return view.toreadonly()
+    except AttributeError:  # before Python 3.8
+        return view
+
 
 class TelloVideoListener:
     """
     Connects to the drone's video data stream and reassembles h.264 encoded
     frames from UDP packet chunks before passing them on.
+
+    Frames are reassembled in a reusable :class:`tello_asyncio.video.FrameBuffer`
+    and passed on as read-only `memoryview` objects, which are only valid
+    until the next frame arrives.  Set `copy` to pass on `bytes` instead, for
+    consumers that keep frames.
+
+    :param trace: Trace channel for video events
+    :type trace: :class:`tello_asyncio.trace.TraceChannel`, optional
+    :param batched: Receive with a :class:`tello_asyncio.receiver.BatchedReceiver` instead of a datagram protocol, defaults to `False`
+    :param copy: Pass on frames and chunks as `bytes` copies, defaults to `False`
+    :param access_units: Reassemble frames with an :class:`tello_asyncio.video.AccessUnitAssembler`, defaults to `False`
+    :param max_frame_size: Largest frame in bytes, beyond which it is dropped and reassembly resynchronises
+    :param max_frame_chunks: Most chunks in a frame
+    :param resync_at_keyframe: After dropping data, only resynchronise at the start of a keyframe, defaults to `False`
     """
 
     _transport = None
+    _receiver = None
+    _protocol = None
 
     class Protocol:
         def connection_made(self, transport):
-            self._chunks = []
+            self._frame = FrameBuffer(
+                min(INITIAL_FRAME_BUFFER_SIZE, self.max_frame_size),
+                self.max_frame_size,
+            )
+            self._first_received_at = None
+            self._at_boundary = True
+            self._resyncing = False
+            self.frames = 0
+            self.truncated_frames = 0
+            self.dropped_chunks = 0
+
+        trace = None
+        copy = False
+        assembler = None
+        max_frame_size = DEFAULT_MAX_FRAME_SIZE
+        max_frame_chunks = DEFAULT_MAX_FRAME_CHUNKS
+        resync_at_keyframe = False
 
         def datagram_received(self, data, addr):
-            self.on_video_frame_chunk_received(data)
-            self._chunks.append(data)
-            if len(data) != MAX_CHUNK_SIZE:
-                frame = b"".join(self._chunks)
-                self._chunks = []
-                self.on_frame_received(frame)
+            self.handle_datagram(data, monotonic())
+
+        def handle_datagram(self, data, received_at):
+            copy = self.copy
+            if copy and type(data) is not bytes:
+                self.on_video_frame_chunk_received(bytes(data), received_at)
+            else:
+                self.on_video_frame_chunk_received(data, received_at)
+
+            if self.assembler is not None:
+                self.assembler.add(data, received_at)
+                return
+
+            frame = self._frame
+            size = len(data)
+            at_boundary = self._at_boundary
+            self._at_boundary = size != MAX_CHUNK_SIZE
+            if frame.length and (
+                frame.length + size > self.max_frame_size
+                or frame.chunks >= self.max_frame_chunks
+            ):
+                # too big, probably frames merged by lost short chunks
+                self._truncate(frame)
+                self._resyncing = True
+            if self._resyncing:
+                if at_boundary and _is_resync_point(data, self.resync_at_keyframe):
+                    self._resyncing = False
+                else:
+                    self.dropped_chunks += 1
+                    return
+
+            # FrameBuffer.append inlined, since this runs for every chunk
+            start = frame.length
+            if not start:
+                self._first_received_at = received_at
+            end = start + size
+            if end > frame.capacity:
+                frame._grow(end)
+            frame._view[start:end] = data
+            frame.length = end
+            frame.chunks += 1
+            if size != MAX_CHUNK_SIZE:
+                size = frame.length
+                chunks = frame.chunks
+                trace = self.trace
+                if trace and trace.trace:
+                    trace.event(TRACE, FRAME, f"{size} bytes in {chunks} chunks")
+                info = VideoFrameInfo(
+                    self._first_received_at, received_at, size, chunks
+                )
+                data = frame.frame()
+                frame.reset()
+                self.frames += 1
+                self.on_frame_received(bytes(data) if copy else data, info)
+
+        def _truncate(self, frame):
+            trace = self.trace
+            if trace and trace.debug:
+                trace.event(
+                    logging.DEBUG,
+                    FRAME,
+                    f"dropped {frame.length} bytes in {frame.chunks} chunks: too big",
+                )
+            frame.discard()
+            self.truncated_frames += 1
+
+        def stats(self):
+            """
+            Counts of frames passed on and dropped.
+
+            :rtype: :class:`tello_asyncio.types.ReassemblyStats`
+            """
+            if self.assembler is not None:
+                return self.assembler.stats()
+            return ReassemblyStats(
+                self.frames, 0, 0, self.dropped_chunks, self.truncated_frames
+            )
 
         def error_received(self, error):
-            print("[video] PROTOCOL ERROR", error)
+            trace = self.trace
+            if trace and trace.warning:
+                trace.event(logging.WARNING, ERROR, f"PROTOCOL ERROR {error}")
 
         def connection_lost(self, error):
             pass
 
+    def __init__(
+        self,
+        trace=None,
+        batched=False,
+        copy=False,
+        access_units=False,
+        max_frame_size=DEFAULT_MAX_FRAME_SIZE,
+        max_frame_chunks=DEFAULT_MAX_FRAME_CHUNKS,
+        resync_at_keyframe=False,
+    ):
+        self._trace = trace
+        self._batched = batched
+        self._copy = copy
+        self._access_units = access_units
+        self._max_frame_size = max_frame_size
+        self._max_frame_chunks = max_frame_chunks
+        self._resync_at_keyframe = resync_at_keyframe
+        self._meter = VideoMeter()
+
+    def _create_protocol(self):
+        protocol = TelloVideoListener.Protocol()
+        protocol.trace = self._trace
+        protocol.copy = self._copy
+        protocol.max_frame_size = self._max_frame_size
+        protocol.max_frame_chunks = self._max_frame_chunks
+        protocol.resync_at_keyframe = self._resync_at_keyframe
+        return protocol
+
     async def connect(
         self, loop, on_video_frame_chunk_received, on_video_frame_received
     ):
-        transport, protocol = await loop.create_datagram_endpoint(
-            TelloVideoListener.Protocol, local_addr=("0.0.0.0", VIDEO_UDP_PORT)
-        )
-        self._transport = transport
-        protocol.on_video_frame_chunk_received = on_video_frame_chunk_received
-        protocol.on_frame_received = on_video_frame_received
+        if self._batched:
+            protocol = self._create_protocol()
+            protocol.connection_made(None)
+            self._receiver = BatchedReceiver(
+                lambda data, addr, received_at: protocol.handle_datagram(
+                    data, received_at
+                ),
+                trace=self._trace,
+            )
+            self._receiver.open(loop, VIDEO_UDP_PORT)
+        else:
+            transport, protocol = await loop.create_datagram_endpoint(
+                self._create_protocol, local_addr=("0.0.0.0", VIDEO_UDP_PORT)
+            )
+            self._transport = transport
+        if self._access_units:
+            protocol.assembler = AccessUnitAssembler(
+                on_video_frame_received,
+                self._copy,
+                self._trace,
+                self._max_frame_size,
+                self._max_frame_chunks,
+                self._resync_at_keyframe,
+            )
+        self._protocol = protocol
+        meter = self._meter
+
+        def on_chunk(data, received_at):
+            meter.add_chunk(len(data))
+            on_video_frame_chunk_received(data, received_at)
+
+        def on_frame(data, info):
+            if info.is_keyframe is not None:
+                keyframe = info.is_keyframe
+                complete = True
+            else:
+                keyframe = has_idr_slice(data)
+                complete = first_nal_type(data) is not None
+            received_at = info.received_at
+            if received_at is None:
+                received_at = monotonic()
+            meter.add_frame(info.size, received_at, keyframe, complete)
+            on_video_frame_received(data, info)
+
+        protocol.on_video_frame_chunk_received = on_chunk
+        protocol.on_frame_received = on_frame
+        if protocol.assembler is not None:
+            protocol.assembler._on_access_unit = on_frame
+
+    @property
+    def receive_stats(self):
+        """
+        Datagrams received per wakeup, if batched.
+
+        :rtype: :class:`tello_asyncio.types.ReceiverStats`
+        """
+        return self._receiver.stats() if self._receiver else None
+
+    def stats(self):
+        """
+        Frame rate, bitrate, chunks per frame, losses, keyframe interval and
+        frame sizes of the video received.
+
+        :rtype: :class:`tello_asyncio.types.VideoStats`
+        """
+        return self._meter.snapshot(monotonic(), self.reassembly_stats)
+
+    @property
+    def reassembly_stats(self):
+        """
+        Counts of frames passed on and dropped.
+
+        :rtype: :class:`tello_asyncio.types.ReassemblyStats`
+        """
+        protocol = self._protocol
+        return protocol.stats() if protocol else None
 
     async def disconnect(self):
+        if self._receiver:
+            self._receiver.close()
+            self._receiver = None
         if self._transport:
             self._transport.close()
             self._transport = None
@@ -0,0 +1,186 @@
+from .types import StateChange, MissionPadEvent, MissionPadEventKind, OverflowPolicy
+from .state import STATE_FIELD_SET
+from .subscription import Subscription, DEFAULT_SUBSCRIPTION_SIZE
+
+_NO_VALUE = object()
+
+
+class WatchGroup:
+    """
+    The subscriptions watching one state field with the same deadband, and
+    the last value they were told about.
+    """
+
+    __slots__ = ("field", "deadband", "value", "subscriptions")
+
+    def __init__(self, field, deadband, value=_NO_VALUE):
+        self.field = field
+        self.deadband = deadband
+        self.value = value
+        self.subscriptions = []
+
+    def update(self, value):
+        """
+        Compares a new value with the last one reported, and makes it the
+        reference value if it has changed by more than the deadband.
+
+        :return: `True` if the value has changed
+        """
+        previous = self.value
+        if previous is _NO_VALUE:
+            self.value = value
+            return False
+        if not _changed(previous, value, self.deadband):
+            return False
+        self.value = value
+        return True
+
+
+def _changed(previous, value, deadband):
+    if deadband == 0 or previous is None or value is None:
+        return previous != value
+    if isinstance(value, tuple):
+        for p, v in zip(previous, value):
+            if (p is None) != (v is None):
+                return True
+            if p is not None and abs(v - p) > deadband:
+                return True
+        return False
+    return abs(value - previous) > deadband
+
+
+def _has_mission_pad(mission_pad):
+    # -1 when no pad is detected, -2 when detection is off
+    return mission_pad is not None and mission_pad > 0
+
+
+class StateWatcher:
+    """
+    Compares each new drone state with the previous values once, and only
+    wakes the subscriptions watching fields that have changed.
+
+    Subscriptions to the same field with the same deadband share one
+    comparison.  A field has changed when it differs from the last value
+    reported by more than the deadband, so slow drift still gets reported
+    once it adds up.  Vectors and ranges have changed when any of their
+    values has.
+    """
+
+    def __init__(self):
+        self._groups = {}
+        self._group_list = []
+        self._subscriptions = {}
+        self._mission_pad_subscriptions = []
+        self._state = None
+
+    def watch(
+        self,
+        fields,
+        deadband=0,
+        maxsize=DEFAULT_SUBSCRIPTION_SIZE,
+        overflow=OverflowPolicy.DROP_OLDEST,
+    ):
+        """
+        Start watching state fields for changes.
+
+        :param fields: Names of :class:`tello_asyncio.types.TelloState` fields, eg `"height"` or `("battery", "mission_pad")`
+        :type fields: str or Iterable of str
+        :param deadband: Change needed to count, in the field's units, or a dict of them by field name
+        :type deadband: number or dict
+        :rtype: :class:`tello_asyncio.subscription.Subscription` of :class:`tello_asyncio.types.StateChange`
+        """
+        if isinstance(fields, str):
+            fields = (fields,)
+        groups = []
+        for field in fields:
+            if field not in STATE_FIELD_SET or field == "raw":
+                raise ValueError(f"cannot watch state field {field!r}")
+            d = deadband.get(field, 0) if isinstance(deadband, dict) else deadband
+            if d < 0:
+                raise ValueError(f"deadband must not be negative, not {d}")
+            groups.append(self._group(field, d))
+
+        subscription = Subscription(self, maxsize, overflow)
+        for group in groups:
+            group.subscriptions.append(subscription)
+        self._subscriptions[subscription] = groups
+        return subscription
+
+    def watch_mission_pad(
+        self, maxsize=DEFAULT_SUBSCRIPTION_SIZE, overflow=OverflowPolicy.DROP_OLDEST
+    ):
+        """
+        Start watching for mission pads being acquired, lost or changed.
+
+        :rtype: :class:`tello_asyncio.subscription.Subscription` of :class:`tello_asyncio.types.MissionPadEvent`
+        """
+        subscription = Subscription(self, maxsize, overflow)
+        self._mission_pad_subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        groups = self._subscriptions.pop(subscription, None)
+        if groups is None:
+            try:
+                self._mission_pad_subscriptions.remove(subscription)
+            except ValueError:
+                pass
+            return
+        for group in groups:
+            group.subscriptions.remove(subscription)
+            if not group.subscriptions:
+                del self._groups[(group.field, group.deadband)]
+                self._group_list.remove(group)
+
+    def _group(self, field, deadband):
+        key = (field, deadband)
+        group = self._groups.get(key)
+        if group is None:
+            state = self._state
+            value = _NO_VALUE if state is None else getattr(state, field)
+            group = self._groups[key] = WatchGroup(field, deadband, value)
+            self._group_list.append(group)
+        return group
+
+    def update(self, state):
+        """
+        Passes on the changes in a new state to the subscriptions watching them.
+        """
+        previous = self._state
+        self._state = state
+
+        woken = None
+        for group in self._group_list:
+            if group.update(getattr(state, group.field)):
+                if woken is None:
+                    woken = {}
+                for subscription in group.subscriptions:
+                    changed = woken.get(subscription)
+                    if changed is None:
+                        woken[subscription] = [group.field]
+                    elif group.field not in changed:
+                        changed.append(group.field)
+        if woken:
+            for subscription, changed in woken.items():
+                subscription.put(StateChange(state, tuple(changed)))
+
+        if self._mission_pad_subscriptions and previous is not None:
+            event = _mission_pad_event(previous.mission_pad, state)
+            if event:
+                for subscription in self._mission_pad_subscriptions:
+                    subscription.put(event)
+
+
+def _mission_pad_event(previous, state):
+    mission_pad = state.mission_pad
+    if mission_pad == previous:
+        return None
+    had_pad = _has_mission_pad(previous)
+    has_pad = _has_mission_pad(mission_pad)
+    if has_pad:
+        kind = MissionPadEventKind.CHANGED if had_pad else MissionPadEventKind.ACQUIRED
+    elif had_pad:
+        kind = MissionPadEventKind.LOST
+    else:
+        return None
+    return MissionPadEvent(kind, mission_pad, previous, state)
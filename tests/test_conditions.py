@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from tello_asyncio import TelloState
+from tello_asyncio.conditions import ConditionIndex, ThresholdList, wait_for_condition
+
+
+def state(height, battery=80):
+    return TelloState(
+        "raw", 0, 0, 0, height, 1.5, battery, 10, 0, None, None, None, -1, None
+    )
+
+
+@pytest.mark.parametrize(
+    "op, threshold, satisfied, unsatisfied",
+    [
+        ("==", 100, [100], [99, 101]),
+        ("!=", 100, [99, 101], [100]),
+        ("<", 100, [99], [100, 101]),
+        ("<=", 100, [99, 100], [101]),
+        (">", 100, [101], [99, 100]),
+        (">=", 100, [100, 101], [99]),
+    ],
+)
+def test_operators(run, op, threshold, satisfied, unsatisfied):
+    async def main():
+        for value in satisfied:
+            index = ConditionIndex(asyncio.get_event_loop())
+            future = index.add(("height", op, threshold))
+            index.update(state(value))
+            assert future.done(), (op, value)
+            assert future.result().height == value
+        for value in unsatisfied:
+            index = ConditionIndex(asyncio.get_event_loop())
+            future = index.add(("height", op, threshold))
+            index.update(state(value))
+            assert not future.done(), (op, value)
+
+    run(main())
+
+
+def test_already_satisfied_condition_resolves_at_once(run):
+    async def main():
+        index = ConditionIndex(asyncio.get_event_loop())
+        index.update(state(150))
+        future = index.add(("height", ">", 100))
+        assert future.result().height == 150
+
+    run(main())
+
+
+def test_only_satisfied_thresholds_resolved(run):
+    async def main():
+        index = ConditionIndex(asyncio.get_event_loop())
+        low = index.add(("height", ">", 50))
+        high = index.add(("height", ">", 150))
+        index.update(state(100))
+        assert low.done()
+        assert not high.done()
+        index.update(state(200))
+        assert high.done()
+        assert not index._fields
+
+    run(main())
+
+
+def test_unchanged_field_not_rechecked(run):
+    async def main():
+        index = ConditionIndex(asyncio.get_event_loop())
+        index.update(state(100))
+        future = index.add(("height", "!=", 100))
+        index.update(state(100, battery=79))
+        assert not future.done()
+
+    run(main())
+
+
+def test_predicates(run):
+    async def main():
+        index = ConditionIndex(asyncio.get_event_loop())
+        future = index.add(lambda s: s.battery < 50)
+        index.update(state(100, battery=60))
+        assert not future.done()
+        index.update(state(100, battery=40))
+        assert future.result().battery == 40
+
+        index = ConditionIndex(asyncio.get_event_loop())
+        failing = index.add(lambda s: 1 / 0)
+        index.update(state(100))
+        assert isinstance(failing.exception(), ZeroDivisionError)
+
+    run(main())
+
+
+def test_invalid_conditions(run):
+    async def main():
+        index = ConditionIndex(asyncio.get_event_loop())
+        with pytest.raises(ValueError):
+            index.add(("altitude", ">", 1))
+        with pytest.raises(ValueError):
+            index.add(("raw", "==", ""))
+        with pytest.raises(ValueError):
+            index.add(("height", "=>", 1))
+
+    run(main())
+
+
+def test_timed_out_condition_removed(run):
+    async def main():
+        index = ConditionIndex(asyncio.get_event_loop())
+        with pytest.raises(asyncio.TimeoutError):
+            await wait_for_condition(index, ("height", ">", 100), 0.01)
+        assert not index._fields
+
+    run(main())
+
+
+def test_threshold_list_keeps_order_and_removes_by_identity():
+    thresholds = ThresholdList()
+    a, b, c = object(), object(), object()
+    thresholds.add(20, a)
+    thresholds.add(10, b)
+    thresholds.add(20, c)
+    assert thresholds.thresholds == [10, 20, 20]
+    assert thresholds.futures == [b, a, c]
+    assert thresholds.remove(20, c)
+    assert not thresholds.remove(20, c)
+    assert thresholds.take(0, 1) == [b]
+    assert len(thresholds) == 1
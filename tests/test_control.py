@@ -0,0 +1,114 @@
+import asyncio
+
+from tello_asyncio import Tello
+from tello_asyncio.rtt import RetransmissionTimer
+
+
+class FakeTransport:
+    """
+    Answers each datagram sent with whatever the responder returns, after a
+    delay, or not at all if it returns `None`.
+    """
+
+    def __init__(self, protocol, loop, responder):
+        self._protocol = protocol
+        self._loop = loop
+        self._responder = responder
+        self.sent = []
+
+    def sendto(self, data, addr=None):
+        message = bytes(data).decode()
+        self.sent.append(message)
+        response = self._responder(message, len(self.sent))
+        if response is not None:
+            delay, text = response
+            self._loop.call_later(
+                delay, self._protocol.datagram_received, text.encode(), None
+            )
+
+    def is_closing(self):
+        return False
+
+
+def attach(drone, responder, rto=0.05):
+    drone._retransmission_timer = RetransmissionTimer(initial_rto=rto, min_rto=0.01)
+    protocol = Tello.Protocol()
+    transport = FakeTransport(protocol, drone._loop, responder)
+    protocol.connection_made(transport)
+    drone._attach(transport, protocol)
+    return transport
+
+
+def protocol_with(pending=()):
+    drone = Tello()
+    protocol = Tello.Protocol()
+    protocol.connection_made(None)
+    drone._attach(None, protocol)
+    protocol.pending.extend(pending)
+    return protocol
+
+
+def test_duplicate_discarded_when_nothing_pending(run):
+    async def main():
+        protocol = protocol_with()
+        protocol.expected_duplicates = 1
+        protocol.handle_datagram(b"ok", 1.0)
+        assert protocol.expected_duplicates == 0
+        assert protocol.retransmission_timer.duplicates == 1
+
+    run(main())
+
+
+def test_response_not_swallowed_while_command_pending(run):
+    async def main():
+        future = asyncio.get_event_loop().create_future()
+        protocol = protocol_with([("downvision 1", future, None)])
+        protocol.expected_duplicates = 1
+        protocol.handle_datagram(b"ok", 1.0)
+        assert future.done()
+        assert future.result() == ("downvision 1", "ok", None, 1.0)
+
+    run(main())
+
+
+def test_retransmit_with_one_copy_answered_then_fast_command(run):
+    async def main():
+        drone = Tello(retransmit=True)
+
+        def responder(message, n):
+            if n == 1:
+                return None  # first send lost
+            return (0.001, "87" if message == "battery?" else "ok")
+
+        transport = attach(drone, responder)
+        assert await drone.query_battery() == 87
+        assert drone._protocol.expected_duplicates == 1
+
+        # answered well within the retransmission timeout
+        assert await asyncio.wait_for(drone.send("takeoff"), 0.5) is None
+        assert transport.sent == ["battery?", "battery?", "takeoff"]
+        assert drone._protocol.expected_duplicates == 0
+        assert drone.retransmission_stats.duplicates == 0
+
+    run(main())
+
+
+def test_late_duplicate_discarded_before_next_command(run):
+    async def main():
+        drone = Tello(retransmit=True)
+
+        def responder(message, n):
+            if n == 1:
+                return (0.08, "87")  # slow, so retransmitted
+            return (0.001, "87")
+
+        attach(drone, responder)
+        assert await drone.query_battery() == 87
+        await asyncio.sleep(0.1)
+        stats = drone.retransmission_stats
+        assert stats.retransmits == 1
+        assert stats.duplicates == 1
+
+        assert await drone.query_battery() == 87
+
+    run(main())
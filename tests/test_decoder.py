@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from time import monotonic
+
+import pytest
+
+from tello_asyncio import decoder
+from tello_asyncio.types import VideoFrameInfo
+
+IDR = b"\x00\x00\x00\x01\x65"
+P = b"\x00\x00\x00\x01\x41"
+
+
+class FakePicture:
+    def __init__(self, data):
+        self.data = data
+
+    def to_ndarray(self, format):
+        return self.data
+
+
+class FakeCodec:
+    """
+    Decodes each packet to the given number of pictures, waiting for the
+    gate to open before the first.
+    """
+
+    def __init__(self, pictures, gate):
+        self.pictures = pictures
+        self.gate = gate
+
+    def parse(self, data):
+        return [data]
+
+    def decode(self, packet):
+        self.gate.wait()
+        return [FakePicture(packet + bytes([i])) for i in range(self.pictures)]
+
+
+@pytest.fixture
+def fake_av(monkeypatch):
+    gate = threading.Event()
+    settings = {"pictures": 1}
+
+    class FakeAv:
+        class CodecContext:
+            @staticmethod
+            def create(name, mode):
+                return FakeCodec(settings["pictures"], gate)
+
+    monkeypatch.setattr(decoder, "av", FakeAv)
+    return gate, settings
+
+
+async def decode_frames(video_decoder, gate, count):
+    video_decoder.start()
+    for i in range(count):
+        now = monotonic()
+        data = (IDR if i == 0 else P) + bytes([i])
+        video_decoder.submit(data, VideoFrameInfo(now, now, len(data), 1))
+    # every frame is waiting before the first is decoded
+    gate.set()
+    for _ in range(200):
+        if video_decoder.stats().decoded >= count:
+            break
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.01)
+    await video_decoder.stop()
+
+
+def test_newest_picture_delivered_while_frames_waiting(run, fake_av):
+    gate, settings = fake_av
+    frames = []
+    video_decoder = decoder.VideoDecoder(on_frame=frames.append, max_latency=10)
+    run(decode_frames(video_decoder, gate, 5))
+    assert len(frames) == 5
+    assert [f.image[-2] for f in frames] == [0, 1, 2, 3, 4]
+    stats = video_decoder.stats()
+    assert stats.delivered == 5
+    assert stats.late_frames == 0
+
+
+def test_only_newest_of_several_pictures_delivered(run, fake_av):
+    gate, settings = fake_av
+    settings["pictures"] = 3
+    frames = []
+    video_decoder = decoder.VideoDecoder(on_frame=frames.append, max_latency=10)
+    run(decode_frames(video_decoder, gate, 2))
+    assert [f.image[-1] for f in frames] == [2, 2]
+    assert video_decoder.stats().late_frames == 4
+
+
+def test_late_backlog_skipped(run, fake_av):
+    gate, settings = fake_av
+    frames = []
+    video_decoder = decoder.VideoDecoder(on_frame=frames.append, max_latency=0)
+    run(decode_frames(video_decoder, gate, 4))
+    # only the last frame had nothing newer waiting
+    assert [f.image[-2] for f in frames] == [3]
+    assert video_decoder.stats().late_frames == 3
+
+
+def test_frames_before_first_keyframe_dropped(run, fake_av):
+    gate, settings = fake_av
+    frames = []
+    video_decoder = decoder.VideoDecoder(on_frame=frames.append)
+
+    async def main():
+        video_decoder.start()
+        now = monotonic()
+        video_decoder.submit(P + b"\x00", VideoFrameInfo(now, now, 6, 1))
+        await video_decoder.stop()
+
+    gate.set()
+    run(main())
+    assert video_decoder.stats().dropped_frames == 1
@@ -0,0 +1,94 @@
+from tello_asyncio import TelloState, Vector, Range
+from tello_asyncio.state import parse_state_message_by_name
+from tello_asyncio.sync import StateBuffer, interpolate_state
+
+
+def state(received_at, yaw=0, height=100, velocity=Vector(0.0, 0.0, 0.0)):
+    return TelloState(
+        "raw",
+        0,
+        0,
+        yaw,
+        height,
+        1.5,
+        80,
+        10,
+        3,
+        Range(60, 62),
+        Vector(0.0, 0.0, -1000.0),
+        velocity,
+        -1,
+        None,
+        received_at,
+    )
+
+
+def test_interpolated_integer_fields_stay_integers():
+    s = interpolate_state(state(1.0, height=100), state(1.1, height=105), 0.3, 1.03)
+    assert s.height == 102
+    for name in ("roll", "pitch", "yaw", "height", "time_of_flight", "motor_time"):
+        assert type(getattr(s, name)) is int, name
+    assert s.received_at == 1.03
+
+
+def test_interpolated_vectors():
+    before = state(1.0, velocity=Vector(0.0, 10.0, 0.0))
+    after = state(1.1, velocity=Vector(10.0, 0.0, 0.0))
+    assert interpolate_state(before, after, 0.25).velocity == Vector(2.5, 7.5, 0.0)
+
+
+def test_vectors_with_missing_components_taken_from_nearer():
+    missing = Vector(None, None, None)
+    before = state(1.0, velocity=missing)
+    after = state(1.1, velocity=Vector(10.0, 0.0, 0.0))
+    assert interpolate_state(before, after, 0.3).velocity == missing
+    assert interpolate_state(before, after, 0.7).velocity == after.velocity
+
+
+def test_missing_vector_from_by_name_parser():
+    # no velocity fields, so a vector of None
+    raw = "pitch:0;roll:0;yaw:10;templ:60;temph:62;tof:10;h:20;bat:80;baro:1.5;time:0;agx:0;agy:0;agz:0;"
+    parsed = parse_state_message_by_name(raw, 1.0)
+    assert parsed.velocity == Vector(None, None, None)
+    s = interpolate_state(parsed, state(1.1, height=40), 0.25, 1.025)
+    assert s.velocity == Vector(None, None, None)
+    assert s.height == 25
+
+
+def test_yaw_interpolated_the_shorter_way_round():
+    s = interpolate_state(state(1.0, yaw=170), state(1.1, yaw=-170), 0.25)
+    assert s.yaw == 175
+    s = interpolate_state(state(1.0, yaw=-170), state(1.1, yaw=170), 0.25)
+    assert s.yaw == -175
+
+
+def test_other_fields_from_nearer_state():
+    before = state(1.0)._replace(battery=80)
+    after = state(1.1)._replace(battery=79)
+    assert interpolate_state(before, after, 0.4).battery == 80
+    assert interpolate_state(before, after, 0.6).battery == 79
+
+
+def test_state_buffer_lookup():
+    buffer = StateBuffer()
+    assert buffer.at(1.0) is None
+    buffer.add(state(1.0, height=100))
+    buffer.add(state(1.1, height=110))
+    assert buffer.at(0.5).height == 100
+    assert buffer.at(2.0).height == 110
+    assert buffer.at(1.1).height == 110
+    assert buffer.at(1.02).height == 102
+    assert buffer.at(1.02, interpolate=False).height == 100
+    assert buffer.at(1.08, interpolate=False).height == 110
+
+
+def test_state_buffer_capacity_and_order():
+    buffer = StateBuffer(capacity=2)
+    buffer.add(state(1.0))
+    buffer.add(state(1.1))
+    buffer.add(state(1.05))  # out of order, ignored
+    buffer.add(state(None))
+    buffer.add(state(1.2))
+    assert len(buffer) == 2
+    assert buffer.at(0).received_at == 1.1
+    assert buffer.latest_time == 1.2
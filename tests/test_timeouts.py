@@ -0,0 +1,73 @@
+from math import pi
+
+import pytest
+
+from tello_asyncio.timeouts import (
+    CommandTimeoutModel,
+    INITIAL_MARGIN,
+    INITIAL_MARGIN_FRACTION,
+    MIN_MARGIN,
+    MIN_SPEED,
+    MOVE_OVERHEAD,
+)
+
+
+@pytest.mark.parametrize(
+    "message, speed, expected",
+    [
+        ("takeoff", None, 6.0),
+        ("land", None, 6.0),
+        ("flip l", None, 3.0),
+        ("emergency", None, 0.0),
+        ("forward 100", None, MOVE_OVERHEAD + 100 / MIN_SPEED),
+        ("up 50", 50, MOVE_OVERHEAD + 1.0),
+        ("cw 90", None, MOVE_OVERHEAD + 2.0),
+        ("ccw 45", None, MOVE_OVERHEAD + 1.0),
+        ("go 30 40 0 10", None, MOVE_OVERHEAD + 5.0),
+        ("curve 0 0 0 30 40 0 10", None, MOVE_OVERHEAD + 5.0 * pi / 2),
+        ("jump 30 40 0 10 90 m1 m2", None, 2 * MOVE_OVERHEAD + 5.0 + 2.0),
+    ],
+)
+def test_expected_duration(message, speed, expected):
+    model = CommandTimeoutModel(5.0)
+    assert model.expected_duration(message, speed) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "message", ["", "command", "battery?", "forward", "forward x", "go 1 2 3 0"]
+)
+def test_no_expected_duration(message):
+    assert CommandTimeoutModel(5.0).expected_duration(message) is None
+
+
+def test_yaw_rate():
+    model = CommandTimeoutModel(5.0, yaw_rate=90)
+    assert model.expected_duration("cw 180") == MOVE_OVERHEAD + 2.0
+
+
+def test_default_timeout_for_commands_that_do_not_move():
+    assert CommandTimeoutModel(7.0).timeout("battery?") == 7.0
+
+
+def test_initial_margin():
+    model = CommandTimeoutModel(5.0)
+    expected = 6.0
+    assert model.timeout("takeoff") == pytest.approx(
+        expected + INITIAL_MARGIN + INITIAL_MARGIN_FRACTION * expected
+    )
+
+
+def test_margin_learned_from_observations():
+    model = CommandTimeoutModel(5.0)
+    for _ in range(50):
+        model.observe("takeoff", 6.0)
+    # exactly as expected, so down to the minimum margin
+    assert model.timeout("takeoff") == pytest.approx(6.0 + MIN_MARGIN)
+
+    for _ in range(50):
+        model.observe("land", 8.0)
+    assert model.timeout("land") > 8.0
+    # learned per verb
+    assert model.timeout("flip l") == pytest.approx(
+        3.0 + INITIAL_MARGIN + INITIAL_MARGIN_FRACTION * 3.0
+    )
@@ -0,0 +1,237 @@
+from tello_asyncio.video import (
+    FrameBuffer,
+    AccessUnitAssembler,
+    TelloVideoListener,
+    MAX_CHUNK_SIZE,
+)
+
+SPS = b"\x00\x00\x00\x01\x67"
+PPS = b"\x00\x00\x00\x01\x68"
+IDR = b"\x00\x00\x00\x01\x65"
+P = b"\x00\x00\x00\x01\x41"
+
+# first byte after a slice's NAL header, for the first and a later slice
+FIRST = b"\x80"
+LATER = b"\x40"
+
+
+def listener_protocol(**attributes):
+    protocol = TelloVideoListener.Protocol()
+    for name, value in attributes.items():
+        setattr(protocol, name, value)
+    protocol.connection_made(None)
+    chunks = []
+    frames = []
+    protocol.on_video_frame_chunk_received = lambda data, at: chunks.append(data)
+    protocol.on_frame_received = lambda data, info: frames.append((data, info))
+    return protocol, chunks, frames
+
+
+def test_frame_buffer_keeps_last_frame_while_next_is_reassembled():
+    buffer = FrameBuffer(16)
+    buffer.append(b"first")
+    first = buffer.frame()
+    buffer.reset()
+    buffer.append(b"second")
+    assert bytes(first) == b"first"
+    second = buffer.frame()
+    buffer.reset()
+    buffer.append(b"third")
+    assert bytes(second) == b"second"
+
+
+def test_frame_buffer_grows_keeping_frame_in_progress():
+    buffer = FrameBuffer(4)
+    buffer.append(b"ab")
+    frame = buffer.split(2)
+    buffer.append(b"cdefgh")
+    assert bytes(frame) == b"ab"
+    assert bytes(buffer.frame()) == b"cdefgh"
+    assert buffer.capacity >= 6
+
+
+def test_frame_buffer_limits_growth():
+    buffer = FrameBuffer(4, max_size=10)
+    buffer.append(b"123456789")
+    assert buffer.capacity == 10
+
+
+def test_frame_buffer_frames_are_read_only():
+    buffer = FrameBuffer(8)
+    buffer.append(b"abc")
+    assert buffer.frame().readonly
+
+
+def test_frame_not_overwritten_by_next_chunk():
+    protocol, _, frames = listener_protocol()
+    protocol.handle_datagram(IDR + b"AAAA", 1.0)
+    protocol.handle_datagram(P + b"BBBB", 2.0)
+    assert bytes(frames[0][0]) == IDR + b"AAAA"
+    protocol.handle_datagram(P + b"CCCC", 3.0)
+    assert bytes(frames[1][0]) == P + b"BBBB"
+
+
+def test_frame_reassembled_from_chunks():
+    protocol, chunks, frames = listener_protocol()
+    full = IDR + b"x" * (MAX_CHUNK_SIZE - len(IDR))
+    protocol.handle_datagram(full, 1.0)
+    protocol.handle_datagram(b"end", 1.5)
+    assert len(chunks) == 2
+    data, info = frames[0]
+    assert bytes(data) == full + b"end"
+    assert info.first_received_at == 1.0
+    assert info.received_at == 1.5
+    assert info.size == MAX_CHUNK_SIZE + 3
+    assert info.chunks == 2
+
+
+def test_copied_frames_are_bytes():
+    protocol, chunks, frames = listener_protocol(copy=True)
+    protocol.handle_datagram(memoryview(IDR + b"AAAA"), 1.0)
+    assert type(chunks[0]) is bytes
+    assert type(frames[0][0]) is bytes
+
+
+def assembler(**kwargs):
+    units = []
+    a = AccessUnitAssembler(lambda data, info: units.append((data, info)), **kwargs)
+    return a, units
+
+
+def full_chunk(start):
+    return start + b"x" * (MAX_CHUNK_SIZE - len(start))
+
+
+def test_parameter_sets_kept_for_following_keyframe():
+    a, units = assembler()
+    a.add(SPS + b"s" + PPS + b"p", 1.0)
+    assert not units
+    a.add(IDR + FIRST + b"i", 2.0)
+    data, info = units[0]
+    assert bytes(data) == SPS + b"s" + PPS + b"p" + IDR + FIRST + b"i"
+    assert info.nal_types == (7, 8, 5)
+    assert info.is_keyframe
+    assert info.first_received_at == 1.0
+    assert info.received_at == 2.0
+
+
+def test_split_at_first_slice_of_next_picture():
+    a, units = assembler()
+    a.add(IDR + FIRST + b"a" + P + FIRST + b"b", 1.0)
+    assert [bytes(d) for d, i in units] == [IDR + FIRST + b"a", P + FIRST + b"b"]
+    assert units[0][1].is_keyframe
+    assert not units[1][1].is_keyframe
+    assert a.stats().split_frames == 1
+
+
+def test_later_slices_stay_in_their_picture():
+    a, units = assembler()
+    a.add(IDR + FIRST + b"a" + IDR + LATER + b"b", 1.0)
+    assert len(units) == 1
+    assert units[0][1].nal_types == (5, 5)
+
+
+def test_split_at_parameter_sets_after_slice():
+    a, units = assembler()
+    a.add(full_chunk(P + FIRST), 1.0)
+    a.add(SPS + b"s" + IDR + FIRST + b"i", 2.0)
+    assert len(units) == 2
+    assert bytes(units[0][0]) == full_chunk(P + FIRST)
+    assert units[1][1].nal_types == (7, 5)
+
+
+def test_frames_merged_by_exact_multiple_chunk_are_split():
+    a, units = assembler()
+    a.add(full_chunk(P + FIRST), 1.0)
+    a.add(P + FIRST + b"next", 2.0)
+    assert [i.size for d, i in units] == [MAX_CHUNK_SIZE, len(P + FIRST) + 4]
+    assert a.stats() == (2, 1, 0, 0, 0)
+
+
+def test_split_frames_stay_intact_until_the_next():
+    a, units = assembler()
+    a.add(IDR + FIRST + b"a" + P + FIRST + b"b", 1.0)
+    a.add(P + FIRST + b"c" * 20, 2.0)
+    assert bytes(units[1][0]) == P + FIRST + b"b"
+    a.add(P + FIRST + b"d" * 20, 3.0)
+    assert bytes(units[2][0]) == P + FIRST + b"c" * 20
+
+
+def test_chunks_skipped_when_start_of_nal_unit_lost():
+    a, units = assembler()
+    a.add(IDR + FIRST + b"a", 1.0)
+    # the next frame's first chunk is lost, so its others are skipped
+    a.add(full_chunk(b"y"), 2.0)
+    a.add(b"end", 2.1)
+    a.add(P + FIRST + b"ok", 3.0)
+    assert [bytes(d) for d, i in units] == [IDR + FIRST + b"a", P + FIRST + b"ok"]
+    stats = a.stats()
+    assert stats.dropped_chunks == 2
+    assert stats.frames == 2
+
+
+def test_resync_at_keyframe_skips_until_keyframe():
+    a, units = assembler(resync_at_keyframe=True)
+    a.add(P + FIRST + b"a", 1.0)
+    a.add(b"lost start", 2.0)
+    a.add(P + FIRST + b"b", 3.0)
+    a.add(SPS + b"s" + IDR + FIRST + b"i", 4.0)
+    assert len(units) == 2
+    assert units[1][1].is_keyframe
+    assert a.stats().dropped_chunks == 2
+
+
+def test_access_unit_too_big_is_truncated():
+    a, units = assembler(max_frame_size=2 * MAX_CHUNK_SIZE)
+    a.add(full_chunk(IDR + FIRST), 1.0)
+    a.add(full_chunk(b"y"), 1.1)
+    a.add(full_chunk(b"z"), 1.2)
+    a.add(b"end", 1.3)
+    a.add(P + FIRST + b"ok", 2.0)
+    assert [bytes(d) for d, i in units] == [P + FIRST + b"ok"]
+    stats = a.stats()
+    assert stats.truncated_frames == 1
+    assert stats.dropped_chunks == 2
+
+
+def test_access_unit_with_too_many_chunks_is_truncated():
+    a, units = assembler(max_frame_chunks=2)
+    a.add(full_chunk(IDR + FIRST), 1.0)
+    a.add(full_chunk(b"y"), 1.1)
+    a.add(IDR + FIRST + b"i", 1.2)
+    assert [bytes(d) for d, i in units] == [IDR + FIRST + b"i"]
+    assert a.stats().truncated_frames == 1
+
+
+def test_protocol_truncates_and_resyncs():
+    protocol, _, frames = listener_protocol(max_frame_chunks=2)
+    protocol.handle_datagram(full_chunk(P + FIRST), 1.0)
+    protocol.handle_datagram(full_chunk(b"y"), 1.1)
+    protocol.handle_datagram(full_chunk(b"z"), 1.2)
+    protocol.handle_datagram(b"end", 1.3)
+    protocol.handle_datagram(P + FIRST + b"ok", 2.0)
+    assert [bytes(d) for d, i in frames] == [P + FIRST + b"ok"]
+    assert protocol.stats() == (1, 0, 0, 2, 1)
+
+
+def test_protocol_resync_at_keyframe():
+    protocol, _, frames = listener_protocol(
+        max_frame_chunks=1, resync_at_keyframe=True
+    )
+    protocol.handle_datagram(full_chunk(P + FIRST), 1.0)
+    protocol.handle_datagram(full_chunk(b"y"), 1.1)
+    protocol.handle_datagram(P + FIRST + b"skipped", 2.0)
+    protocol.handle_datagram(IDR + FIRST + b"ok", 3.0)
+    assert [bytes(d) for d, i in frames] == [IDR + FIRST + b"ok"]
+
+
+def test_dropping_data_keeps_split_frame_intact():
+    a, units = assembler(max_frame_chunks=2)
+    # the first picture is split off, the second continues in the same buffer
+    a.add(full_chunk(IDR + FIRST + b"a" + P + FIRST), 1.0)
+    a.add(full_chunk(b"y"), 1.1)
+    a.add(full_chunk(b"z"), 1.2)
+    assert len(units) == 1
+    a.add(P + FIRST + b"ok", 2.0)
+    assert bytes(units[0][0]) == IDR + FIRST + b"a"
+    assert a.stats().truncated_frames == 1